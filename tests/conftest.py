@@ -0,0 +1,25 @@
+import pytest
+from PySide6.QtWidgets import QApplication
+from uav_collision_avoidance.src.simulation.simulation import Simulation, SimulationSettings
+
+@pytest.fixture
+def simulation_settings():
+    """Restores simulation, guidance and ADS-B frequencies changed by a test"""
+    frequencies = (SimulationSettings.simulation_frequency, SimulationSettings.guidance_frequency, SimulationSettings.adsb_frequency)
+    yield SimulationSettings
+    simulation_frequency, guidance_frequency, adsb_frequency = frequencies
+    SimulationSettings.set_simulation_frequency(simulation_frequency)
+    SimulationSettings.set_guidance_frequency(guidance_frequency)
+    SimulationSettings.set_adsb_frequency(adsb_frequency)
+
+@pytest.fixture
+def headless_simulation(request, simulation_settings):
+    """Creates headless simulation at the parametrized simulation frequency defaulting to 10 Hz"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication()
+    simulation_settings.set_simulation_frequency(getattr(request, "param", 10.0))
+    try:
+        yield Simulation(headless = True)
+    finally:
+        QApplication.shutdown(app)
@@ -0,0 +1,484 @@
+import sys
+import random
+sys.path.append("..")
+import numpy as np
+import pytest
+from uav_collision_avoidance.src.simulation.simulation import SimulationSettings
+from uav_collision_avoidance.src.aircraft.aircraft import Aircraft
+from uav_collision_avoidance.src.aircraft.aircraft_fleet import AircraftFleet
+from uav_collision_avoidance.src.simulation.simulation_fleet_physics import SimulationFleetPhysics
+from uav_collision_avoidance.src.simulation.simulation_batch import SimulationBatch
+from uav_collision_avoidance.src.simulation.simulation_vector import Vector3D
+from uav_collision_avoidance.src.simulation.simulation_state import SimulationState
+from uav_collision_avoidance.src.simulation.simulation_terrain import SimulationTerrain
+from uav_collision_avoidance.src.simulation.simulation_wind import SimulationWind
+from uav_collision_avoidance.src.simulation.simulation_parareal import SimulationParareal
+from uav_collision_avoidance.src.simulation.simulation_spatial_hash import SimulationSpatialHash
+from uav_collision_avoidance.src.simulation.simulation_sweep_and_prune import SimulationSweepAndPrune
+from uav_collision_avoidance.src.simulation.simulation_adsb_bus import SimulationADSBBus
+from uav_collision_avoidance.src.simulation.simulation_tracker import SimulationTracker
+from uav_collision_avoidance.src.simulation.simulation_trajectory_predictor import SimulationTrajectoryPredictor
+from uav_collision_avoidance.src.engine.engine_adsb import EngineADSB
+from uav_collision_avoidance.src.engine.engine_headless import EngineHeadless
+
+parity_tolerance : float = 1.0 # m
+
+def create_fleet(count : int, spacing : float = 100_000.0) -> AircraftFleet:
+    """Creates fleet of converging aircraft pairs separated by spacing along x axis"""
+    fleet = AircraftFleet(count)
+    offset = np.repeat(np.arange(count // 2) * spacing, 2)
+    fleet.position[:] = [(0, -5000, 1000), (4000, 6000, 1000)] * (count // 2)
+    fleet.position[:, 0] += offset
+    fleet.speed[:] = [(60, -60, 0), (0, -85, 0)] * (count // 2)
+    fleet.target_speed[:] = fleet.absolute_speed
+    for i in range(count):
+        target = (51_900, -50_000, 3000) if i % 2 == 0 else (900, -1_001_300, 1000)
+        fleet.destinations[i].append((target[0] + offset[i], target[1], target[2]))
+    fleet.refresh_destinations()
+    return fleet
+
+def create_seeded_batch(encounters : list, state : SimulationState, **kwargs) -> SimulationBatch:
+    """Creates batch of encounters run for 60 000 s with head-on evade maneuvers seeded to pick the same sides"""
+    random.seed(0)
+    return SimulationBatch(encounters, state, simulation_time = 60_000_000, **kwargs)
+
+@pytest.mark.parametrize("headless_simulation", [100.0], indirect = True)
+def test_physics_parity(headless_simulation):
+    sim = headless_simulation
+    deviations = sim.run_physics_parity(duration = 20_000, tolerance = parity_tolerance)
+    assert len(deviations) == len(sim.generate_consistent_list_of_aircraft_lists())
+    assert all(deviation <= parity_tolerance for deviation in deviations)
+
+def test_fleet_pairs_independent():
+    pair = SimulationFleetPhysics(create_fleet(2))
+    fleet = SimulationFleetPhysics(create_fleet(2_000))
+    for _ in range(500):
+        pair.cycle(10.0)
+        fleet.cycle(10.0)
+    offset = np.repeat(np.arange(1_000) * 100_000.0, 2)
+    assert not fleet.fleet.collided.any()
+    assert np.allclose(fleet.fleet.position[:, 0] - offset, np.tile(pair.fleet.position[:, 0], 1_000))
+    assert np.allclose(fleet.fleet.position[:, 1:], np.tile(pair.fleet.position[:, 1:], (1_000, 1)))
+    assert np.allclose(fleet.fleet.speed, np.tile(pair.fleet.speed, (1_000, 1)))
+    assert np.allclose(fleet.fleet.roll_angle, np.tile(pair.fleet.roll_angle, 1_000))
+
+def test_fleet_collision():
+    fleet = AircraftFleet(3)
+    fleet.position[:] = [(0, -100, 1000), (0, 100, 1000), (50_000, 0, 1000)]
+    fleet.speed[:] = [(0, 50, 0), (0, -50, 0), (0, 50, 0)]
+    fleet.target_speed[:] = fleet.absolute_speed
+    fleet.target_yaw_angle[:] = fleet.yaw_angle
+    physics = SimulationFleetPhysics(fleet)
+    collision : bool = False
+    for _ in range(300):
+        collision = physics.cycle(10.0)
+        if collision:
+            break
+    assert collision
+    assert fleet.collided.tolist() == [True, True, False]
+
+def test_batch_consistent_collisions(headless_simulation):
+    sim = headless_simulation
+    encounters = sim.generate_consistent_list_of_aircraft_lists()
+    state = SimulationState(SimulationSettings(), is_realtime = False, avoid_collisions = False)
+    simulation_data = SimulationBatch(encounters, state).run()
+    assert len(simulation_data) == len(encounters)
+    assert all(data.collision for data in simulation_data)
+    for (aircrafts, _), data in zip(sim.generate_consistent_list_of_aircraft_lists(), simulation_data):
+        expected = EngineHeadless(aircrafts, SimulationState(SimulationSettings(), is_realtime = False, avoid_collisions = False)).run()
+        assert expected.collision
+        assert data.minimal_relative_distance == pytest.approx(expected.minimal_relative_distance, abs = parity_tolerance)
+        assert data.minimal_relative_distance_time == pytest.approx(expected.minimal_relative_distance_time)
+
+def test_fleet_swept_collision():
+    fleet = AircraftFleet(2)
+    fleet.position[:] = [(0, -1013, 1000), (5, 1013, 1000)]
+    fleet.speed[:] = [(0, 250, 0), (0, -250, 0)]
+    fleet.target_speed[:] = fleet.absolute_speed
+    fleet.target_yaw_angle[:] = fleet.yaw_angle
+    physics = SimulationFleetPhysics(fleet)
+    for _ in range(5):
+        if physics.cycle(1000.0):
+            break
+    assert fleet.collided.all()
+    assert np.linalg.norm(fleet.position[0] - fleet.position[1]) == pytest.approx(20.0)
+
+@pytest.mark.parametrize("time_step", [10.0, 100.0, 1000.0])
+def test_fleet_step_size_independence(time_step : float):
+    fleet = AircraftFleet(2)
+    fleet.position[:] = [(0, 0, 1000), (50_000, 0, 1000)]
+    fleet.speed[:] = [(0, -100, 0), (0, -100, 0)]
+    fleet.target_speed[:] = fleet.absolute_speed
+    fleet.target_yaw_angle[:] = [180.0, 0.0]
+    fleet.target_pitch_angle[:] = [0.0, 10.0]
+    fleet.roll_angle[:] = [20.0, 0.0]
+    fleet.target_roll_angle[:] = [20.0, 30.0]
+    physics = SimulationFleetPhysics(fleet)
+    for _ in range(int(2000.0 / time_step)):
+        physics.update_aircrafts_speed_angles(time_step)
+        physics.update_aircrafts_position(time_step)
+    turn_angle = np.radians(physics.g_acceleration * np.tan(np.radians(20.0)) * 2000.0 / 100.0)
+    turn_radius = 100.0 * 2.0 / turn_angle
+    assert fleet.position[0] == pytest.approx((turn_radius * (1.0 - np.cos(turn_angle)), -turn_radius * np.sin(turn_angle), 1000.0))
+    assert fleet.roll_angle[1] == pytest.approx(30.0 * (1.0 - np.exp(-2000.0 / fleet.roll_dynamic_delay[1])))
+    assert fleet.pitch_angle[1] == pytest.approx(10.0 * (1.0 - np.exp(-2000.0 / fleet.pitch_dynamic_delay[1])), rel = 1e-2)
+
+def create_dormant_fleet(count : int) -> AircraftFleet:
+    """Creates fleet of straight flying aircrafts spaced along x axis with a converging pair at its end"""
+    fleet = AircraftFleet(count + 2)
+    fleet.position[:count] = np.column_stack((np.arange(count) * 100_000.0, np.zeros(count), np.full(count, 1000.0)))
+    fleet.speed[:count] = (0, -100, 0)
+    for i in range(count):
+        fleet.destinations[i].append((i * 100_000.0, -30_000.0, 1000.0))
+    fleet.position[count:] = [(count * 100_000.0, -5000, 1000), (count * 100_000.0 + 4000, 6000, 1000)]
+    fleet.speed[count:] = [(60, -60, 0), (0, -85, 0)]
+    fleet.destinations[count].append((count * 100_000.0 + 51_900, -50_000, 3000))
+    fleet.destinations[count + 1].append((count * 100_000.0 + 900, -1_001_300, 1000))
+    fleet.target_speed[:] = fleet.absolute_speed
+    fleet.target_yaw_angle[:] = fleet.yaw_angle
+    fleet.refresh_destinations()
+    return fleet
+
+def test_fleet_level_of_detail():
+    full = SimulationFleetPhysics(create_dormant_fleet(100))
+    level_of_detail = SimulationFleetPhysics(create_dormant_fleet(100), level_of_detail_distance = 2 * 9260.0)
+    awake_counts = []
+    for _ in range(400):
+        full.cycle(1000.0)
+        level_of_detail.cycle(1000.0)
+        awake_counts.append(len(level_of_detail.awake_rows))
+    assert sum(count > 2 for count in awake_counts) <= 5
+    assert level_of_detail.fleet.dormant[:100].any()
+    assert not full.fleet.has_destination[:100].any()
+    assert not level_of_detail.fleet.has_destination[:100].any()
+    assert np.allclose(level_of_detail.fleet.position, full.fleet.position, atol = 0.01)
+    assert np.allclose(level_of_detail.fleet.speed, full.fleet.speed, atol = 0.001)
+    level_of_detail.fleet.add_last_destination(0, (50_000.0, -100_000.0, 1000.0))
+    assert not level_of_detail.fleet.dormant[0]
+
+def test_fleet_level_of_detail_wake_bound():
+    fleet = AircraftFleet(2)
+    fleet.position[:] = [(0, 0, 1000), (5000, 0, 1000)]
+    fleet.speed[:] = (0, -100, 0)
+    for i in range(2):
+        fleet.destinations[i].append((i * 5000.0, -1_000_000.0, 1000.0))
+    fleet.target_speed[:] = fleet.absolute_speed
+    fleet.target_yaw_angle[:] = fleet.yaw_angle
+    fleet.refresh_destinations()
+    physics = SimulationFleetPhysics(fleet, level_of_detail_distance = 1000.0)
+    physics.cycle(100.0)
+    # parallel aircrafts may still turn towards each other at their full speeds
+    assert fleet.dormant.all()
+    assert physics.wake_time == pytest.approx([(5000.0 - 1000.0) / 200.0 * 1000.0] * 2)
+
+def test_batch_level_of_detail(headless_simulation):
+    sim = headless_simulation
+    def generate_parallel_encounters():
+        return [[[
+            Aircraft(aircraft_id = 0, position = Vector3D(offset, 0, 1000), speed = Vector3D(0, 100, 0), initial_target = Vector3D(offset, 20_000, 1000)),
+            Aircraft(aircraft_id = 1, position = Vector3D(offset + 50_000, 0, 1000), speed = Vector3D(0, 100, 0), initial_target = Vector3D(offset + 50_000, 20_000, 1000))], 0.0]
+            for offset in (0, 200_000)]
+    for generate_encounters in (sim.generate_consistent_list_of_aircraft_lists, generate_parallel_encounters):
+        batches = []
+        for level_of_detail in (False, True):
+            state = SimulationState(SimulationSettings(), is_realtime = False, avoid_collisions = True)
+            batch = create_seeded_batch(generate_encounters(), state, level_of_detail = level_of_detail)
+            batch.run()
+            batches.append(batch)
+        full, level_of_detail = batches
+        assert full.physics.level_of_detail_distance is None
+        assert level_of_detail.physics.level_of_detail_distance == SimulationSettings.level_of_detail_separation_margin * state.minimum_separation
+        assert list(level_of_detail.collision) == list(full.collision)
+        assert level_of_detail.minimal_relative_distance == pytest.approx(full.minimal_relative_distance, abs = parity_tolerance)
+    assert (level_of_detail.physics.wake_time > 0.0).any()
+
+def create_terrain(path, tile_size : int = 16, cache_size : int = 4) -> SimulationTerrain:
+    """Creates terrain of a slope rising along x axis by 0.1m per meter on 100m cells from 10km on"""
+    x = np.arange(201) * 100.0
+    elevation = np.tile(np.maximum(x - 10_000.0, 0.0) * 0.1, (101, 1)).astype(np.float32)
+    elevation.tofile(path)
+    return SimulationTerrain(str(path), shape = elevation.shape, cell_size = 100.0, origin = (0.0, -5000.0), tile_size = tile_size, cache_size = cache_size)
+
+def test_terrain_heights(tmp_path):
+    terrain = create_terrain(tmp_path / "terrain.raw")
+    x = np.array([0.0, 10_000.0, 12_345.0, 15_050.0, 20_000.0, 25_000.0, 12_345.0])
+    y = np.array([0.0, 1234.5, -4999.0, 4321.0, 5000.0, 0.0, 6000.0])
+    assert np.allclose(terrain.find_heights(x, y), [0.0, 0.0, 234.5, 505.0, 1000.0, 0.0, 0.0])
+    assert terrain.find_height(11_000.0, 0.0) == pytest.approx(100.0)
+    assert terrain.max_height == pytest.approx(1000.0)
+    assert terrain.cached_tiles <= terrain.cache_size
+    loads = terrain.tile_loads
+    terrain.find_heights(x[:2], y[:2])
+    assert terrain.tile_loads == loads
+
+def test_fleet_terrain_collision(tmp_path):
+    terrain = create_terrain(tmp_path / "terrain.raw")
+    fleet = AircraftFleet(2)
+    fleet.position[:] = [(0, -2000, 500), (0, 2000, 1500)]
+    fleet.speed[:] = [(100, 0, 0), (100, 0, 0)]
+    fleet.target_speed[:] = fleet.absolute_speed
+    fleet.target_yaw_angle[:] = fleet.yaw_angle
+    physics = SimulationFleetPhysics(fleet, terrain = terrain, level_of_detail_distance = 2 * 9260.0)
+    for _ in range(200):
+        physics.cycle(1000.0)
+    assert fleet.collided.tolist() == [True, False]
+    assert fleet.position[0, 0] == pytest.approx(15_000.0, abs = 100.0)
+
+def test_wind_interpolation():
+    # trilinear interpolation in space and linear in time reproduce linear fields exactly
+    t, z, y, x = np.meshgrid(np.arange(3) * 60_000.0, np.arange(4) * 500.0, np.arange(5) * 1000.0, np.arange(6) * 1000.0, indexing = "ij")
+    field = np.stack((0.001 * x - 0.002 * y, 0.004 * z + 0.0001 * t, 0.0005 * x + 0.0002 * t), axis = -1)
+    wind = SimulationWind(field, cell_size = (1000.0, 1000.0, 500.0), time_step = 60_000.0)
+    position = np.random.default_rng(0).uniform((0.0, 0.0, 0.0), (5000.0, 4000.0, 1500.0), (1000, 3))
+    time = 75_000.0
+    expected = np.stack((0.001 * position[:, 0] - 0.002 * position[:, 1], 0.004 * position[:, 2] + 0.0001 * time, 0.0005 * position[:, 0] + 0.0002 * time), axis = -1)
+    assert np.allclose(wind.find_winds(position, time), expected)
+    assert np.allclose(wind.find_wind(-1000.0, 7000.0, 9000.0, 10 * 60_000.0), (-8.0, 6.0 + 12.0, 24.0))
+    assert wind.slice_loads == 1
+
+def test_fleet_wind_drift():
+    fleets = [AircraftFleet(3) for _ in range(2)]
+    for fleet in fleets:
+        fleet.position[:] = [(0, 0, 1000), (0, 50_000, 1000), (50_000, 0, 2000)]
+        fleet.speed[:] = [(0, 50, 0), (0, -50, 0), (70, 0, 0)]
+        fleet.target_speed[:] = fleet.absolute_speed
+        fleet.target_yaw_angle[:] = fleet.yaw_angle
+    still = SimulationFleetPhysics(fleets[0])
+    windy = SimulationFleetPhysics(fleets[1], wind = SimulationWind.uniform((5.0, -3.0, 0.0)))
+    for _ in range(100):
+        still.cycle(100.0)
+        windy.cycle(100.0)
+    assert np.allclose(windy.fleet.position - still.fleet.position, (50.0, -30.0, 0.0))
+    assert np.allclose(windy.fleet.speed, still.fleet.speed)
+
+def test_parareal_matches_serial():
+    serial = SimulationParareal.propagate(create_fleet(4), 0.0, 40_000.0, 10.0, SimulationSettings.g_acceleration, None, None)
+    exact = SimulationParareal(create_fleet(4), duration = 40_000.0, segments = 4, time_step = 10.0, tolerance = 0.0, workers = 2)
+    result = exact.run()
+    assert exact.iterations <= exact.segments
+    assert np.allclose(result.position, serial.position)
+    assert np.allclose(result.speed, serial.speed)
+    parareal = SimulationParareal(create_fleet(4), duration = 40_000.0, segments = 4, time_step = 10.0, workers = 2)
+    result = parareal.run()
+    assert parareal.iterations < parareal.segments
+    assert parareal.corrections[-1] <= parareal.tolerance
+    assert np.max(np.linalg.norm(result.position - serial.position, axis = 1)) < parareal.tolerance
+
+def test_fleet_chunked_threads():
+    fleets = [create_fleet(200, spacing = 5_000.0) for _ in range(2)]
+    serial = SimulationFleetPhysics(fleets[0])
+    chunked = SimulationFleetPhysics(fleets[1], workers = 4, chunk_size = 16)
+    for _ in range(300):
+        assert serial.cycle(100.0) == chunked.cycle(100.0)
+    chunked.shutdown()
+    assert np.array_equal(chunked.fleet.position, serial.fleet.position)
+    assert np.array_equal(chunked.fleet.speed, serial.fleet.speed)
+    assert np.array_equal(chunked.fleet.collided, serial.fleet.collided)
+
+@pytest.mark.parametrize("groups", [1, 3, 70_000])
+def test_spatial_hash_pairs(groups : int):
+    generator = np.random.default_rng(groups)
+    position = generator.uniform(-40_000.0, 40_000.0, (400, 3))
+    speed = generator.uniform(-250.0, 250.0, (400, 3))
+    group = generator.integers(0, 2, 400) * (groups - 1)
+    spatial_hash = SimulationSpatialHash(9260.0)
+    for _ in range(3):
+        position += speed
+        spatial_hash.update(position, group)
+        first, second = spatial_hash.find_pairs()
+        candidates = set(zip(np.minimum(first, second).tolist(), np.maximum(first, second).tolist()))
+        assert len(candidates) == len(first)
+        assert (group[first] == group[second]).all()
+        distance = np.linalg.norm(position[:, np.newaxis] - position[np.newaxis], axis = 2)
+        near = np.triu((distance < 9260.0) & (group[:, np.newaxis] == group[np.newaxis]), 1)
+        assert set(zip(*(index.tolist() for index in np.nonzero(near)))) <= candidates
+    if groups == 1:
+        expected = EngineADSB.find_conflict_pairs(position, speed, 9260.0, lookahead = 0.0)
+        broad_phase = EngineADSB.find_conflict_pairs(position, speed, 9260.0, lookahead = 0.0, candidates = (first, second))
+        assert all(np.array_equal(a, b) for a, b in zip(expected, broad_phase))
+
+def test_sweep_and_prune_probe():
+    generator = np.random.default_rng(3)
+    position = generator.uniform(-200_000.0, 200_000.0, (500, 3))
+    position[:, 2] = generator.uniform(0.0, 10_000.0, 500)
+    speed = generator.uniform(-250.0, 250.0, (500, 3))
+    sweep_and_prune = SimulationSweepAndPrune(120.0, 9260.0, block_size = 64)
+    for _ in range(3):
+        position += speed
+        sweep_and_prune.update(position, speed)
+        candidates = sweep_and_prune.find_pairs()
+        assert len(candidates[0]) < 500 * 499 // 2
+        expected = EngineADSB.find_conflict_pairs(position, speed, 9260.0, lookahead = 120.0)
+        pruned = EngineADSB.find_conflict_pairs(position, speed, 9260.0, lookahead = 120.0, candidates = candidates)
+        assert len(expected[0]) > 0
+        assert all(np.allclose(a, b) for a, b in zip(expected, pruned))
+    assert all(np.all(np.diff(sweep_and_prune.lower[order, axis]) >= 0.0) for axis, order in enumerate(sweep_and_prune.orders))
+
+def test_adsb_bus_delivery():
+    position = np.array([(0.0, 0.0, 1000.0), (10_000.0, 0.0, 1000.0), (200_000.0, 0.0, 1000.0), (0.0, 20_000.0, 1000.0)])
+    speed = np.full((4, 3), 100.0)
+    bus = SimulationADSBBus(4, broadcast_period = [1000.0, 1000.0, 1000.0, 250.0], latency = 500.0, radio_range = 50_000.0, buffer_size = 4)
+    bus.broadcast(0.0, position, speed)
+    assert bus.sent == 4 and bus.delivered == 6
+    assert len(bus.receive(400.0)[0]) == 0
+    receiver, messages = bus.receive(500.0)
+    assert set(zip(receiver.tolist(), messages["sender"].tolist())) == {(0, 1), (1, 0), (0, 3), (3, 0), (1, 3), (3, 1)}
+    assert np.array_equal(messages["position"][messages["sender"] == 1], position[[1, 1]])
+    for time in (250.0, 500.0, 750.0, 1000.0, 1250.0, 1500.0):
+        bus.broadcast(time, position, speed)
+    assert bus.sent == 4 + 3 + 6 and bus.overwritten > 0
+    receiver, messages = bus.receive(2000.0)
+    assert np.bincount(receiver, minlength = 4).max() <= bus.buffer_size
+    assert np.all(np.diff(messages["time"][receiver == 0]) >= 0.0)
+    lossy = SimulationADSBBus(2, drop_probability = 0.5, seed = 1)
+    for time in range(0, 100_000, 1000):
+        lossy.broadcast(float(time), position[:2], speed[:2])
+        lossy.receive(float(time))
+    assert lossy.delivered + lossy.dropped == lossy.sent
+    assert 0.4 < lossy.dropped / lossy.sent < 0.6
+    adsb_frequency = SimulationSettings.adsb_frequency
+    try:
+        SimulationSettings.set_adsb_frequency(4.0)
+        assert (SimulationADSBBus(2).broadcast_period == 250.0).all()
+    finally:
+        SimulationSettings.set_adsb_frequency(adsb_frequency)
+
+def test_adsb_bus_buffer_overflow():
+    position = np.column_stack((np.arange(21) * 1000.0, np.zeros(21), np.full(21, 1000.0)))
+    speed = np.full((21, 3), 100.0)
+    bus = SimulationADSBBus(21, radio_range = 50_000.0, buffer_size = 16)
+    # every receiver is reached by 20 senders at once
+    bus.broadcast(0.0, position, speed)
+    assert bus.delivered == 21 * 16 and bus.overwritten == 21 * 4
+    receiver, messages = bus.receive(0.0)
+    assert np.bincount(receiver, minlength = 21).tolist() == [16] * 21
+    assert len(set(messages["sender"][receiver == 0].tolist())) == 16
+
+def test_batch_adsb_bus(headless_simulation):
+    sim = headless_simulation
+    results = []
+    for latency, drop_probability, tracked in [(None, None, False), (0.0, 0.0, False), (3000.0, 0.5, False), (0.0, 0.0, True)]:
+        encounters = sim.generate_consistent_list_of_aircraft_lists()
+        state = SimulationState(SimulationSettings(), is_realtime = False, avoid_collisions = True)
+        bus = None if latency is None else SimulationADSBBus(2 * len(encounters), latency = latency, drop_probability = drop_probability, seed = 0)
+        tracker = SimulationTracker(2 * len(encounters)) if tracked else None
+        results.append(create_seeded_batch(encounters, state, adsb_bus = bus, tracker = tracker).run())
+    assert tracker.tracks == 2 * len(encounters)
+    assert [data.collision for data in results[3]] == [data.collision for data in results[0]]
+    for exact, ideal in zip(results[0], results[1]):
+        assert ideal.collision == exact.collision
+        assert ideal.minimal_relative_distance == pytest.approx(exact.minimal_relative_distance, rel = 1e-3)
+    assert any(degraded.minimal_relative_distance != exact.minimal_relative_distance for exact, degraded in zip(results[0], results[2]))
+
+def test_batch_collision_time():
+    SimulationSettings.set_simulation_frequency(10.0)
+    encounters = [[[
+        Aircraft(aircraft_id = 0, position = Vector3D(0, -10_027.5, 1000), speed = Vector3D(0, 50, 0), initial_target = Vector3D(0, 1_000_000, 1000)),
+        Aircraft(aircraft_id = 1, position = Vector3D(0, 10_027.5, 1000), speed = Vector3D(0, -50, 0), initial_target = Vector3D(0, -1_000_000, 1000))], 0.0]]
+    batch = SimulationBatch(encounters, SimulationState(SimulationSettings(), is_realtime = False), simulation_time = 60_000_000)
+    batch.run()
+    # first contact at 20m separation falls within a physics step
+    assert batch.collision[0]
+    assert batch.minimal_relative_distance_time[0] == pytest.approx(200_350.0)
+
+def test_adaptive_surveillance(headless_simulation):
+    relative_position = np.array([(100_000.0, 0.0, 0.0), (100_000.0, 0.0, 0.0), (21_000.0, 0.0, 0.0), (5_000.0, 0.0, 0.0), (5_000.0, 0.0, 0.0), (np.nan, np.nan, np.nan)])
+    speed_difference = np.array([(100.0, 0.0, 0.0), (-400.0, 0.0, 0.0), (-400.0, 0.0, 0.0), (100.0, 0.0, 0.0), (-100.0, 0.0, 0.0), (np.nan, np.nan, np.nan)])
+    closing_speed = np.array([200.0, 400.0, 400.0, 200.0, 200.0, np.nan])
+    interval = SimulationBatch.find_surveillance_interval(relative_position, speed_difference, closing_speed, 10_000.0, 100.0, 1000.0)
+    assert list(interval) == [5000.0, 5000.0, 2500.0, 1000.0, 100.0, 1000.0]
+    interval = SimulationBatch.find_surveillance_interval(relative_position, speed_difference, closing_speed, 10_000.0, 100.0, 1000.0, max_interval = 1e6)
+    assert list(interval[:2]) == [400_000.0, 125_000.0]
+    sim = headless_simulation
+    def generate_benign_encounters():
+        return [[[
+            Aircraft(aircraft_id = 0, position = Vector3D(offset, 0, 1000), speed = Vector3D(0, 100, 0), initial_target = Vector3D(offset, 20_000, 1000)),
+            Aircraft(aircraft_id = 1, position = Vector3D(offset + 50_000, 0, 1000), speed = Vector3D(0, 100, 0), initial_target = Vector3D(offset + 50_000, 20_000, 1000))], 0.0]
+            for offset in (0, 200_000)]
+    batches = []
+    for generate_encounters in (sim.generate_consistent_list_of_aircraft_lists, generate_benign_encounters):
+        for adaptive_surveillance in (False, True):
+            encounters = generate_encounters()
+            state = SimulationState(SimulationSettings(), is_realtime = False, avoid_collisions = True)
+            batch = create_seeded_batch(encounters, state, adaptive_surveillance = adaptive_surveillance)
+            batch.run()
+            batches.append(batch)
+    fixed, adaptive, benign_fixed, benign_adaptive = batches
+    assert not (adaptive.collision & ~fixed.collision).any()
+    assert not benign_adaptive.collision.any()
+    assert benign_adaptive.adsb_evaluations * 4 < benign_fixed.adsb_evaluations
+
+def test_tracker_coordinated_turn():
+    generator = np.random.default_rng(0)
+    turn_rate, speed = 0.05, 100.0
+    tracker = SimulationTracker(3)
+    prediction_error, dead_reckoning_error = [], []
+    for time in np.arange(0.0, 120.0):
+        heading = turn_rate * time
+        position = np.array([(speed / turn_rate * np.sin(heading), speed / turn_rate * (1.0 - np.cos(heading)), 1000.0)])
+        velocity = np.array([(speed * np.cos(heading), speed * np.sin(heading), 0.0)])
+        measured_position = position + generator.normal(0.0, 30.0, (1, 3))
+        measured_velocity = velocity + generator.normal(0.0, 3.0, (1, 3))
+        tracker.update(np.array([2, 2]), np.array([0, 1]), np.array([time, time]) * 1000.0, np.repeat(measured_position, 2, axis = 0), np.repeat(measured_velocity, 2, axis = 0))
+        if time > 20.0:
+            heading = turn_rate * (time + 5.0)
+            future_position = np.array([speed / turn_rate * np.sin(heading), speed / turn_rate * (1.0 - np.cos(heading)), 1000.0])
+            predicted_position, _ = tracker.predict((time + 5.0) * 1000.0, tracker.find_tracks([2], [1]))
+            prediction_error.append(np.linalg.norm(predicted_position[0] - future_position))
+            dead_reckoning_error.append(np.linalg.norm(measured_position[0] + measured_velocity[0] * 5.0 - future_position))
+    assert tracker.tracks == 2 and tracker.updates == 2 * 119
+    assert list(tracker.find_tracks([2, 2, 0], [0, 1, 2])) == [0, 1, -1]
+    assert tracker.state[:, 6] == pytest.approx([turn_rate] * 2, abs = 0.005)
+    assert np.mean(prediction_error) < 0.6 * np.mean(dead_reckoning_error)
+
+def test_trajectory_predictor_turn():
+    fleet = AircraftFleet(2)
+    fleet.position[:] = [(0, 0, 1000), (100_000, 0, 1000)]
+    fleet.speed[:] = [(0, -100, 0), (0, -100, 0)]
+    fleet.target_speed[:] = fleet.absolute_speed
+    fleet.roll_angle[:] = [30.0, -30.0]
+    fleet.target_roll_angle[:] = fleet.roll_angle
+    fleet.target_yaw_angle[:] = [90.0, -90.0]
+    position, speed = fleet.position.copy(), fleet.speed.copy()
+    turn_rate = SimulationTrajectoryPredictor.find_turn_rate(fleet.roll_angle, np.hypot(speed[:, 0], speed[:, 1]), SimulationSettings.g_acceleration)
+    turn_duration = SimulationTrajectoryPredictor.find_turn_duration(fleet.yaw_angle, fleet.target_yaw_angle, turn_rate)
+    predictor = SimulationTrajectoryPredictor(2, horizon = 20.0, time_step = 2.0)
+    trajectory = predictor.predict(position, speed, turn_rate, turn_duration)
+    physics = SimulationFleetPhysics(fleet)
+    for _ in range(200):
+        physics.cycle(100.0)
+    assert np.linalg.norm(trajectory[:, -1] - fleet.position, axis = 1).max() < 50.0
+    assert np.linalg.norm(position + speed * 20.0 - fleet.position, axis = 1).min() > 1000.0
+    predictor.predict(position + 1.0, speed, turn_rate, turn_duration)
+    assert predictor.propagations == 2 and predictor.reuses == 2
+
+def test_trajectory_predictor_closest_approach():
+    predictor = SimulationTrajectoryPredictor(2)
+    position = np.array([(0.0, 0.0, 1000.0), (30_000.0, 300.0, 1000.0)])
+    speed = np.array([(50.0, 0.0, 0.0), (-50.0, 0.0, 0.0)])
+    trajectory = predictor.predict(position, speed, np.zeros(2), np.zeros(2))
+    time_to_closest_approach, miss_distance_vector = predictor.find_closest_approach(trajectory[[1, 0]] - trajectory)
+    assert time_to_closest_approach == pytest.approx([300.0, 300.0])
+    assert miss_distance_vector == pytest.approx(np.array([(0.0, 300.0, 0.0), (0.0, -300.0, 0.0)]))
+
+def test_batch_turn_prediction(headless_simulation):
+    sim = headless_simulation
+    batches = []
+    for turn_prediction in (False, True):
+        state = SimulationState(SimulationSettings(), is_realtime = False, avoid_collisions = True)
+        # aircrafts turning away from each other after entering minimum separation on converging courses
+        encounters = sim.generate_consistent_list_of_aircraft_lists() + [
+            [[Aircraft(aircraft_id = 0, position = Vector3D(0, 0, 1000), speed = Vector3D(-9, 40, 0), initial_target = Vector3D(16_000, -3000, 1000)),
+              Aircraft(aircraft_id = 1, position = Vector3D(-1600, 6600, 1000), speed = Vector3D(-43, 29, 0), initial_target = Vector3D(35_000, 51_000, 1000))], 0.0],
+            [[Aircraft(aircraft_id = 0, position = Vector3D(0, 0, 1000), speed = Vector3D(34, 40, 0), initial_target = Vector3D(-11_000, 2000, 1000)),
+              Aircraft(aircraft_id = 1, position = Vector3D(7200, 5900, 1000), speed = Vector3D(-12, -41, 0), initial_target = Vector3D(26_000, 13_000, 1000))], 0.0]]
+        batch = create_seeded_batch(encounters, state, turn_prediction = turn_prediction)
+        batch.run()
+        batches.append(batch)
+    straight, turning = batches
+    assert straight.trajectory_predictor is None
+    assert turning.trajectory_predictor.count == 2 * turning.fleet.count
+    assert turning.trajectory_predictor.reuses > 0
+    assert list(turning.collision) == list(straight.collision)
+    assert turning.evade_maneuvers < straight.evade_maneuvers
+    assert (turning.minimal_relative_distance >= straight.minimal_relative_distance - parity_tolerance).all()
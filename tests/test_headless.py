@@ -1,8 +1,22 @@
 import sys
+import subprocess
+import numpy as np
 import pytest
+from math import atan2, degrees, radians
+from PySide6.QtGui import QVector3D
 from PySide6.QtWidgets import QApplication
 from main import *
 from . import Simulation, SimulationSettings
+from uav_collision_avoidance.src.aircraft.aircraft import Aircraft
+from uav_collision_avoidance.src.simulation.simulation_invariants import SimulationInvariants
+from uav_collision_avoidance.src.simulation.simulation_state import SimulationState
+from uav_collision_avoidance.src.simulation.simulation_vector import Vector3D
+from uav_collision_avoidance.src.simulation.simulation_terrain import SimulationTerrain
+from uav_collision_avoidance.src.simulation.simulation_wind import SimulationWind
+from uav_collision_avoidance.src.simulation.simulation_trajectory_predictor import SimulationTrajectoryPredictor
+from uav_collision_avoidance.src.engine.engine_physics import EnginePhysics
+from uav_collision_avoidance.src.engine.engine_adsb import EngineADSB
+from uav_collision_avoidance.src.engine.engine_headless import EngineHeadless
 
 def test_headless():
         with pytest.raises(SystemExit) as e:
@@ -44,3 +58,290 @@ class TestHeadless:
             QApplication.shutdown(app)
             sys.exit(0)
         assert e.value.code == 0
+
+fast_forward_tolerance : float = 10.0 # m
+
+@pytest.mark.parametrize("fast_forward", ["adaptive_time_step", "coast_fast_forward"])
+@pytest.mark.parametrize("test_case", [3, 4])
+def test_headless_fast_forward(test_case, fast_forward):
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication()
+    SimulationSettings.set_simulation_frequency(10.0)
+    sim = Simulation(headless = True)
+    results = []
+    simulated_times = []
+    for enabled in [False, True]:
+        sim.setup_debug_aircrafts(test_case)
+        engine = EngineHeadless(sim.aircrafts, SimulationState(SimulationSettings(), is_realtime = False), sim.simulation_time)
+        engine.run(**{fast_forward : enabled})
+        simulated_times.append(engine.physics.simulated_time)
+        sim.setup_debug_aircrafts(test_case)
+        simulation_data = sim.run_headless(avoid_collisions = False, **{fast_forward : enabled})
+        results.append((simulation_data, sim.simulation_physics.cycles))
+        sim.state = None
+    (fixed, fixed_cycles), (fast, fast_cycles) = results
+    assert fast_cycles < fixed_cycles
+    assert simulated_times[1] == simulated_times[0]
+    assert fast.collision == fixed.collision
+    assert abs(fast.minimal_relative_distance - fixed.minimal_relative_distance) <= fast_forward_tolerance
+    assert fast.aircraft_1_final_position.distanceToPoint(fixed.aircraft_1_final_position) <= fast_forward_tolerance
+    assert fast.aircraft_2_final_position.distanceToPoint(fixed.aircraft_2_final_position) <= fast_forward_tolerance
+    QApplication.shutdown(app)
+
+@pytest.mark.parametrize("headless_simulation", [1.0], indirect = True)
+def test_headless_swept_collision(headless_simulation):
+    sim = headless_simulation
+    aircrafts = [
+        Aircraft(
+            aircraft_id = 0,
+            position = QVector3D(0, -1013, 1000),
+            speed = QVector3D(0, 250, 0),
+            initial_target = QVector3D(0, 100_000, 1000)),
+        Aircraft(
+            aircraft_id = 1,
+            position = QVector3D(5, 1013, 1000),
+            speed = QVector3D(0, -250, 0),
+            initial_target = QVector3D(5, -100_000, 1000)),
+    ]
+    simulation_data = sim.run_headless(avoid_collisions = False, aircrafts = aircrafts)
+    assert simulation_data.collision
+    assert simulation_data.aircraft_1_final_position.distanceToPoint(simulation_data.aircraft_2_final_position) == pytest.approx(20.0, abs = 0.01)
+
+def test_vehicle_turn_heading():
+    aircraft = Aircraft(
+        aircraft_id = 0,
+        position = QVector3D(0, 0, 1000),
+        speed = QVector3D(30, -40, 5),
+        initial_target = QVector3D(0, -100_000, 1000))
+    vehicle = aircraft.vehicle
+    horizontal_speed : float = vehicle.horizontal_speed
+    pitch_angle : float = vehicle.pitch_angle
+    assert vehicle.yaw_angle == pytest.approx(degrees(atan2(30, 40)))
+    for _ in range(100):
+        vehicle.turn(radians(7.0))
+    sin_yaw, cos_yaw = vehicle.heading
+    assert vehicle.yaw_angle == pytest.approx(degrees(atan2(vehicle.speed.x(), -vehicle.speed.y())), abs = 1e-4)
+    assert vehicle.yaw_angle == pytest.approx(degrees(atan2(sin_yaw, cos_yaw)), abs = 1e-4)
+    assert vehicle.horizontal_speed == pytest.approx(horizontal_speed, rel = 1e-5)
+    assert vehicle.pitch_angle == pytest.approx(pitch_angle)
+    vehicle.speed = QVector3D(-50, 0, 0)
+    assert vehicle.yaw_angle == pytest.approx(-90.0)
+    assert vehicle.heading == pytest.approx((-1.0, 0.0))
+
+def test_vehicle_position_precision():
+    aircraft = Aircraft(
+        aircraft_id = 0,
+        position = QVector3D(0, 2_000_000, 1000),
+        speed = QVector3D(0, 100, 0))
+    position = aircraft.vehicle.position
+    for _ in range(1000):
+        aircraft.vehicle.move(0.0, 0.001)
+    assert position is aircraft.vehicle.position
+    assert position.y() == pytest.approx(2_000_001.0, abs = 1e-6)
+    assert position.distanceToPoint(aircraft.initial_position) == pytest.approx(1.0, abs = 1e-6)
+
+def test_invariant_monitor():
+    aircraft = Aircraft(
+        aircraft_id = 0,
+        position = QVector3D(0, 0, 1000),
+        speed = QVector3D(0, 0, 50))
+    sampled = SimulationInvariants(mode = "sampled", period = 10)
+    full = SimulationInvariants(mode = "full")
+    off = SimulationInvariants(mode = "off")
+    for cycle in range(1, 101):
+        for monitor in (sampled, full, off):
+            monitor.check(cycle, [aircraft.vehicle])
+    assert (off.checks, sampled.checks, full.checks) == (0, 10, 100)
+    assert off.violations_count == 0
+    assert sampled.violations_count == 10
+    assert full.violations_count == 100
+    assert all(aircraft_id == 0 and "horizontal speed" in description for _, aircraft_id, description in full.violations)
+    assert "100 violations in 100 checks" in full.report()
+    mode, period = SimulationSettings.invariant_check_mode, SimulationSettings.invariant_check_period
+    try:
+        SimulationSettings.set_invariant_check_mode("sampled", 20)
+        monitor = SimulationInvariants()
+        assert (monitor.mode, monitor.period) == ("sampled", 20)
+        assert monitor.is_due(40) and not monitor.is_due(30)
+        monitor.mode = "off"
+        assert not monitor.is_due(40)
+        with pytest.raises(AssertionError):
+            monitor.mode = "always"
+    finally:
+        SimulationSettings.set_invariant_check_mode(mode, period)
+
+def test_engine_without_qt():
+    script = "\n".join([
+        "import sys",
+        "sys.modules['PySide6'] = None",
+        "from uav_collision_avoidance.src.engine.engine_headless import EngineHeadless",
+        "from uav_collision_avoidance.src.aircraft.aircraft import Aircraft",
+        "from uav_collision_avoidance.src.simulation.simulation_state import SimulationState",
+        "from uav_collision_avoidance.src.simulation.simulation_settings import SimulationSettings",
+        "from uav_collision_avoidance.src.simulation.simulation_vector import Vector3D",
+        "SimulationSettings.set_simulation_frequency(10.0)",
+        "aircrafts = [",
+        "    Aircraft(0, Vector3D(0, -1013, 1000), Vector3D(0, 250, 0), Vector3D(0, 100_000, 1000)),",
+        "    Aircraft(1, Vector3D(5, 1013, 1000), Vector3D(0, -250, 0), Vector3D(5, -100_000, 1000))]",
+        "simulation_data = EngineHeadless(aircrafts, SimulationState(SimulationSettings(), is_realtime = False)).run()",
+        "assert simulation_data.collision",
+    ])
+    result = subprocess.run([sys.executable, "-c", script], capture_output = True, text = True)
+    assert result.returncode == 0, result.stderr
+
+def create_encounter(offset : float, roll_angle : float) -> list:
+    return [
+        Aircraft(
+            aircraft_id = 0,
+            position = QVector3D(offset, -5000, 1000),
+            speed = QVector3D(60, -60, 0),
+            initial_target = QVector3D(51_900, -50_000, 3000),
+            initial_roll_angle = roll_angle),
+        Aircraft(
+            aircraft_id = 1,
+            position = QVector3D(4000, 6000, 1000),
+            speed = QVector3D(0, -85, 0),
+            initial_target = QVector3D(900, -1_001_300, 1000)),
+    ]
+
+def test_headless_engine_reseed():
+    SimulationSettings.set_simulation_frequency(10.0)
+    encounters = [create_encounter(0.0, 0.0), create_encounter(-300.0, 10.0)]
+    engine = EngineHeadless(encounters[0], SimulationState(SimulationSettings(), is_realtime = False), simulation_time = 300_000)
+    aircrafts = list(engine.aircrafts)
+    reused = [engine.run()]
+    for encounter, avoid_collisions in [(encounters[1], True), (encounters[0], False)]:
+        engine.reseed(encounter, avoid_collisions = avoid_collisions)
+        reused.append(engine.run())
+    assert all(aircraft is reseeded for aircraft, reseeded in zip(aircrafts, engine.aircrafts))
+    fresh_state = SimulationState(SimulationSettings(), is_realtime = False, avoid_collisions = True)
+    fresh = EngineHeadless(encounters[1], fresh_state, simulation_time = 300_000).run()
+    for expected, data in [(reused[0], reused[2]), (fresh, reused[1])]:
+        assert data.collision == expected.collision
+        assert data.minimal_relative_distance == expected.minimal_relative_distance
+        assert data.aircraft_1_final_position == expected.aircraft_1_final_position
+        assert data.aircraft_2_final_speed == expected.aircraft_2_final_speed
+
+def test_guidance_rate(simulation_settings):
+    simulation_settings.set_simulation_frequency(100.0)
+    results = []
+    for guidance_frequency in [100.0, 10.0]:
+        simulation_settings.set_guidance_frequency(guidance_frequency)
+        engine = EngineHeadless(create_encounter(0.0, 10.0), SimulationState(SimulationSettings(), is_realtime = False), simulation_time = 60_000)
+        results.append(engine.run())
+        engine.physics.restart()
+        assert sum(engine.physics.is_guidance_due(10.0) for _ in range(100)) == guidance_frequency
+    every_cycle, held = results
+    assert held.aircraft_1_final_position.distanceToPoint(every_cycle.aircraft_1_final_position) <= fast_forward_tolerance
+    assert held.aircraft_2_final_position.distanceToPoint(every_cycle.aircraft_2_final_position) <= fast_forward_tolerance
+
+def test_headless_terrain_collision(tmp_path):
+    SimulationSettings.set_simulation_frequency(10.0)
+    # ridge rising 2500m high around y -20km and -19km across the first aircraft's path
+    elevation = np.zeros((81, 81), dtype = np.float32)
+    elevation[20:22] = 2500.0
+    elevation.tofile(tmp_path / "ridge.raw")
+    terrain = SimulationTerrain(str(tmp_path / "ridge.raw"), shape = elevation.shape, cell_size = 1000.0, origin = (-40_000.0, -40_000.0))
+    for coast_fast_forward in [False, True]:
+        state = SimulationState(SimulationSettings(), is_realtime = False)
+        state.terrain = terrain
+        engine = EngineHeadless(create_encounter(0.0, 0.0), state, simulation_time = 60_000_000)
+        data = engine.run(coast_fast_forward = coast_fast_forward)
+        assert data.collision
+        position = data.aircraft_1_final_position
+        assert -21_000.0 < position.y() < -18_000.0
+        assert position.z() <= terrain.find_height(position.x(), position.y())
+
+def test_engine_wind_drift():
+    SimulationSettings.set_simulation_frequency(10.0)
+    positions = []
+    for wind in [None, SimulationWind.uniform((5.0, -3.0, 0.0))]:
+        state = SimulationState(SimulationSettings(), is_realtime = False)
+        state.wind = wind
+        aircrafts = create_encounter(0.0, 10.0)
+        for aircraft in aircrafts:
+            aircraft.fcc.clear_destinations()
+        physics = EnginePhysics(aircrafts, state)
+        for _ in range(100):
+            physics.cycle(100.0)
+        assert physics.simulated_time == 10_000.0
+        positions.append([aircraft.vehicle.position for aircraft in aircrafts])
+    for still, windy in zip(*positions):
+        assert windy.x() - still.x() == pytest.approx(50.0)
+        assert windy.y() - still.y() == pytest.approx(-30.0)
+        assert windy.z() == pytest.approx(still.z())
+
+def test_adsb_conflict_pairs():
+    generator = np.random.default_rng(7)
+    position = generator.uniform(-50_000.0, 50_000.0, (60, 3))
+    speed = generator.uniform(-250.0, 250.0, (60, 3))
+    first, second, time_to_closest_approach, miss_distance_vector, unresolved_region = EngineADSB.find_conflict_pairs(position, speed, 9260.0, lookahead = 120.0, block_size = 7)
+    expected = []
+    for i in range(60):
+        for j in range(i + 1, 60):
+            relative_position = position[i] - position[j]
+            speed_difference = speed[i] - speed[j]
+            time = min(max(-relative_position @ speed_difference / (speed_difference @ speed_difference), 0.0), 120.0)
+            if np.linalg.norm(relative_position + speed_difference * time) < 9260.0:
+                expected.append((i, j, time))
+    assert len(expected) > 0
+    assert [(i, j) for i, j, _ in expected] == list(zip(first.tolist(), second.tolist()))
+    assert np.allclose(time_to_closest_approach, [time for _, _, time in expected])
+    assert np.allclose(unresolved_region, 9260.0 - np.linalg.norm(miss_distance_vector, axis = 1))
+    assert (unresolved_region > 0.0).all()
+
+@pytest.mark.parametrize("adsb_frequency", [1.0, 0.2])
+def test_headless_minimal_relative_distance_between_adsb_cycles(adsb_frequency):
+    SimulationSettings.set_simulation_frequency(10.0)
+    SimulationSettings.set_adsb_frequency(adsb_frequency)
+    try:
+        encounter = [
+            Aircraft(aircraft_id = 0, position = QVector3D(0, -10_025, 1000), speed = QVector3D(0, 50, 0), initial_target = QVector3D(0, 1_000_000, 1000)),
+            Aircraft(aircraft_id = 1, position = QVector3D(300, 10_025, 1000), speed = QVector3D(0, -50, 0), initial_target = QVector3D(300, -1_000_000, 1000))]
+        simulation_data = EngineHeadless(encounter, SimulationState(SimulationSettings(), is_realtime = False), simulation_time = 60_000_000).run()
+    finally:
+        SimulationSettings.set_adsb_frequency(1.0)
+    # closest approach falls between ADS-B cycles
+    assert simulation_data.minimal_relative_distance == pytest.approx(300.0)
+    assert simulation_data.minimal_relative_distance_time == pytest.approx(200_500.0)
+
+def test_headless_collision_time():
+    SimulationSettings.set_simulation_frequency(10.0)
+    encounter = [
+        Aircraft(aircraft_id = 0, position = QVector3D(0, -10_027.5, 1000), speed = QVector3D(0, 50, 0), initial_target = QVector3D(0, 1_000_000, 1000)),
+        Aircraft(aircraft_id = 1, position = QVector3D(0, 10_027.5, 1000), speed = QVector3D(0, -50, 0), initial_target = QVector3D(0, -1_000_000, 1000))]
+    simulation_data = EngineHeadless(encounter, SimulationState(SimulationSettings(), is_realtime = False), simulation_time = 60_000_000).run()
+    # first contact at 20m separation falls within a physics step
+    assert simulation_data.collision
+    assert simulation_data.minimal_relative_distance_time == pytest.approx(200_350.0)
+
+def test_headless_turn_prediction():
+    SimulationSettings.set_simulation_frequency(10.0)
+    state = SimulationState(SimulationSettings(), is_realtime = False, avoid_collisions = True)
+    engine = EngineHeadless(create_encounter(0.0, 30.0), state, simulation_time = 60_000_000)
+    engine.adsb.trajectory_predictor = SimulationTrajectoryPredictor(2)
+    time_to_closest_approach, _ = engine.adsb.find_turning_closest_approach()
+    assert 0.0 < time_to_closest_approach < SimulationSettings.prediction_horizon
+    data = engine.run()
+    assert not data.collision
+    assert engine.adsb.trajectory_predictor.propagations > 0
+
+def test_engine_conflicts():
+    SimulationSettings.set_simulation_frequency(10.0)
+    engine = EngineHeadless(create_encounter(0.0, 0.0), SimulationState(SimulationSettings(), is_realtime = False))
+    first, second, time_to_closest_approach, miss_distance_vector, _ = engine.adsb.find_conflicts()
+    relative_position = engine.aircrafts[0].vehicle.position - engine.aircrafts[1].vehicle.position
+    speed_difference = engine.aircrafts[0].vehicle.speed - engine.aircrafts[1].vehicle.speed
+    assert (first.tolist(), second.tolist()) == ([0], [1])
+    assert time_to_closest_approach[0] == pytest.approx(-Vector3D.dotProduct(relative_position, speed_difference) / Vector3D.dotProduct(speed_difference, speed_difference))
+    assert np.linalg.norm(miss_distance_vector[0]) < engine.simulation_state.minimum_separation
+    # head-on aircrafts 50 km apart lie far beyond neighbouring cells of minimum separation size
+    engine = EngineHeadless([
+        Aircraft(aircraft_id = 0, position = QVector3D(0, -25_000, 1000), speed = QVector3D(0, 100, 0), initial_target = QVector3D(0, 100_000, 1000)),
+        Aircraft(aircraft_id = 1, position = QVector3D(300, 25_000, 1000), speed = QVector3D(0, -100, 0), initial_target = QVector3D(300, -100_000, 1000))],
+        SimulationState(SimulationSettings(), is_realtime = False))
+    conflicts = engine.adsb.find_conflicts()
+    assert conflicts[0].tolist() == [0] and conflicts[2][0] == pytest.approx(250.0)
+    for broad_phase in ("hash", "sweep"):
+        assert all(np.array_equal(a, b) for a, b in zip(conflicts, engine.adsb.find_conflicts(broad_phase = broad_phase)))
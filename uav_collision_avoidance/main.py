@@ -8,9 +8,7 @@ import multiprocessing
 from pathlib import Path
 from screeninfo import get_monitors
 
-from PySide6.QtWidgets import QApplication
 from .version import __version__ as version
-from .src.simulation.simulation import Simulation, SimulationSettings
 
 try:
     start_time = datetime.datetime.now().strftime("%Y-%m-%d")
@@ -42,6 +40,7 @@ if platform.system() == "Windows":
 logging.info("Detected platform: %s", platform.system())
 
 def run_simulation_tests(test_number : int) -> None:
+    from .src.simulation.simulation import Simulation
     sim : Simulation = Simulation(headless = True, tests = True)
     if test_number > 0:
         sim.run_tests(test_number)
@@ -51,6 +50,10 @@ def run_simulation_tests(test_number : int) -> None:
 def main(arg = None) -> None:
     """Executes main function"""
     import sys
+    # Qt is only needed by the application itself, the simulation engine imports without it
+    from PySide6.QtWidgets import QApplication
+    from .src.simulation.simulation import Simulation, SimulationSettings
+    from .src.simulation.simulation_invariants import SimulationInvariants
     args = sys.argv[1:]
     app = QApplication(args)
     app.setApplicationName("UAV Collision Avoidance")
@@ -58,6 +61,9 @@ def main(arg = None) -> None:
     SimulationSettings.screen_resolution = app.primaryScreen().size()
     logging.info("%s %s", app.applicationName(), app.applicationVersion())
     sim : Simulation | None = None
+    if len(args) > 1 and args[0] in ("headless", "tests") and args[-1] in SimulationInvariants.modes:
+        # invariant check mode trails headless and tests arguments
+        SimulationSettings.set_invariant_check_mode(args.pop())
     if len(args) > 0 or arg is not None:
         if args[0] == "realtime" or args[0] == "default" or args[0] == "gui":
             if len(get_monitors()) == 0:
@@ -83,13 +89,26 @@ def main(arg = None) -> None:
             sys.exit(app.exec())
         elif args[0] == "headless" or arg == "headless":
             sim = Simulation(headless = True)
-            sim.run()
+            if len(args) > 1 and args[1] == "adaptive":
+                sim.run_headless(adaptive_time_step = True)
+            elif len(args) > 1 and args[1] == "coast":
+                sim.run_headless(coast_fast_forward = True)
+            elif len(args) > 1 and args[1] == "turn":
+                sim.run_headless(turn_prediction = True)
+            else:
+                sim.run()
             QApplication.shutdown(app)
             sys.exit(0)
         elif args[0] == "tests" or arg == "tests":
             sim = Simulation(headless = True, tests = True)
+            batched : bool = len(args) > 2 and args[2] == "batched"
+            adaptive_time_step : bool = len(args) > 2 and args[2] == "adaptive"
+            coast_fast_forward : bool = len(args) > 2 and args[2] == "coast"
+            adaptive_surveillance : bool = len(args) > 2 and args[2] == "surveillance"
+            turn_prediction : bool = len(args) > 2 and args[2] == "turn"
+            level_of_detail : bool = len(args) > 2 and args[2] == "detail"
             if len(args) > 1 and int(args[1]) > 0:
-                sim.run_tests(test_number = int(args[1]))
+                sim.run_tests(test_number = int(args[1]), batched = batched, adaptive_time_step = adaptive_time_step, coast_fast_forward = coast_fast_forward, adaptive_surveillance = adaptive_surveillance, turn_prediction = turn_prediction, level_of_detail = level_of_detail)
             else:
                 sim.run()
             QApplication.shutdown(app)
@@ -111,6 +130,31 @@ def main(arg = None) -> None:
             sim.run_headless(avoid_collisions = True)
             QApplication.shutdown(app)
             sys.exit(0)
+        elif args[0] == "parity":
+            duration : int = 60_000
+            if len(args) >= 2:
+                duration = int(args[1])
+                if len(args) >= 3:
+                    print(f"Invalid arguments: {args}")
+                    logging.warning("Invalid arguments: %s", args)
+            sim = Simulation(headless = True)
+            deviations = sim.run_physics_parity(duration = duration)
+            QApplication.shutdown(app)
+            sys.exit(0 if all(deviation <= 1.0 for deviation in deviations) else 1)
+        elif args[0] == "scaling":
+            max_count : int = 100_000
+            lookahead : float = 0.0
+            if len(args) >= 2:
+                max_count = int(args[1])
+                if len(args) >= 3:
+                    lookahead = float(args[2])
+                if len(args) >= 4:
+                    print(f"Invalid arguments: {args}")
+                    logging.warning("Invalid arguments: %s", args)
+            sim = Simulation(headless = True)
+            sim.run_broad_phase_benchmark(counts = tuple(10 ** i for i in range(1, 7) if 10 ** i <= max_count), lookahead = lookahead)
+            QApplication.shutdown(app)
+            sys.exit(0)
         elif args[0] == "ongoing":
             processes = []
             concurrent_tests = multiprocessing.cpu_count()
@@ -129,17 +173,25 @@ def main(arg = None) -> None:
                 print("Description: Runs the simulation in real-time with GUI")
                 sys.exit(0)
             elif args[1] == "headless":
-                print("Usage: uav_collision_avoidance headless")
-                print("Description: Runs the simulation in headless mode without GUI")
+                print("Usage: uav_collision_avoidance headless [adaptive|coast|turn] [off|sampled|full]")
+                print("Description: Runs the simulation in headless mode without GUI, adaptive lengthens time steps while aircrafts are far from conflict, coast jumps over straight flight up to the next event, turn skips evade maneuvers in conflicts which aircrafts keeping their turns resolve, off, sampled or full checks physics invariants never, every 100th physics cycle or every cycle")
                 sys.exit(0)
             elif args[1] == "tests":
-                print("Usage: uav_collision_avoidance tests [test_number]")
-                print("Description: Runs the simulation multiple times in headless mode without GUI defaulting to 10 times")
+                print("Usage: uav_collision_avoidance tests [test_number] [batched|adaptive|coast|surveillance|turn|detail] [off|sampled|full]")
+                print("Description: Runs the simulation multiple times in headless mode without GUI defaulting to 10 times, batched runs all tests together without path exports, adaptive lengthens time steps while aircrafts are far from conflict, coast jumps over straight flight up to the next event, surveillance batches tests evaluating encounters every ADS-B period near threats and less often while they are benign, turn skips evade maneuvers in conflicts which aircrafts keeping their turns resolve, detail batches tests flying aircrafts far from their partners kinematically, off, sampled or full checks physics invariants of unbatched tests never, every 100th physics cycle or every cycle")
                 sys.exit(0)
             elif args[1] == "load":
                 print("Usage: uav_collision_avoidance load [file_path] [test_index]")
                 print("Description: Loads a simulation data file and runs the simulation in headless mode without GUI, defaults to example data file")
                 sys.exit(0)
+            elif args[1] == "parity":
+                print("Usage: uav_collision_avoidance parity [duration_ms]")
+                print("Description: Compares vectorized fleet physics against per-object physics on consistent test cases, duration defaults to 60000 ms")
+                sys.exit(0)
+            elif args[1] == "scaling":
+                print("Usage: uav_collision_avoidance scaling [max_count] [lookahead_s]")
+                print("Description: Benchmarks conflict checks with broad-phase against all pairs from 10 aircrafts up to max count, defaulting to 100000, separation checks use spatial hash, lookahead probes use sweep and prune")
+                sys.exit(0)
             elif args[1] == "ongoing":
                 print("Usage: uav_collision_avoidance ongoing")
                 print("Description: Runs the simulation tests indefinitely")
@@ -153,7 +205,7 @@ def main(arg = None) -> None:
                 logging.error("Invalid argument: %s", args[1])
                 sys.exit(1)
         elif args[0] == "help":
-            print("Usage: uav_collision_avoidance [realtime|headless|tests|load|ongoing|help|version]")
+            print("Usage: uav_collision_avoidance [realtime|headless|tests|load|parity|scaling|ongoing|help|version]")
             sys.exit(0)
         elif args[0] == "version":
             print(f"{app.applicationName()} {app.applicationVersion()}")
@@ -164,7 +216,7 @@ def main(arg = None) -> None:
             sys.exit(1)
         else:
             print(f"Invalid argument: {args[0]}")
-            print("Usage: uav_collision_avoidance [realtime|headless|tests|load|ongoing|help|version]")
+            print("Usage: uav_collision_avoidance [realtime|headless|tests|load|parity|scaling|ongoing|help|version]")
             logging.error("Invalid argument: %s", args[0])
             sys.exit(1)
     else:
@@ -1,66 +1,82 @@
 """Aircraft class module"""
 
 from copy import copy
+from threading import Lock
 
-from PySide6.QtCore import QObject, QMutex, QMutexLocker
-from PySide6.QtGui import QVector3D
+from ..simulation.simulation_vector import Vector3D
 
 from .aircraft_vehicle import AircraftVehicle
 from .aircraft_fcc import AircraftFCC
 
-class Aircraft(QObject):
+class Aircraft:
     """Main aircraft class"""
 
-    def __init__(self, aircraft_id : int, position : QVector3D, speed : QVector3D, initial_target : QVector3D | None = None, initial_roll_angle : float = 0.0) -> None:
-        super().__init__()
-        self.__mutex : QMutex = QMutex()
+    def __init__(self, aircraft_id : int, position : Vector3D, speed : Vector3D, initial_target : Vector3D | None = None, initial_roll_angle : float = 0.0) -> None:
+        self.__mutex : Lock = Lock()
         self.__aircraft_id : int = aircraft_id
+        position = Vector3D.from_vector(position)
+        speed = Vector3D.from_vector(speed)
+        if initial_target is not None:
+            initial_target = Vector3D.from_vector(initial_target)
         self.__vehicle : AircraftVehicle = AircraftVehicle(self.__aircraft_id, position=position, speed=speed, initial_roll_angle=initial_roll_angle)
         self.__fcc : AircraftFCC = AircraftFCC(self.__aircraft_id, initial_target, self.__vehicle)
         self.__initial_position = copy(position)
-        self.__initial_target : QVector3D = copy(initial_target)
-        self.__initial_speed : QVector3D = copy(speed)
+        self.__initial_target : Vector3D = copy(initial_target)
+        self.__initial_speed : Vector3D = copy(speed)
         self.__initial_roll_angle : float = initial_roll_angle
     
+    @property
+    def aircraft_id(self) -> int:
+        """Returns aircraft id"""
+        with self.__mutex:
+            return self.__aircraft_id
+
     @property
     def vehicle(self) -> AircraftVehicle:
         """Returns aircraft vehicle"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__vehicle
     
     @property
     def fcc(self) -> AircraftFCC:
         """Returns aircraft fcc"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__fcc
     
     @property
-    def initial_position(self) -> QVector3D:
+    def initial_position(self) -> Vector3D:
         """Returns initial position"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__initial_position
         
     @property
-    def initial_target(self) -> QVector3D:
+    def initial_target(self) -> Vector3D:
         """Returns initial target"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__initial_target
     
     @property
-    def initial_speed(self) -> QVector3D:
+    def initial_speed(self) -> Vector3D:
         """Returns initial speed"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__initial_speed
         
     @property
     def initial_roll_angle(self) -> float:
         """Returns initial roll angle"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__initial_roll_angle
 
     def reset(self) -> None:
         """Resets the aircraft to initial state"""
-        self.__vehicle.speed = copy(self.initial_speed)
-        self.__vehicle.position = copy(self.initial_position)
-        self.__vehicle.roll_angle = copy(self.initial_roll_angle)
-        self.__vehicle.reset_distance_covered()
+        self.__vehicle.reset(self.initial_position, self.initial_speed, self.initial_roll_angle)
+
+    def reseed(self, position : Vector3D, speed : Vector3D, initial_target : Vector3D | None = None, initial_roll_angle : float = 0.0) -> None:
+        """Replaces initial state in place and resets the aircraft and its flight control computer to it"""
+        with self.__mutex:
+            self.__initial_position.assign(position)
+            self.__initial_speed.assign(speed)
+            self.__initial_target = None if initial_target is None else Vector3D.from_vector(initial_target)
+            self.__initial_roll_angle = initial_roll_angle
+        self.reset()
+        self.__fcc.reseed(copy(self.initial_target))
@@ -0,0 +1,336 @@
+"""Aircraft fleet structure-of-arrays module"""
+
+import logging
+from collections import deque
+from typing import List, Tuple
+from math import atan2, degrees, dist, radians, tan
+
+import numpy as np
+
+class AircraftFleet:
+    """Aircraft fleet state stored as contiguous float64 arrays, one row per aircraft"""
+
+    def __init__(self, count : int) -> None:
+        self.__count : int = count
+        self.__aircraft_ids : np.ndarray = np.arange(count, dtype = np.int64)
+
+        # vehicle
+        self.__position : np.ndarray = np.zeros((count, 3), dtype = np.float64)
+        self.__speed : np.ndarray = np.zeros((count, 3), dtype = np.float64)
+        self.__wind : np.ndarray = np.zeros((count, 3), dtype = np.float64) # m/s
+        self.__roll_angle : np.ndarray = np.zeros(count, dtype = np.float64)
+        self.__distance_covered : np.ndarray = np.zeros(count, dtype = np.float64)
+        self.__size : np.ndarray = np.full(count, 20.0, dtype = np.float64)
+        self.__roll_dynamic_delay : np.ndarray = np.full(count, 1000.0, dtype = np.float64) # ms
+        self.__pitch_dynamic_delay : np.ndarray = np.full(count, 2000.0, dtype = np.float64) # ms
+        self.__max_acceleration : np.ndarray = np.full(count, 2.0, dtype = np.float64) # m/s^2
+        self.__collided : np.ndarray = np.zeros(count, dtype = bool)
+        self.__active : np.ndarray = np.ones(count, dtype = bool)
+        self.__dormant : np.ndarray = np.zeros(count, dtype = bool)
+        self.__group : np.ndarray = np.zeros(count, dtype = np.int64)
+
+        # flight control computer
+        self.__target_yaw_angle : np.ndarray = np.zeros(count, dtype = np.float64)
+        self.__target_pitch_angle : np.ndarray = np.zeros(count, dtype = np.float64)
+        self.__target_roll_angle : np.ndarray = np.zeros(count, dtype = np.float64)
+        self.__target_speed : np.ndarray = np.zeros(count, dtype = np.float64)
+        self.__autopilot : np.ndarray = np.ones(count, dtype = bool)
+        self.__ignore_destinations : np.ndarray = np.zeros(count, dtype = bool)
+        self.__is_turning_right : np.ndarray = np.zeros(count, dtype = bool)
+        self.__is_turning_left : np.ndarray = np.zeros(count, dtype = bool)
+        self.__evade_maneuver : np.ndarray = np.zeros(count, dtype = bool)
+        self.__safe_zone_occupied : np.ndarray = np.zeros(count, dtype = bool)
+
+        # destinations are kept in per aircraft queues mirrored by the first two entries
+        self.__destinations : List[deque[Tuple[float, float, float]]] = [deque() for _ in range(count)]
+        self.__destinations_history : List[List[Tuple[float, float, float]]] = [[] for _ in range(count)]
+        self.__destination : np.ndarray = np.zeros((count, 3), dtype = np.float64)
+        self.__has_destination : np.ndarray = np.zeros(count, dtype = bool)
+        self.__next_destination : np.ndarray = np.zeros((count, 3), dtype = np.float64)
+        self.__has_next_destination : np.ndarray = np.zeros(count, dtype = bool)
+
+    @classmethod
+    def from_aircrafts(cls, aircrafts : list) -> "AircraftFleet":
+        """Creates fleet snapshot of the given aircrafts' vehicles and flight control computers"""
+        fleet : AircraftFleet = cls(len(aircrafts))
+        for i, aircraft in enumerate(aircrafts):
+            vehicle = aircraft.vehicle
+            fcc = aircraft.fcc
+            fleet.aircraft_ids[i] = vehicle.aircraft_id
+            fleet.position[i] = vehicle.position.toTuple()
+            fleet.speed[i] = vehicle.speed.toTuple()
+            fleet.wind[i] = vehicle.wind.toTuple()
+            fleet.roll_angle[i] = vehicle.roll_angle
+            fleet.distance_covered[i] = vehicle.distance_covered
+            fleet.size[i] = vehicle.size
+            fleet.roll_dynamic_delay[i] = vehicle.roll_dynamic_delay
+            fleet.pitch_dynamic_delay[i] = vehicle.pitch_dynamic_delay
+            fleet.max_acceleration[i] = vehicle.max_acceleration
+            fleet.target_yaw_angle[i] = fcc.target_yaw_angle
+            fleet.target_pitch_angle[i] = fcc.target_pitch_angle
+            fleet.target_roll_angle[i] = fcc.target_roll_angle
+            fleet.target_speed[i] = fcc.target_speed
+            fleet.autopilot[i] = fcc.autopilot
+            fleet.ignore_destinations[i] = fcc.ignore_destinations
+            fleet.evade_maneuver[i] = fcc.evade_maneuver
+            fleet.safe_zone_occupied[i] = fcc.safe_zone_occupied
+            fleet.destinations[i].extend(destination.toTuple() for destination in fcc.destinations)
+        fleet.refresh_destinations()
+        logging.info("Created aircraft fleet of %d aircrafts", fleet.count)
+        return fleet
+
+    @property
+    def count(self) -> int:
+        """Returns aircrafts count"""
+        return self.__count
+
+    @property
+    def aircraft_ids(self) -> np.ndarray:
+        """Returns aircraft ids"""
+        return self.__aircraft_ids
+
+    @property
+    def position(self) -> np.ndarray:
+        """Returns positions array of shape (count, 3)"""
+        return self.__position
+
+    @property
+    def speed(self) -> np.ndarray:
+        """Returns speed vectors array of shape (count, 3)"""
+        return self.__speed
+
+    @property
+    def wind(self) -> np.ndarray:
+        """Returns wind speed vectors at aircrafts positions array of shape (count, 3)"""
+        return self.__wind
+
+    @property
+    def ground_speed(self) -> np.ndarray:
+        """Returns speed over the ground vectors, the speeds through the air drifted by wind"""
+        return self.__speed + self.__wind
+
+    @property
+    def roll_angle(self) -> np.ndarray:
+        """Returns roll angles"""
+        return self.__roll_angle
+
+    @property
+    def distance_covered(self) -> np.ndarray:
+        """Returns covered distances"""
+        return self.__distance_covered
+
+    @property
+    def size(self) -> np.ndarray:
+        """Returns sizes"""
+        return self.__size
+
+    @property
+    def roll_dynamic_delay(self) -> np.ndarray:
+        """Returns roll dynamic delays"""
+        return self.__roll_dynamic_delay
+
+    @property
+    def pitch_dynamic_delay(self) -> np.ndarray:
+        """Returns pitch dynamic delays"""
+        return self.__pitch_dynamic_delay
+
+    @property
+    def max_acceleration(self) -> np.ndarray:
+        """Returns maximal accelerations"""
+        return self.__max_acceleration
+
+    @property
+    def collided(self) -> np.ndarray:
+        """Returns collision flags"""
+        return self.__collided
+
+    @property
+    def active(self) -> np.ndarray:
+        """Returns flags of aircrafts advanced by the physics"""
+        return self.__active
+
+    @property
+    def dormant(self) -> np.ndarray:
+        """Returns flags of aircrafts flying kinematically, without flight control computer and attitude dynamics updates"""
+        return self.__dormant
+
+    @property
+    def group(self) -> np.ndarray:
+        """Returns group ids, only aircrafts sharing a group can collide with each other"""
+        return self.__group
+
+    @property
+    def target_yaw_angle(self) -> np.ndarray:
+        """Returns target yaw angles"""
+        return self.__target_yaw_angle
+
+    @property
+    def target_pitch_angle(self) -> np.ndarray:
+        """Returns target pitch angles"""
+        return self.__target_pitch_angle
+
+    @property
+    def target_roll_angle(self) -> np.ndarray:
+        """Returns target roll angles"""
+        return self.__target_roll_angle
+
+    @property
+    def target_speed(self) -> np.ndarray:
+        """Returns target speeds"""
+        return self.__target_speed
+
+    @property
+    def autopilot(self) -> np.ndarray:
+        """Returns autopilot states"""
+        return self.__autopilot
+
+    @property
+    def ignore_destinations(self) -> np.ndarray:
+        """Returns ignore destinations states"""
+        return self.__ignore_destinations
+
+    @property
+    def is_turning_right(self) -> np.ndarray:
+        """Returns turning right states"""
+        return self.__is_turning_right
+
+    @property
+    def is_turning_left(self) -> np.ndarray:
+        """Returns turning left states"""
+        return self.__is_turning_left
+
+    @property
+    def evade_maneuver(self) -> np.ndarray:
+        """Returns evade maneuver states"""
+        return self.__evade_maneuver
+
+    @property
+    def safe_zone_occupied(self) -> np.ndarray:
+        """Returns safe zone occupied states"""
+        return self.__safe_zone_occupied
+
+    @property
+    def destinations(self) -> List[deque[Tuple[float, float, float]]]:
+        """Returns destinations queues"""
+        return self.__destinations
+
+    @property
+    def destinations_history(self) -> List[List[Tuple[float, float, float]]]:
+        """Returns destinations history lists"""
+        return self.__destinations_history
+
+    @property
+    def destination(self) -> np.ndarray:
+        """Returns current destinations array, valid where has_destination is set"""
+        return self.__destination
+
+    @property
+    def has_destination(self) -> np.ndarray:
+        """Returns current destination presence flags"""
+        return self.__has_destination
+
+    @property
+    def next_destination(self) -> np.ndarray:
+        """Returns next destinations array, valid where has_next_destination is set"""
+        return self.__next_destination
+
+    @property
+    def has_next_destination(self) -> np.ndarray:
+        """Returns next destination presence flags"""
+        return self.__has_next_destination
+
+    @property
+    def absolute_speed(self) -> np.ndarray:
+        """Returns absolute speeds"""
+        return np.sqrt(np.einsum("ij,ij->i", self.__speed, self.__speed))
+
+    @property
+    def horizontal_speed(self) -> np.ndarray:
+        """Returns horizontal speeds"""
+        return np.hypot(self.__speed[:, 0], self.__speed[:, 1])
+
+    @property
+    def yaw_angle(self) -> np.ndarray:
+        """Returns yaw (heading) angles"""
+        return np.degrees(np.arctan2(self.__speed[:, 0], -self.__speed[:, 1]))
+
+    @property
+    def pitch_angle(self) -> np.ndarray:
+        """Returns pitch angles"""
+        return np.degrees(np.arctan2(self.__speed[:, 2], self.horizontal_speed))
+
+    def refresh_destinations(self, indices : np.ndarray | None = None) -> None:
+        """Mirrors the head of destinations queues into destination arrays"""
+        if indices is None:
+            indices = range(self.__count)
+        for i in indices:
+            queue = self.__destinations[i]
+            self.__has_destination[i] = len(queue) > 0
+            self.__has_next_destination[i] = len(queue) > 1
+            if len(queue) > 0:
+                self.__destination[i] = queue[0]
+            if len(queue) > 1:
+                self.__next_destination[i] = queue[1]
+
+    def pop_destinations(self, indices : np.ndarray) -> None:
+        """Moves current destinations of the given aircrafts into their history"""
+        for i in indices:
+            self.__destinations_history[i].append(self.__destinations[i].popleft())
+            if self.__destinations[i]:
+                logging.info("Aircraft %s visited destination and took next one", self.__aircraft_ids[i])
+            else:
+                logging.info("Aircraft %s visited destination and is free now", self.__aircraft_ids[i])
+        self.refresh_destinations(indices)
+
+    def check_new_destination(self, index : int, destination : Tuple[float, float, float], first : bool) -> Tuple[float, float, float] | None:
+        """Checks and corrects the given destination the same way flight control computer does"""
+        x, y, z = (float(coordinate) for coordinate in destination)
+        queue = self.__destinations[index]
+        if len(queue) > 0 and dist((x, y, z), queue[0] if first else queue[-1]) < 1.0:
+            logging.warning("Attempted to stack the same destination: (%s, %s, %s)", x, y, z)
+            return None
+        position : Tuple[float, float, float] = tuple(self.__position[index])
+        if dist(position, (x, y, z)) < self.__size[index]:
+            logging.warning("Attempted to set current position as destination: (%s, %s, %s)", x, y, z)
+            return None
+        if z < 800:
+            logging.warning("Attempted to set destination too low: (%s, %s, %s)", x, y, z)
+            z = 800.0
+        elif z > 8000:
+            logging.warning("Attempted to set destination too high: (%s, %s, %s)", x, y, z)
+            z = 8000.0
+        height_difference = abs(z - position[2])
+        distance_to_destination = dist((x, y, z), position)
+        min_pitch_angle = abs(degrees(atan2(height_difference, distance_to_destination)))
+        if z > position[2] and min_pitch_angle > 25:
+            logging.warning("Attempted to set destination too steep climb angle: (%s, %s, %s)", x, y, z)
+            z = position[2] + distance_to_destination * tan(radians(15))
+        elif z < position[2] and min_pitch_angle > 25:
+            logging.warning("Attempted to set destination too steep descent angle: (%s, %s, %s)", x, y, z)
+            z = position[2] - distance_to_destination * tan(radians(15))
+        return (x, y, z)
+
+    def add_first_destination(self, index : int, destination : Tuple[float, float, float]) -> None:
+        """Pushes given location to the top of aircraft's destinations queue"""
+        destination = self.check_new_destination(index, destination, True)
+        if destination is not None:
+            self.__destinations[index].appendleft(destination)
+            self.refresh_destinations([index])
+            self.__dormant[index] = False
+
+    def add_last_destination(self, index : int, destination : Tuple[float, float, float]) -> None:
+        """Appends given location to the end of aircraft's destinations queue"""
+        destination = self.check_new_destination(index, destination, False)
+        if destination is not None:
+            self.__destinations[index].append(destination)
+            self.refresh_destinations([index])
+            self.__dormant[index] = False
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __str__(self) -> str:
+        return f"AircraftFleet of {self.__count} aircrafts"
+
+    def __repr__(self) -> str:
+        return f"AircraftFleet of {self.__count} aircrafts"
@@ -1,26 +1,30 @@
 """Aircraft physical UAV class definition"""
 
-from math import atan2, degrees, sqrt
+from math import atan2, cos, degrees, sin, sqrt
+from typing import Tuple
+from threading import Lock
 
-from PySide6.QtCore import QObject, QMutex, QMutexLocker
-from PySide6.QtGui import QVector3D
+from ..simulation.simulation_vector import Vector3D
 
-class AircraftVehicle(QObject):
+class AircraftVehicle:
     """Aircraft physical UAV"""
 
     roll_dynamic_delay : float = 1000 # ms
     pitch_dynamic_delay : float = 2000 # ms
     max_acceleration : float = 2.0 # m/s^2
 
-    def __init__(self, aircraft_id : int, position : QVector3D, speed : QVector3D, initial_roll_angle : float) -> None:
-        super().__init__()
-        self.__mutex : QMutex = QMutex()
+    def __init__(self, aircraft_id : int, position : Vector3D, speed : Vector3D, initial_roll_angle : float) -> None:
+        self.__mutex : Lock = Lock()
         
         self.__aircraft_id = aircraft_id
         self.__position = position
         if self.__position.z() < 0:
             self.__position.setZ(0)
         self.__speed = speed
+        self.__wind : Vector3D = Vector3D() # m/s at the vehicle's position
+        self.__heading : Tuple[float, float] | None = None # sin and cos of yaw angle
+        self.__yaw_angle : float | None = None
+        self.__pitch_angle : float | None = None
 
         self.__size : float = 20.0
         self.__roll_angle = initial_roll_angle
@@ -30,170 +34,245 @@ class AircraftVehicle(QObject):
     @property
     def aircraft_id(self) -> int:
         """Returns aircraft id"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__aircraft_id
     
     @property
-    def position(self) -> QVector3D:
+    def position(self) -> Vector3D:
         """Returns position"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__position
     
     @position.setter
-    def position(self, position : QVector3D) -> None:
+    def position(self, position : Vector3D) -> None:
         """Sets position"""
         del self.__position
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             self.__position = position
     
     @property
-    def speed(self) -> QVector3D:
+    def speed(self) -> Vector3D:
         """Returns speed"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__speed
     
     @speed.setter
-    def speed(self, speed : QVector3D) -> None:
+    def speed(self, speed : Vector3D) -> None:
         """Sets speed"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             self.__speed = speed
+            self.__heading = None
+            self.__yaw_angle = None
+            self.__pitch_angle = None
     
+    @property
+    def wind(self) -> Vector3D:
+        """Returns wind speed at the vehicle's position"""
+        with self.__mutex:
+            return self.__wind
+
+    @wind.setter
+    def wind(self, wind : Vector3D) -> None:
+        """Sets wind speed at the vehicle's position"""
+        with self.__mutex:
+            self.__wind.assign(wind)
+
+    @property
+    def ground_speed(self) -> Vector3D:
+        """Returns speed over the ground, the speed through the air drifted by wind"""
+        with self.__mutex:
+            return self.__speed + self.__wind
+
     @property
     def size(self) -> float:
         """Returns size"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__size
     
     @property
     def roll_angle(self) -> float:
         """Returns roll angle"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__roll_angle
 
     @roll_angle.setter
     def roll_angle(self, roll_angle_delta : float) -> None:
         """Adds roll angle delta"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             self.__roll_angle += roll_angle_delta
 
     @property
     def initial_roll_angle(self) -> float:
         """Returns initial roll angle"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__initial_roll_angle
     
     @property
     def distance_covered(self) -> float:
         """Returns covered distance"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__distance_covered
 
     @distance_covered.setter
     def distance_covered(self, distance_covered_delta : float) -> None:
         """Appends delta to distance covered"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             self.__distance_covered += distance_covered_delta
 
     def reset_distance_covered(self) -> None:
         """Resets distance covered"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
+            self.__distance_covered = 0.0
+
+    def reset(self, position : Vector3D, speed : Vector3D, roll_angle : float) -> None:
+        """Resets position, speed and roll angle in place, clearing covered distance"""
+        with self.__mutex:
+            self.__position.assign(position)
+            if self.__position.z() < 0:
+                self.__position.setZ(0)
+            self.__speed.assign(speed)
+            self.__heading = None
+            self.__yaw_angle = None
+            self.__pitch_angle = None
+            self.__wind.set(0.0, 0.0, 0.0)
+            self.__roll_angle = roll_angle
+            self.__initial_roll_angle = roll_angle
             self.__distance_covered = 0.0
     
     def move(self, dx : float, dy : float, dz : float = 0.0) -> None:
         """Applies position deltas for the vehicle"""
-        with QMutexLocker(self.__mutex):
-            self.__position.setX(self.__position.x() + dx)
-            self.__position.setY(self.__position.y() + dy)
-            self.__position.setZ(self.__position.z() + dz)
+        with self.__mutex:
+            self.__position.set(self.__position.x() + dx, self.__position.y() + dy, self.__position.z() + dz)
     
+    def scale_speed(self, scale_factor : float) -> None:
+        """Scales speed keeping its direction"""
+        with self.__mutex:
+            self.__speed *= scale_factor
+
+    def climb(self, vertical_speed : float) -> None:
+        """Sets vertical speed keeping horizontal speed and heading"""
+        with self.__mutex:
+            self.__speed.setZ(vertical_speed)
+            self.__pitch_angle = None
+
+    def turn(self, turn_angle : float) -> None:
+        """Rotates horizontal speed by turn angle in radians keeping its length"""
+        cos_turn : float = cos(turn_angle)
+        sin_turn : float = sin(turn_angle)
+        with self.__mutex:
+            sin_yaw, cos_yaw = self.__find_heading()
+            horizontal_speed : float = sqrt(self.__speed.x() ** 2 + self.__speed.y() ** 2)
+            sin_yaw, cos_yaw = sin_yaw * cos_turn + cos_yaw * sin_turn, cos_yaw * cos_turn - sin_yaw * sin_turn
+            self.__speed.setX(sin_yaw * horizontal_speed)
+            self.__speed.setY(-cos_yaw * horizontal_speed)
+            self.__heading = (sin_yaw, cos_yaw)
+            if self.__yaw_angle is not None:
+                yaw_angle : float = self.__yaw_angle + degrees(turn_angle)
+                if yaw_angle > 180.0:
+                    yaw_angle -= 360.0
+                elif yaw_angle < -180.0:
+                    yaw_angle += 360.0
+                self.__yaw_angle = yaw_angle
+
     def roll(self, d_angle) -> None:
         """Applies roll angle delta of the aircraft"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             self.__roll_angle += d_angle
     
     @property
     def absolute_speed(self) -> float:
         """Returns absolute speed"""
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__speed.length()
     
     @property
     def horizontal_speed(self) -> float:
         """Returns horizontal speed"""
-        with QMutexLocker(self.__mutex):
-            return QVector3D(self.__speed.x(), self.__speed.y(), 0).length()
+        with self.__mutex:
+            return sqrt(self.__speed.x() ** 2 + self.__speed.y() ** 2)
     
     @property
     def vertical_speed(self) -> float:
         """Returns vertical speed"""
-        with QMutexLocker(self.__mutex):
-            return QVector3D(0, 0, self.__speed.z()).length()
+        with self.__mutex:
+            return abs(self.__speed.z())
+
+    @property
+    def heading(self) -> Tuple[float, float]:
+        """Returns sine and cosine of yaw (heading) angle"""
+        with self.__mutex:
+            return self.__find_heading()
+
+    def __find_heading(self) -> Tuple[float, float]:
+        """Returns cached sine and cosine of yaw angle, finds them from speed when missing"""
+        if self.__heading is None:
+            horizontal_speed : float = sqrt(self.__speed.x() ** 2 + self.__speed.y() ** 2)
+            self.__heading = (self.__speed.x() / horizontal_speed, -self.__speed.y() / horizontal_speed) if horizontal_speed > 0.0 else (0.0, -1.0)
+        return self.__heading
 
     @property
     def yaw_angle(self) -> float:
         """Returns yaw (heading) angle"""
-        with QMutexLocker(self.__mutex):
-            return degrees(atan2(self.__speed.x(), -self.__speed.y()))
-        
-    @yaw_angle.getter
-    def yaw_angle(self, speed : QVector3D | None = None) -> float:
-        """Returns yaw (heading) angle of given speed vector"""
-        if speed is None:
-            with QMutexLocker(self.__mutex):
-                return degrees(atan2(self.__speed.x(), -self.__speed.y()))
-        else:
-            return degrees(atan2(speed.x(), -speed.y()))
+        with self.__mutex:
+            if self.__yaw_angle is None:
+                self.__yaw_angle = degrees(atan2(self.__speed.x(), -self.__speed.y()))
+            return self.__yaw_angle
 
     @property
     def pitch_angle(self) -> float:
         """Returns pitch angle"""
-        with QMutexLocker(self.__mutex):
-            return degrees(atan2(self.__speed.z(), sqrt(self.__speed.x() ** 2 + self.__speed.y() ** 2)))
+        with self.__mutex:
+            if self.__pitch_angle is None:
+                self.__pitch_angle = degrees(atan2(self.__speed.z(), sqrt(self.__speed.x() ** 2 + self.__speed.y() ** 2)))
+            return self.__pitch_angle
 
     def __str__(self) -> str:
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return f"Vehicle {self.__aircraft_id} at {self.__position} with speed {self.__speed} and roll angle {self.__roll_angle} degrees"
         
     def __repr__(self) -> str:
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return f"Vehicle {self.__aircraft_id} at {self.__position} with speed {self.__speed} and roll angle {self.__roll_angle} degrees"
         
     def __eq__(self, other) -> bool:
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__aircraft_id == other.__aircraft_id
         
     def __ne__(self, other) -> bool:
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__aircraft_id != other.__aircraft_id
         
     def __lt__(self, other) -> bool:
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__aircraft_id < other.__aircraft_id
         
     def __le__(self, other) -> bool:
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__aircraft_id <= other.__aircraft_id
         
     def __gt__(self, other) -> bool:
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__aircraft_id > other.__aircraft_id
         
     def __ge__(self, other) -> bool:
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return self.__aircraft_id >= other.__aircraft_id
         
     def __copy__(self):
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return AircraftVehicle(self.__aircraft_id, self.__position, self.__speed, self.__initial_roll_angle)
 
     def __deepcopy__(self, memo):
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             return AircraftVehicle(self.__aircraft_id, self.__position, self.__speed, self.__initial_roll_angle)
         
     def __del__(self):
-        with QMutexLocker(self.__mutex):
+        with self.__mutex:
             del self.__position
             del self.__speed
+            del self.__heading
+            del self.__yaw_angle
+            del self.__pitch_angle
             del self.__roll_angle
             del self.__initial_roll_angle
             del self.__distance_covered
@@ -0,0 +1,430 @@
+"""Engine ADS-B system module"""
+
+import logging
+import numpy as np
+from typing import List, Tuple
+from math import sqrt
+
+from ..aircraft.aircraft import Aircraft
+from ..aircraft.aircraft_vehicle import AircraftVehicle
+from ..aircraft.aircraft_fcc import AircraftFCC
+from ..simulation.simulation_vector import Vector3D
+from ..simulation.simulation_settings import SimulationSettings
+from ..simulation.simulation_spatial_hash import SimulationSpatialHash
+from ..simulation.simulation_sweep_and_prune import SimulationSweepAndPrune
+from ..simulation.simulation_trajectory_predictor import SimulationTrajectoryPredictor
+from ..simulation.simulation_state import SimulationState
+
+class EngineADSB:
+    """ADS-B system cycles for collision detection and avoidance, independent of any GUI or threading framework"""
+
+    def __init__(self, aircrafts : List[Aircraft], simulation_state : SimulationState) -> None:
+        self.__aircrafts = aircrafts
+        self.__aircraft_vehicles : List[AircraftVehicle] = [aircraft.vehicle for aircraft in self.aircrafts]
+        self.__aircraft_fccs : List[AircraftFCC] = [aircraft.fcc for aircraft in self.aircrafts]
+        self.__simulation_state = simulation_state
+        self.__adsb_cycles : int = 0
+        self.__minimal_relative_distance : float = float("inf")
+        self.__minimal_relative_distance_time : float = np.nan # ms
+        self.__previous_relative_position : Vector3D = Vector3D()
+        self.__previous_time : float | None = None # ms
+        self.__is_silent : bool = False
+        self.__miss_distance_at_closest_approach : float | np.nan = np.nan
+        self.__relative_position : Vector3D = Vector3D()
+        self.__speed_difference : Vector3D = Vector3D()
+        self.__spatial_hash : SimulationSpatialHash | None = None
+        self.__sweep_and_prune : SimulationSweepAndPrune | None = None
+        self.__trajectory_predictor : SimulationTrajectoryPredictor | None = None
+        
+    @property
+    def aircrafts(self) -> List[Aircraft]:
+        """Returns aircrafts"""
+        return self.__aircrafts
+    
+    @property
+    def aircraft_vehicles(self) -> List[AircraftVehicle]:
+        """Returns aircraft vehicles"""
+        self.__aircraft_vehicles = [aircraft.vehicle for aircraft in self.aircrafts]
+        return self.__aircraft_vehicles
+    
+    @property
+    def aircraft_fccs(self) -> List[AircraftFCC]:
+        """Returns aircraft flight control computers"""
+        self.__aircraft_fccs = [aircraft.fcc for aircraft in self.aircrafts]
+        return self.__aircraft_fccs
+    
+    @property
+    def simulation_state(self) -> SimulationState:
+        """Returns simulation state"""
+        return self.__simulation_state
+    
+    @property
+    def adsb_cycles(self) -> int:
+        """Returns ADS-B cycles count"""
+        return self.__adsb_cycles
+    
+    def restart(self) -> None:
+        """Restores ADS-B system of a new run in place"""
+        self.__adsb_cycles = 0
+        self.__minimal_relative_distance = float("inf")
+        self.__minimal_relative_distance_time = np.nan
+        self.__previous_time = None
+        self.__miss_distance_at_closest_approach = np.nan
+
+    def count_adsb_cycles(self) -> None:
+        """Increments ADS-B cycle counter"""
+        self.__adsb_cycles += 1
+        self.simulation_state.adsb_cycles = self.adsb_cycles
+
+    @property
+    def minimal_relative_distance(self) -> float:
+        """Returns minimal miss distance"""
+        if self.__simulation_state.collision:
+            return 0
+        else:
+            return self.__minimal_relative_distance
+    
+    @minimal_relative_distance.setter
+    def minimal_relative_distance(self, minimal_relative_distance : float) -> None:
+        """Sets minimal miss distance"""
+        self.__minimal_relative_distance = minimal_relative_distance
+
+    @property
+    def tracked_minimal_relative_distance(self) -> float:
+        """Returns minimal miss distance tracked over ADS-B cycles, kept after collision"""
+        return self.__minimal_relative_distance
+
+    @property
+    def minimal_relative_distance_time(self) -> float:
+        """Returns simulated time in ms of minimal miss distance"""
+        return self.__minimal_relative_distance_time
+
+    def update_minimal_relative_distance(self, relative_position : Vector3D, time : float) -> None:
+        """Updates minimal miss distance with the closest point of relative positions linearly interpolated
+        between the previous and the given sample taken at simulated time in ms"""
+        distance : float = relative_position.length()
+        distance_time : float = time
+        if self.__previous_time is not None:
+            previous : Vector3D = self.__previous_relative_position
+            chord_x : float = relative_position.x() - previous.x()
+            chord_y : float = relative_position.y() - previous.y()
+            chord_z : float = relative_position.z() - previous.z()
+            chord_squared : float = chord_x ** 2 + chord_y ** 2 + chord_z ** 2
+            if chord_squared > 0.0:
+                fraction : float = min(max(-(previous.x() * chord_x + previous.y() * chord_y + previous.z() * chord_z) / chord_squared, 0.0), 1.0)
+                distance = sqrt((previous.x() + chord_x * fraction) ** 2 + (previous.y() + chord_y * fraction) ** 2 + (previous.z() + chord_z * fraction) ** 2)
+                distance_time = self.__previous_time + (time - self.__previous_time) * fraction
+        if distance < self.__minimal_relative_distance:
+            self.__minimal_relative_distance = distance
+            self.__minimal_relative_distance_time = distance_time
+        self.__previous_relative_position.assign(relative_position)
+        self.__previous_time = time
+        
+    @property
+    def is_silent(self) -> bool:
+        """Returns silent mode flag"""
+        return self.__is_silent
+    
+    @is_silent.setter
+    def is_silent(self, is_silent : bool) -> None:
+        """Sets silent mode flag"""
+        self.__is_silent = is_silent
+        
+    @property
+    def trajectory_predictor(self) -> SimulationTrajectoryPredictor | None:
+        """Returns trajectory predictor of turning aircrafts, none when conflicts are predicted along straight lines"""
+        return self.__trajectory_predictor
+
+    @trajectory_predictor.setter
+    def trajectory_predictor(self, trajectory_predictor : SimulationTrajectoryPredictor | None) -> None:
+        """Sets trajectory predictor of turning aircrafts"""
+        assert trajectory_predictor is None or trajectory_predictor.count == len(self.aircrafts)
+        self.__trajectory_predictor = trajectory_predictor
+
+    @property
+    def miss_distance_at_closest_approach(self) -> float:
+        """Returns miss distance at closest approach"""
+        return self.__miss_distance_at_closest_approach
+    
+    @miss_distance_at_closest_approach.setter
+    def miss_distance_at_closest_approach(self, miss_distance_at_closest_approach : float) -> None:
+        """Sets miss distance at closest approach"""
+        self.__miss_distance_at_closest_approach = miss_distance_at_closest_approach
+
+    @property
+    def relative_distance(self) -> float:
+        """Returns relative distance between aircrafts"""
+        return (self.aircraft_vehicles[0].position - self.aircraft_vehicles[1].position).length()
+
+    @staticmethod
+    def find_closest_approach(relative_position : np.ndarray, speed_difference : np.ndarray, lookahead : float) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds times to closest approach within lookahead in seconds and miss distance vectors of relative positions and speeds of shape (..., 3)"""
+        speed_difference_squared = np.einsum("...i,...i->...", speed_difference, speed_difference)
+        time_to_closest_approach = -np.einsum("...i,...i->...", relative_position, speed_difference) / np.where(speed_difference_squared > 0.0, speed_difference_squared, np.inf)
+        time_to_closest_approach = np.minimum(np.maximum(time_to_closest_approach, 0.0), lookahead)
+        return time_to_closest_approach, relative_position + speed_difference * time_to_closest_approach[..., np.newaxis]
+
+    @staticmethod
+    def find_conflict_pairs(
+            position : np.ndarray,
+            speed : np.ndarray,
+            minimum_separation : float,
+            lookahead : float = SimulationSettings.adsb_lookahead,
+            block_size : int = SimulationSettings.adsb_block_size,
+            candidates : Tuple[np.ndarray, np.ndarray] | None = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Finds index pairs i < j of positions and speeds of shape (count, 3) whose closest approach within lookahead in seconds comes inside minimum separation,
+        only among candidate pairs when given, returns them with times to closest approach, miss distance vectors and unresolved regions"""
+        if candidates is not None:
+            first, second = np.minimum(*candidates), np.maximum(*candidates)
+            order = np.lexsort((second, first))
+            first, second = first[order], second[order]
+            time_to_closest_approach, miss_distance_vector = EngineADSB.find_closest_approach(position[first] - position[second], speed[first] - speed[second], lookahead)
+            conflict = np.einsum("ij,ij->i", miss_distance_vector, miss_distance_vector) < minimum_separation ** 2
+            first, second, time_to_closest_approach, miss_distance_vector = first[conflict], second[conflict], time_to_closest_approach[conflict], miss_distance_vector[conflict]
+        else:
+            count : int = len(position)
+            first_list, second_list, time_list, miss_list = [np.empty(0, dtype = np.int64)], [np.empty(0, dtype = np.int64)], [np.empty(0)], [np.empty((0, 3))]
+            # relative matrices are built for blocks of rows against all following aircrafts, bounding memory
+            for start in range(0, count - 1, block_size):
+                stop : int = min(start + block_size, count - 1)
+                time_to_closest_approach, miss_distance_vector = EngineADSB.find_closest_approach(
+                    position[start:stop, np.newaxis] - position[np.newaxis, start + 1:],
+                    speed[start:stop, np.newaxis] - speed[np.newaxis, start + 1:],
+                    lookahead)
+                row, column = np.nonzero(np.triu(np.einsum("ijk,ijk->ij", miss_distance_vector, miss_distance_vector) < minimum_separation ** 2))
+                first_list.append(row + start)
+                second_list.append(column + start + 1)
+                time_list.append(time_to_closest_approach[row, column])
+                miss_list.append(miss_distance_vector[row, column])
+            first, second = np.concatenate(first_list), np.concatenate(second_list)
+            time_to_closest_approach, miss_distance_vector = np.concatenate(time_list), np.concatenate(miss_list)
+        return first, second, time_to_closest_approach, miss_distance_vector, minimum_separation - np.linalg.norm(miss_distance_vector, axis = 1)
+
+    def find_conflicts(self, lookahead : float = SimulationSettings.adsb_lookahead, broad_phase : str = "off") -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Finds conflicts between all pairs of aircrafts within lookahead in seconds from their broadcast positions and speeds over the ground,
+        broad phase off tests all pairs, hash only pairs in neighbouring spatial hash cells of minimum separation size grown by the distance both aircrafts may close within lookahead,
+        sweep only pairs whose boxes bounding flight over lookahead overlap, both finding the same conflicts as all pairs"""
+        assert broad_phase in ("off", "hash", "sweep")
+        vehicles : List[AircraftVehicle] = self.aircraft_vehicles
+        position = np.array([(vehicle.position.x(), vehicle.position.y(), vehicle.position.z()) for vehicle in vehicles], dtype = np.float64).reshape(-1, 3)
+        speed = np.array([(ground_speed.x(), ground_speed.y(), ground_speed.z()) for ground_speed in (vehicle.ground_speed for vehicle in vehicles)], dtype = np.float64).reshape(-1, 3)
+        minimum_separation : float = self.simulation_state.minimum_separation
+        if broad_phase == "off":
+            return self.find_conflict_pairs(position, speed, minimum_separation, lookahead)
+        if broad_phase == "sweep":
+            if self.__sweep_and_prune is None or self.__sweep_and_prune.lookahead != lookahead or self.__sweep_and_prune.margin != minimum_separation:
+                self.__sweep_and_prune = SimulationSweepAndPrune(lookahead, minimum_separation)
+            self.__sweep_and_prune.update(position, speed)
+            return self.find_conflict_pairs(position, speed, minimum_separation, lookahead, candidates = self.__sweep_and_prune.find_pairs())
+        # pairs closing in on each other at twice the highest speed over lookahead are still neighbours, cells are rebuilt only when they get too small or twice too large
+        cell_size : float = minimum_separation + 2.0 * np.linalg.norm(speed, axis = 1).max(initial = 0.0) * lookahead
+        if self.__spatial_hash is None or not cell_size <= self.__spatial_hash.cell_size <= 2.0 * cell_size:
+            self.__spatial_hash = SimulationSpatialHash(cell_size)
+        self.__spatial_hash.update(position)
+        return self.find_conflict_pairs(position, speed, minimum_separation, lookahead, candidates = self.__spatial_hash.find_pairs())
+
+    def find_turning_closest_approach(self) -> Tuple[float, Vector3D]:
+        """Finds time to closest approach in seconds and miss distance vector of the first aircraft to the second one, both predicted to keep turning to their target yaw angles"""
+        vehicles = self.aircraft_vehicles
+        predictor = self.trajectory_predictor
+        position = np.array([vehicle.position.toTuple() for vehicle in vehicles], dtype = np.float64)
+        speed = np.array([(vehicle.speed + vehicle.wind).toTuple() for vehicle in vehicles], dtype = np.float64) # over the ground
+        yaw_angle = np.array([vehicle.yaw_angle for vehicle in vehicles])
+        target_yaw_angle = np.array([fcc.target_yaw_angle for fcc in self.aircraft_fccs])
+        turn_rate = predictor.find_turn_rate(np.array([vehicle.roll_angle for vehicle in vehicles]), np.array([vehicle.horizontal_speed for vehicle in vehicles]), self.simulation_state.g_acceleration)
+        turn_duration = predictor.find_turn_duration(yaw_angle, target_yaw_angle, turn_rate)
+        # evasive turns are held straight, otherwise they would clear the conflicts they resolve before these are over
+        turn_duration[np.array([fcc.evade_maneuver for fcc in self.aircraft_fccs])] = 0.0
+        trajectory = predictor.predict(position, speed, turn_rate, turn_duration)
+        time_to_closest_approach, miss_distance_vector = predictor.find_closest_approach((trajectory[0] - trajectory[1])[np.newaxis])
+        return float(time_to_closest_approach[0]), Vector3D(*miss_distance_vector[0])
+
+    def cycle(self, simulated_time : float | None = None) -> None:
+        """Executes ADS-B simulation cycle at simulated time in ms, nominal time of ADS-B cycles by default"""
+        aircraft_vehicle_1 : AircraftVehicle = self.aircraft_vehicles[0]
+        aircraft_vehicle_2 : AircraftVehicle = self.aircraft_vehicles[1]
+
+        if not self.simulation_state.is_paused:
+            self.count_adsb_cycles()
+            self.simulation_state.update_adsb_settings()
+
+            relative_position : Vector3D = self.__relative_position
+            relative_position.assign(aircraft_vehicle_1.position)
+            relative_position -= aircraft_vehicle_2.position
+            # ADS-B broadcasts speeds over the ground, drifted by wind
+            speed_difference : Vector3D = self.__speed_difference
+            speed_difference.assign(aircraft_vehicle_1.speed)
+            speed_difference += aircraft_vehicle_1.wind
+            speed_difference -= aircraft_vehicle_2.speed
+            speed_difference -= aircraft_vehicle_2.wind
+            time_to_closest_approach = -(Vector3D.dotProduct(relative_position, speed_difference) / Vector3D.dotProduct(speed_difference, speed_difference))
+            predicted_conflict : bool = True
+            if self.trajectory_predictor is not None:
+                # conflicts which ongoing turns resolve are cleared, the rest is resolved the way straight flight has it
+                predicted_time_to_closest_approach, predicted_miss_distance_vector = self.find_turning_closest_approach()
+                predicted_conflict = predicted_time_to_closest_approach > 0 and predicted_miss_distance_vector.length() < self.simulation_state.minimum_separation
+            if not self.is_silent:
+                print("Time to closest approach: " + "{:.2f}".format(time_to_closest_approach) + "s")
+            
+            if simulated_time is None:
+                simulated_time = (self.adsb_cycles - 1) * self.simulation_state.adsb_threshold
+            self.update_minimal_relative_distance(relative_position, simulated_time)
+            if not self.is_silent:
+                print("Minimal relative distance: " + "{:.2f}".format(self.__minimal_relative_distance) + "m")
+            
+            fcc : AircraftFCC | None = None
+            for aircraft in self.aircraft_vehicles:
+                try:
+                    fcc = self.aircraft_fccs[aircraft.aircraft_id]
+                except IndexError:
+                    logging.error("Aircraft flight control computer %d not found", aircraft.aircraft_id)
+                    if not self.is_silent:
+                        print(f"Aircraft flight control computer {aircraft.aircraft_id} not found")
+                    if len(self.aircraft_fccs) == 2:
+                        if aircraft.aircraft_id % 2 == 0:
+                            fcc = self.aircraft_fccs[0]
+                        else:
+                            fcc = self.aircraft_fccs[1]
+
+                # path
+                fcc.append_visited()
+
+                # console destination reach time
+                if fcc.destination is not None and self.simulation_state.adsb_report:
+                    time_to_reaching_destination : float = (Vector3D.dotProduct(fcc.destination - aircraft.position, aircraft.speed) / Vector3D.dotProduct(aircraft.speed, aircraft.speed))
+                    if not self.is_silent:
+                        print(f"Aircraft {aircraft.aircraft_id} will reach its destination in " + "{:.2f}".format(time_to_reaching_destination) + " (" + "{:.1f}".format(time_to_reaching_destination / 60) + " minutes or " + "{:.1f}".format(time_to_reaching_destination / 3600) + " hours)")
+                        print("Collision avoidance: " + str(self.simulation_state.avoid_collisions))
+
+                # console report output
+                if self.simulation_state.adsb_report and aircraft.aircraft_id == self.__simulation_state.focused_aircraft_id and self.simulation_state.is_realtime:
+                    if not self.is_silent:
+                        self.print_adsb_report(aircraft)
+
+                # safe zone occupancy check
+                if relative_position.length() < self.simulation_state.minimum_separation:
+                    if not fcc.safe_zone_occupied:
+                        fcc.safe_zone_occupied = True
+                        if not self.simulation_state.override_avoid_collisions:
+                            self.simulation_state.avoid_collisions = True
+                    if not self.is_silent:
+                        print("Safe zone occupied")
+                else:
+                    if fcc.safe_zone_occupied:
+                        fcc.safe_zone_occupied = False
+                        self.simulation_state.avoid_collisions = False
+                    if not self.is_silent:
+                        print("Safe zone free")
+                    continue
+
+            if time_to_closest_approach > 0:
+                # miss distance at closest approach
+                speed_difference_unit = speed_difference.normalized()
+                miss_distance_vector : Vector3D = Vector3D.crossProduct(
+                    speed_difference_unit,
+                    Vector3D.crossProduct(relative_position, speed_difference_unit))
+                if not self.is_silent:
+                    print("Miss distance at closest approach: " + "{:.2f}".format(miss_distance_vector.length()) + "m (" + "{:.2f}".format(self.aircraft_vehicles[0].size / 2 + self.aircraft_vehicles[1].size / 2) + "m is collision distance)")
+
+                if miss_distance_vector.length() == 0 and self.simulation_state.avoid_collisions:
+                    logging.info("Head-on collision detected")
+                    if not self.is_silent:
+                        print("Head-on collision detected")
+
+                # resolve conflict condition
+                unresolved_region : float = self.simulation_state.minimum_separation - abs(miss_distance_vector.length())
+                if unresolved_region > 0.0 and predicted_conflict:
+                    if not self.is_silent:
+                        print("Conflict condition detected")
+                    if self.simulation_state.avoid_collisions and relative_position.length() < self.simulation_state.minimum_separation:
+                        for aircraft in self.aircraft_fccs:
+                            if not aircraft.evade_maneuver:
+                                logging.info("Conflict condition resolution with relative distance: " + "{:.2f}".format(relative_position.length()) + "m")
+                                self.miss_distance_at_closest_approach = miss_distance_vector.length()
+                                aircraft.apply_evade_maneuver(
+                                    opponent_speed = self.aircraft_vehicles[1 - aircraft.aircraft_id].speed,
+                                    miss_distance_vector = miss_distance_vector,
+                                    unresolved_region = unresolved_region,
+                                    time_to_closest_approach = time_to_closest_approach)
+                    if not self.is_silent:
+                        print("Relative distance: "+ "{:.2f}".format(relative_position.length()) + "m")
+
+                # probable collision
+                collision_distance = aircraft_vehicle_1.size / 2 + aircraft_vehicle_2.size / 2
+                collision_region = collision_distance - miss_distance_vector.length()
+                if collision_region > 0 and not self.is_silent:
+                        print("Collision detected")
+            else:
+                for aircraft in self.aircraft_fccs:
+                    if aircraft.evade_maneuver and not aircraft.safe_zone_occupied:
+                        aircraft.reset_evade_maneuver()
+
+    def print_adsb_report(self, aircraft : AircraftVehicle) -> None:
+        """Prints ADS-B report for the aircraft to the console"""
+        fcc = self.aircraft_fccs[aircraft.aircraft_id]
+        turning_direction = "Not turning"
+        if fcc.is_turning_left:
+            turning_direction = "Turning left"
+        elif fcc.is_turning_right:
+            turning_direction = "Turning right"
+        print("- Aircraft id: " + str(aircraft.aircraft_id) +
+            "; speed: " + "{:.2f}".format(aircraft.absolute_speed) +
+            "; turning: " + turning_direction +
+            "; roll angle: " + "{:.2f}".format(aircraft.roll_angle) +
+            "; target roll angle: " + "{:.2f}".format(fcc.target_roll_angle) +
+            "; yaw angle: " + "{:.2f}".format(aircraft.yaw_angle) +
+            "; target yaw angle: " + "{:.2f}".format(fcc.target_yaw_angle) +
+            "; x: " + "{:.2f}".format(aircraft.position.x()) +
+            "; y: " + "{:.2f}".format(aircraft.position.y()) +
+            "; z: " + "{:.2f}".format(aircraft.position.z()))
+        if fcc.destination is not None:
+            if self.simulation_state.is_realtime:
+                print("target pitch angle: " + "{:.2f}".format(fcc.target_pitch_angle) +
+                    "; pitch angle: " + "{:.2f}".format(aircraft.pitch_angle) +
+                    "; dest x: " + "{:.2f}".format(fcc.destination.x()) +
+                    "; dest y: " + "{:.2f}".format(fcc.destination.y()) +
+                    "; dest z: " + "{:.2f}".format(fcc.destination.z()) +
+                    "; distance covered: " + "{:.2f}".format(aircraft.distance_covered) +
+                    "; fps: " + "{:.2f}".format(self.simulation_state.fps) +
+                    "; t: " + str(self.adsb_cycles) +
+                    "; phys: " + str(self.simulation_state.physics_cycles))
+            else:
+                print("target pitch angle: " + "{:.2f}".format(fcc.target_pitch_angle) +
+                    "; pitch angle: " + "{:.2f}".format(aircraft.pitch_angle) +
+                    "; dest x: " + "{:.2f}".format(fcc.destination.x()) +
+                    "; dest y: " + "{:.2f}".format(fcc.destination.y()) +
+                    "; dest z: " + "{:.2f}".format(fcc.destination.z()) +
+                    "; distance covered: " + "{:.2f}".format(aircraft.distance_covered) +
+                    "; t: " + str(self.adsb_cycles) +
+                    "; phys: " + str(self.simulation_state.physics_cycles))
+        else:
+            if self.simulation_state.is_realtime:
+                print("target pitch angle: " + "{:.2f}".format(fcc.target_pitch_angle) +
+                    "; pitch angle: " + "{:.2f}".format(aircraft.pitch_angle) +
+                    "; distance covered: " + "{:.2f}".format(aircraft.distance_covered) +
+                    "; fps: " + "{:.2f}".format(self.simulation_state.fps) +
+                    "; t: " + str(self.adsb_cycles) +
+                    "; phys: " + str(self.simulation_state.physics_cycles) +
+                    "; no destination")
+            else:
+                print("target pitch angle: " + "{:.2f}".format(fcc.target_pitch_angle) +
+                    "; pitch angle: " + "{:.2f}".format(aircraft.pitch_angle) +
+                    "; distance covered: " + "{:.2f}".format(aircraft.distance_covered) +
+                    "; t: " + str(self.adsb_cycles) +
+                    "; phys: " + str(self.simulation_state.physics_cycles) +
+                    "; no destination")
+        # speed check
+        absolute_speed = sqrt(aircraft.speed.x() ** 2 + aircraft.speed.y() ** 2 + aircraft.speed.z() ** 2)
+        horizontal_speed = sqrt(aircraft.speed.x() ** 2 + aircraft.speed.y() ** 2)
+        vertical_speed = abs(aircraft.speed.z())
+        geometrical_speed = sqrt(horizontal_speed ** 2 + vertical_speed ** 2)
+        print("absolute speed: " + "{:.2f}".format(absolute_speed) +
+            "; horizontal speed: " + "{:.2f}".format(horizontal_speed) +
+            "; vertical speed: " + "{:.2f}".format(vertical_speed) +
+            "; geometrical speed: " + "{:.2f}".format(geometrical_speed))
+
+    def reset_destinations(self) -> None:
+        """Resets destination for all aircrafts"""
+        for aircraft in self.aircraft_fccs:
+            aircraft.clear_destinations()
+            aircraft.load_initial_destination()
@@ -0,0 +1,139 @@
+"""Engine headless runner module"""
+
+import logging
+from copy import copy
+from math import ceil
+from typing import List
+
+from ..aircraft.aircraft import Aircraft
+from ..simulation.simulation_settings import SimulationSettings
+from ..simulation.simulation_state import SimulationState
+from ..simulation.simulation_data import SimulationData
+from .engine_physics import EnginePhysics
+from .engine_adsb import EngineADSB
+
+class EngineHeadless:
+    """Runner of two-aircraft encounters interleaving physics and ADS-B cycles on the calling thread,
+    simulating its own aircrafts which are re-seeded in place with every next encounter"""
+
+    def __init__(self, aircrafts : List[Aircraft], simulation_state : SimulationState, simulation_time : int = 1_209_600_000) -> None:
+        assert len(aircrafts) > 0
+        self.__aircrafts : List[Aircraft] = [Aircraft(
+            aircraft_id = aircraft.aircraft_id,
+            position = aircraft.initial_position,
+            speed = aircraft.initial_speed,
+            initial_target = aircraft.initial_target,
+            initial_roll_angle = aircraft.initial_roll_angle) for aircraft in aircrafts]
+        self.__simulation_state = simulation_state
+        self.__simulation_time : int = simulation_time
+        self.__physics : EnginePhysics = EnginePhysics(self.__aircrafts, simulation_state)
+        self.__adsb : EngineADSB = EngineADSB(self.__aircrafts, simulation_state)
+        self.__adsb.is_silent = True
+        self.__adsb.reset_destinations()
+
+    @property
+    def aircrafts(self) -> List[Aircraft]:
+        """Returns aircrafts"""
+        return self.__aircrafts
+
+    @property
+    def simulation_state(self) -> SimulationState:
+        """Returns simulation state"""
+        return self.__simulation_state
+
+    @property
+    def simulation_time(self) -> int:
+        """Returns simulation time limit"""
+        return self.__simulation_time
+
+    @property
+    def physics(self) -> EnginePhysics:
+        """Returns physics engine"""
+        return self.__physics
+
+    @property
+    def adsb(self) -> EngineADSB:
+        """Returns ADS-B engine"""
+        return self.__adsb
+
+    def reseed(self, aircrafts : List[Aircraft], avoid_collisions : bool | None = None) -> None:
+        """Re-seeds engine's aircrafts with initial state of the encounter's aircrafts and restarts physics and ADS-B in place"""
+        assert len(aircrafts) == len(self.aircrafts)
+        for aircraft, encounter_aircraft in zip(self.aircrafts, aircrafts):
+            aircraft.reseed(
+                position = encounter_aircraft.initial_position,
+                speed = encounter_aircraft.initial_speed,
+                initial_target = encounter_aircraft.initial_target,
+                initial_roll_angle = encounter_aircraft.initial_roll_angle)
+        self.simulation_state.restart(self.simulation_state.avoid_collisions if avoid_collisions is None else avoid_collisions)
+        self.physics.restart()
+        self.adsb.restart()
+
+    def run(self, aircraft_angle : float | None = None, adaptive_time_step : bool = False, coast_fast_forward : bool = False) -> SimulationData:
+        """Runs the encounter until it stops, adaptive time step lengthens physics cycles while aircrafts are far from conflict, coast fast forward jumps over straight flight up to the next event"""
+        simulation_data : SimulationData = SimulationData()
+        simulation_data.aircraft_angle = aircraft_angle
+        simulation_data.aircraft_1_initial_position = copy(self.aircrafts[0].initial_position)
+        simulation_data.aircraft_2_initial_position = copy(self.aircrafts[1].initial_position)
+        simulation_data.aircraft_1_initial_speed = copy(self.aircrafts[0].initial_speed)
+        simulation_data.aircraft_2_initial_speed = copy(self.aircrafts[1].initial_speed)
+        simulation_data.aircraft_1_initial_target = copy(self.aircrafts[0].initial_target)
+        simulation_data.aircraft_2_initial_target = copy(self.aircrafts[1].initial_target)
+        simulation_data.aircraft_1_initial_roll_angle = copy(self.aircrafts[0].initial_roll_angle)
+        simulation_data.aircraft_2_initial_roll_angle = copy(self.aircrafts[1].initial_roll_angle)
+        simulation_data.collision = False
+
+        state = self.simulation_state
+        physics = self.physics
+        adsb = self.adsb
+        time_step : int = int(state.simulation_threshold)
+        adsb_step : int = int(state.adsb_threshold)
+        partial_time_counter : int = adsb_step
+        time_limit : int = len(range(0, int(self.simulation_time / state.simulation_threshold), time_step)) * time_step
+        time_step_limit : int = min(int(SimulationSettings.adaptive_time_step_limit), adsb_step)
+        simulated_time : int = 0
+        while simulated_time < time_limit:
+            cycle_time_step : int = time_step
+            coast_cycles : int = 0
+            if coast_fast_forward and partial_time_counter < adsb_step:
+                # coast through the cycles left before the next ADS-B cycle
+                coast_cycles = physics.find_coast_cycles(
+                    time_step = time_step,
+                    cycles_limit = min(ceil((adsb_step - partial_time_counter) / time_step), (time_limit - simulated_time) // time_step),
+                    minimal_relative_distance = adsb.minimal_relative_distance)
+            if coast_cycles > 0:
+                cycle_time_step = coast_cycles * time_step
+                physics.coast(time_step, coast_cycles)
+            else:
+                if adaptive_time_step and partial_time_counter < adsb_step:
+                    # land on the same ADS-B cycles as the fixed step does
+                    cycle_time_step = physics.find_adaptive_time_step(
+                        time_step = time_step,
+                        time_step_limit = min(time_step_limit, adsb_step - partial_time_counter),
+                        separation_margin = SimulationSettings.adaptive_separation_margin)
+                physics.cycle(cycle_time_step)
+            physics.invariants.check(physics.cycles, physics.aircraft_vehicles)
+            simulated_time += cycle_time_step
+            if partial_time_counter >= adsb_step:
+                adsb.cycle(simulated_time)
+                partial_time_counter = 0
+            partial_time_counter += cycle_time_step
+            if adsb.relative_distance > state.minimum_separation * 2 and adsb.minimal_relative_distance < state.minimum_separation:
+                logging.info("Headless simulation stopping due to aircrafts too far apart")
+                break
+            if not self.aircrafts[0].fcc.destination and not self.aircrafts[1].fcc.destination:
+                logging.info("Headless simulation stopping due to no other destinations set")
+                break
+            if state.collision:
+                logging.info("Headless simulation stopping due to collision detected")
+                simulation_data.collision = True
+                break
+        physics.invariants.log_report()
+        simulation_data.minimal_relative_distance = copy(adsb.tracked_minimal_relative_distance)
+        simulation_data.minimal_relative_distance_time = physics.collision_time if simulation_data.collision else adsb.minimal_relative_distance_time
+        simulation_data.aircraft_1_final_position = copy(self.aircrafts[0].vehicle.position)
+        simulation_data.aircraft_2_final_position = copy(self.aircrafts[1].vehicle.position)
+        simulation_data.aircraft_1_final_speed = copy(self.aircrafts[0].vehicle.speed)
+        simulation_data.aircraft_2_final_speed = copy(self.aircrafts[1].vehicle.speed)
+        simulation_data.miss_distance_at_closest_approach = copy(adsb.miss_distance_at_closest_approach)
+        return simulation_data
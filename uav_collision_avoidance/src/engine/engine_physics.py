@@ -0,0 +1,423 @@
+"""Engine physics module"""
+
+import logging
+from copy import copy
+from math import sin, cos, tan, exp, radians, sqrt
+from typing import List
+
+import numpy as np
+
+from ..aircraft.aircraft import Aircraft
+from ..aircraft.aircraft_vehicle import AircraftVehicle
+from ..aircraft.aircraft_fcc import AircraftFCC
+from ..simulation.simulation_vector import Vector3D
+from ..simulation.simulation_state import SimulationState
+from ..simulation.simulation_invariants import SimulationInvariants
+
+class EnginePhysics:
+    """Simulation's physics cycles of per-object aircrafts, independent of any GUI or threading framework"""
+
+    def __init__(self, aircrafts : List[Aircraft], simulation_state : SimulationState) -> None:
+        self.__aircrafts = aircrafts
+        self.__aircraft_vehicles : List[AircraftVehicle] = [aircraft.vehicle for aircraft in self.aircrafts]
+        self.__aircraft_fccs : List[AircraftFCC] = [aircraft.fcc for aircraft in self.aircrafts]
+        self.__simulation_state = simulation_state
+        self.__turn_angles : List[float] = [0.0 for _ in self.aircrafts] # rad
+        self.__invariants : SimulationInvariants = SimulationInvariants()
+        self.__cycles : int = 0
+        self.__guidance_time : float = float("inf") # ms since the last guidance update
+        self.__simulated_time : float = 0.0 # ms
+        self.__collision_time : float | None = None # ms
+        self.__drifting : bool = False # wind sampled during the current cycle
+
+    @property
+    def aircrafts(self) -> List[Aircraft]:
+        """Returns aircrafts"""
+        return self.__aircrafts
+    
+    @property
+    def aircraft_vehicles(self) -> List[AircraftVehicle]:
+        """Returns aircraft vehicles"""
+        self.__aircraft_vehicles = [aircraft.vehicle for aircraft in self.aircrafts]
+        return self.__aircraft_vehicles
+    
+    @property
+    def aircraft_fccs(self) -> List[AircraftFCC]:
+        """Returns aircraft flight control computers"""
+        self.__aircraft_fccs = [aircraft.fcc for aircraft in self.aircrafts]
+        return self.__aircraft_fccs
+    
+    @property
+    def simulation_state(self) -> SimulationState:
+        """Returns simulation state"""
+        return self.__simulation_state
+    
+    @property
+    def turn_angles(self) -> List[float]:
+        """Returns aircrafts heading changes in radians during the last cycle"""
+        return self.__turn_angles
+
+    @property
+    def invariants(self) -> SimulationInvariants:
+        """Returns invariant monitor"""
+        return self.__invariants
+
+    @property
+    def cycles(self) -> int:
+        """Returns physics cycles count"""
+        return self.__cycles
+
+    @property
+    def simulated_time(self) -> float:
+        """Returns simulated time in ms"""
+        return self.__simulated_time
+
+    @property
+    def collision_time(self) -> float | None:
+        """Returns simulated time in ms of the first contact of the collision, none without collision"""
+        return self.__collision_time
+    
+    def restart(self) -> None:
+        """Restores physics of a new run in place"""
+        self.__cycles = 0
+        self.__simulated_time = 0.0
+        self.__collision_time = None
+        self.__guidance_time = float("inf")
+        self.__turn_angles[:] = [0.0 for _ in self.aircrafts]
+        self.__invariants.reset()
+
+    def count_cycles(self) -> None:
+        """Increments physics cycle counter"""
+        self.__cycles += 1
+        self.simulation_state.physics_cycles = self.cycles
+    
+    def cycle(self, elapsed_time : float) -> None:
+        """Executes physics simulation cycle"""
+        if self.simulation_state.reset_demanded:
+            self.reset_aircrafts()
+        if not self.simulation_state.is_paused:
+            self.count_cycles()
+            self.simulation_state.update_simulation_settings()
+            self.update_aircrafts_speed_angles(elapsed_time)
+            self.update_aircrafts_wind()
+            collision : bool = self.update_aircrafts_position(elapsed_time)
+            self.__simulated_time += elapsed_time
+            if collision:
+                self.simulation_state.register_collision()
+                self.handle_collision()
+
+    def handle_collision(self) -> None:
+        """Handles registered collision, nothing to do unless running in realtime"""
+
+    def reset_aircrafts(self) -> None:
+        """Resets aircrafts to initial state"""
+        self.aircrafts[0].reset()
+        self.aircrafts[1].reset()
+        self.aircraft_fccs[0].reset()
+        self.aircraft_fccs[1].reset()
+        self.__simulated_time = 0.0
+        self.__collision_time = None
+        self.simulation_state.apply_reset()
+
+    def update_aircrafts_wind(self) -> None:
+        """Samples wind field at aircrafts positions, aircrafts drift with it until the next cycle"""
+        wind = self.simulation_state.wind
+        self.__drifting = wind is not None
+        if wind is None:
+            return
+        vehicles = self.aircraft_vehicles
+        winds = wind.find_winds(np.array([aircraft.position.toTuple() for aircraft in vehicles]), self.simulated_time)
+        for aircraft, aircraft_wind in zip(vehicles, winds.tolist()):
+            aircraft.wind = Vector3D(*aircraft_wind)
+
+    def update_aircrafts_position(self, elapsed_time : float) -> bool:
+        """Updates aircrafts position, returns true on collision"""
+        for aircraft, ground_height in zip(self.aircraft_vehicles, self.find_ground_heights()):
+            if aircraft.position.z() <= ground_height:
+                logging.warning("Aircraft's " + str(aircraft.aircraft_id) + "collision with the ground. Coordinates: " + str(self.aircraft_vehicles[aircraft.aircraft_id].position.toTuple()))
+                print("Collision with ground")
+                self.__collision_time = self.simulated_time
+                return True
+        collision_time : float | None = self.find_collision_time(elapsed_time)
+        if collision_time is not None:
+            self.move_aircrafts(elapsed_time, collision_time)
+            self.__collision_time = self.simulated_time + collision_time
+            logging.warning("Aircrafts' 0 and 1 collision. Coordinates: " + str(self.aircraft_vehicles[0].position.toTuple()) + " and " + str(self.aircraft_vehicles[1].position.toTuple()))
+            print("Collision with another aircraft")
+            return True
+        self.move_aircrafts(elapsed_time)
+        return False
+
+    def find_ground_heights(self) -> List[float]:
+        """Finds terrain heights below aircrafts, sea level without terrain model"""
+        terrain = self.simulation_state.terrain
+        if terrain is None:
+            return [0.0 for _ in self.aircrafts]
+        vehicles = self.aircraft_vehicles
+        return terrain.find_heights(
+            np.array([aircraft.position.x() for aircraft in vehicles]),
+            np.array([aircraft.position.y() for aircraft in vehicles])).tolist()
+
+    def find_ground_time(self, aircraft : AircraftVehicle) -> float:
+        """Finds time in seconds after which aircraft may reach the ground, zero while below the highest terrain"""
+        terrain = self.simulation_state.terrain
+        wind = self.simulation_state.wind
+        ground_clearance : float = aircraft.position.z() - (0.0 if terrain is None else terrain.max_height)
+        if terrain is not None and ground_clearance <= 0.0:
+            return 0.0
+        sink_speed : float = -aircraft.speed.z() + (0.0 if wind is None else wind.max_speed)
+        if sink_speed > 0.0:
+            return ground_clearance / sink_speed
+        return float("inf")
+
+    def move_aircrafts(self, elapsed_time : float, moving_time : float | None = None) -> None:
+        """Moves aircrafts along their paths of the cycle lasting elapsed time, for the moving time part of it when given"""
+        for aircraft in self.aircraft_vehicles:
+            if self.turn_angles[aircraft.aircraft_id] == 0.0:
+                time : float = (elapsed_time if moving_time is None else moving_time) / 1000.0
+                speed : Vector3D = aircraft.speed
+                if not self.__drifting:
+                    aircraft.move(speed.x() * time, speed.y() * time, speed.z() * time)
+                    aircraft.distance_covered = aircraft.absolute_speed * time
+                    continue
+                wind : Vector3D = aircraft.wind
+                dx : float = (speed.x() + wind.x()) * time
+                dy : float = (speed.y() + wind.y()) * time
+                dz : float = (speed.z() + wind.z()) * time
+                aircraft.move(dx, dy, dz)
+                aircraft.distance_covered = sqrt(dx ** 2 + dy ** 2 + dz ** 2)
+                continue
+            displacement : Vector3D = self.find_displacement(aircraft, elapsed_time, moving_time)
+            aircraft.move(displacement.x(), displacement.y(), displacement.z())
+            aircraft.distance_covered = displacement.length()
+
+    def find_displacement(self, aircraft : AircraftVehicle, elapsed_time : float, moving_time : float | None = None) -> Vector3D:
+        """Finds aircraft displacement along coordinated turn arc ending at its current heading drifted by wind after the moving time part of cycle lasting elapsed time"""
+        if moving_time is None:
+            moving_time = elapsed_time
+        turn_angle : float = self.turn_angles[aircraft.aircraft_id]
+        if turn_angle == 0.0:
+            return (aircraft.ground_speed if self.__drifting else aircraft.speed) * (moving_time / 1000.0)
+        sin_yaw, cos_yaw = aircraft.heading
+        sin_turn : float = sin(turn_angle)
+        cos_turn : float = cos(turn_angle)
+        previous_sin_yaw : float = sin_yaw * cos_turn - cos_yaw * sin_turn
+        previous_cos_yaw : float = cos_yaw * cos_turn + sin_yaw * sin_turn
+        if moving_time != elapsed_time:
+            sin_turn = sin(turn_angle * moving_time / elapsed_time)
+            cos_turn = cos(turn_angle * moving_time / elapsed_time)
+            sin_yaw = previous_sin_yaw * cos_turn + previous_cos_yaw * sin_turn
+            cos_yaw = previous_cos_yaw * cos_turn - previous_sin_yaw * sin_turn
+        turn_radius : float = aircraft.horizontal_speed * elapsed_time / 1000.0 / turn_angle
+        displacement : Vector3D = Vector3D(
+            turn_radius * (previous_cos_yaw - cos_yaw),
+            turn_radius * (previous_sin_yaw - sin_yaw),
+            aircraft.speed.z() * moving_time / 1000.0)
+        if self.__drifting:
+            displacement += aircraft.wind * (moving_time / 1000.0)
+        return displacement
+
+    def find_collision_time(self, elapsed_time : float) -> float | None:
+        """Finds time in ms within elapsed time at which swept aircrafts segments first come within collision distance, none without collision"""
+        vehicles = self.aircraft_vehicles
+        collision_distance : float = max(vehicles[0].size, vehicles[1].size)
+        relative_position : Vector3D = vehicles[0].position - vehicles[1].position
+        relative_speed : Vector3D = (self.find_displacement(vehicles[0], elapsed_time) - self.find_displacement(vehicles[1], elapsed_time)) / elapsed_time
+        if relative_position.length() <= collision_distance:
+            return 0.0
+        # closest approach of the segments during the step
+        speed_squared : float = Vector3D.dotProduct(relative_speed, relative_speed)
+        if speed_squared == 0.0:
+            return None
+        closest_time : float = min(max(-Vector3D.dotProduct(relative_position, relative_speed) / speed_squared, 0.0), elapsed_time)
+        if (relative_position + relative_speed * closest_time).length() > collision_distance:
+            return None
+        return min(self.find_sphere_crossing_time(relative_position, relative_speed, collision_distance), elapsed_time)
+    
+    @staticmethod
+    def find_lag_factor(elapsed_time : float, dynamic_delay : float) -> float:
+        """Finds part of the difference to its target closed by first-order lag of dynamic delay during elapsed time"""
+        return 1.0 - exp(-elapsed_time / dynamic_delay)
+
+    def is_guidance_due(self, elapsed_time : float) -> bool:
+        """Advances guidance clock by elapsed time, returns true when flight control computers have to update their targets, held in between"""
+        self.__guidance_time += elapsed_time
+        if self.__guidance_time < self.simulation_state.guidance_threshold:
+            return False
+        self.__guidance_time = 0.0
+        return True
+
+    def update_aircrafts_speed_angles(self, elapsed_time : float) -> None:
+        """Updates aircrafts movement speed and angles"""
+        assert elapsed_time > 0.0
+        guidance_due : bool = self.is_guidance_due(elapsed_time)
+        for aircraft in self.aircraft_vehicles:
+            # flight control computer
+            aircraft_id : int = aircraft.aircraft_id
+            try:
+                fcc : AircraftFCC = self.aircraft_fccs[aircraft_id]
+            except IndexError:
+                logging.error("Aircraft's " + str(aircraft_id) + " flight control computer not found")
+                return
+            if guidance_due:
+                cause_collision = self.simulation_state.first_cause_collision if aircraft_id == 0 else self.simulation_state.second_cause_collision
+                fcc.update() if not cause_collision else fcc.update_target(self.aircraft_vehicles[1 - aircraft_id].position + self.aircraft_vehicles[1 - aircraft_id].speed)
+            
+            # speed
+            current_speed = aircraft.absolute_speed
+            target_speed = fcc.target_speed
+            speed_difference = abs(current_speed - target_speed)
+            max_speed_delta = aircraft.max_acceleration / elapsed_time
+            if speed_difference > 0.001 and current_speed - max_speed_delta > 20.0 and current_speed + max_speed_delta < 340: # make drone subsonic
+                
+                if speed_difference < max_speed_delta:
+                    pass # become target
+                elif current_speed < target_speed:
+                    target_speed = current_speed + max_speed_delta
+                else:
+                    target_speed = current_speed - max_speed_delta
+                aircraft.scale_speed(target_speed / current_speed)
+
+            # roll angle
+            aircraft.roll_angle = self.find_lag_factor(elapsed_time, aircraft.roll_dynamic_delay) * (fcc.target_roll_angle - aircraft.roll_angle)
+
+            # pitch angle
+            current_pitch_angle : float = aircraft.pitch_angle
+            target_pitch_angle : float = copy(fcc.target_pitch_angle)
+            if not abs(current_pitch_angle - target_pitch_angle) < 0.001 and current_pitch_angle < 90.0 and current_pitch_angle > -90.0:
+                delta_pitch_angle : float = self.find_lag_factor(elapsed_time, aircraft.pitch_dynamic_delay) * (target_pitch_angle - aircraft.pitch_angle)
+                delta_pitch_angle = abs(delta_pitch_angle) # temporary
+                new_pitch_angle : float = current_pitch_angle
+                if target_pitch_angle > 0:
+                    if target_pitch_angle > current_pitch_angle:
+                        new_pitch_angle = current_pitch_angle + delta_pitch_angle
+                    else:
+                        new_pitch_angle = current_pitch_angle - delta_pitch_angle
+                else: # target_pitch_angle < 0
+                    if target_pitch_angle < current_pitch_angle:
+                        new_pitch_angle = current_pitch_angle - delta_pitch_angle
+                    else:
+                        new_pitch_angle = current_pitch_angle + delta_pitch_angle
+
+                if new_pitch_angle > 45.0 or new_pitch_angle < -45.0:
+                    new_pitch_angle = current_pitch_angle
+                current_speed : float = aircraft.absolute_speed
+                aircraft.climb(current_speed * sin(radians(new_pitch_angle)))
+                
+            # yaw angle
+            self.turn_angles[aircraft_id] = 0.0
+            roll_angle : float = aircraft.roll_angle
+            current_yaw_angle : float = aircraft.yaw_angle
+            target_yaw_angle : float = fcc.target_yaw_angle
+            if not (roll_angle == 0.0 or abs(current_yaw_angle - target_yaw_angle) < 0.001):
+                current_horizontal_speed : float = aircraft.horizontal_speed
+                delta_yaw_angle : float = self.simulation_state.g_acceleration * tan(radians(roll_angle)) / (current_horizontal_speed / elapsed_time)
+                self.turn_angles[aircraft_id] = radians(delta_yaw_angle)
+                aircraft.turn(self.turn_angles[aircraft_id])
+
+    def find_adaptive_time_step(self, time_step : int, time_step_limit : int, separation_margin : float) -> int:
+        """Finds the largest multiple of time step not exceeding limit during which aircrafts can neither reach separation margin nor destination nor maneuver"""
+        vehicles = self.aircraft_vehicles
+        fccs = self.aircraft_fccs
+        margin_distance : float = self.simulation_state.minimum_separation * separation_margin
+        relative_distance : float = (vehicles[0].position - vehicles[1].position).length()
+        wind = self.simulation_state.wind
+        wind_speed : float = 0.0 if wind is None else wind.max_speed
+        closing_speed : float = vehicles[0].absolute_speed + vehicles[1].absolute_speed + 2.0 * wind_speed
+        if relative_distance <= margin_distance or closing_speed <= 0.0:
+            return time_step
+        adaptive_time_step : float = min(time_step_limit, 1000.0 * (relative_distance - margin_distance) / closing_speed)
+        for aircraft, fcc in zip(vehicles, fccs):
+            if self.simulation_state.terrain is not None:
+                # ground is checked once per cycle, keep the configured step below the highest terrain
+                adaptive_time_step = min(adaptive_time_step, 1000.0 * self.find_ground_time(aircraft))
+            if fcc.target_roll_angle != 0.0 or abs(aircraft.roll_angle) >= 0.001:
+                return time_step
+            if abs(aircraft.absolute_speed - fcc.target_speed) > 0.001 or abs(aircraft.pitch_angle - fcc.target_pitch_angle) >= 0.01:
+                return time_step
+            destination : Vector3D | None = fcc.destination
+            if destination is not None:
+                # keep the arrival radius and the lookahead turn towards the next destination at the configured step
+                absolute_speed : float = aircraft.absolute_speed
+                approach_distance : float = (destination - aircraft.position).length() - aircraft.size * 5 - absolute_speed
+                adaptive_time_step = min(adaptive_time_step, 1000.0 * approach_distance / (absolute_speed + wind_speed))
+        return max(time_step, int(adaptive_time_step // time_step) * time_step)
+
+    @staticmethod
+    def find_sphere_crossing_time(relative_position : Vector3D, relative_speed : Vector3D, radius : float) -> float:
+        """Finds time after which relative position moving with relative speed first crosses sphere of radius, in time units of the speed"""
+        a : float = Vector3D.dotProduct(relative_speed, relative_speed)
+        b : float = Vector3D.dotProduct(relative_position, relative_speed)
+        c : float = Vector3D.dotProduct(relative_position, relative_position) - radius ** 2
+        if a == 0.0:
+            return float("inf")
+        if c < 0.0: # leaving the sphere
+            return (-b + sqrt(b ** 2 - a * c)) / a
+        if b >= 0.0 or b ** 2 - a * c < 0.0: # not approaching or passing by
+            return float("inf")
+        return (-b - sqrt(b ** 2 - a * c)) / a
+
+    def is_coasting(self, aircraft : AircraftVehicle, fcc : AircraftFCC, elapsed_time : float) -> bool:
+        """Checks whether the aircraft keeps flying straight without any correction for elapsed time"""
+        if fcc.target_roll_angle != 0.0 or abs(aircraft.roll_angle) >= 0.001 or fcc.evade_maneuver or fcc.safe_zone_occupied:
+            return False
+        if abs(aircraft.absolute_speed - fcc.target_speed) > 0.001:
+            return False
+        target_yaw_angle : float = fcc.target_yaw_angle
+        target_pitch_angle : float = fcc.target_pitch_angle
+        if fcc.destination is not None and fcc.autopilot and not fcc.ignore_destinations:
+            position : Vector3D = aircraft.position + aircraft.speed * (elapsed_time / 1000.0)
+            target_yaw_angle = fcc.find_best_yaw_angle(position, fcc.destination)
+            target_pitch_angle = fcc.find_best_pitch_angle(position, fcc.destination)
+        return abs(aircraft.yaw_angle - target_yaw_angle) < 0.001 and abs(aircraft.pitch_angle - target_pitch_angle) < 0.001
+
+    def find_coast_cycles(self, time_step : float, cycles_limit : int, minimal_relative_distance : float) -> int:
+        """Finds count of cycles up to limit which all aircrafts can coast through before the next event, zero when any of them maneuvers or drifts with wind"""
+        vehicles = self.aircraft_vehicles
+        fccs = self.aircraft_fccs
+        if cycles_limit < 1 or self.simulation_state.first_cause_collision or self.simulation_state.second_cause_collision:
+            return 0
+        if self.simulation_state.wind is not None:
+            # wind varies along the path and flight control computers keep correcting the drift
+            return 0
+        minimum_separation : float = self.simulation_state.minimum_separation
+        relative_position : Vector3D = vehicles[0].position - vehicles[1].position
+        relative_speed : Vector3D = vehicles[0].speed - vehicles[1].speed
+        if relative_position.length() <= minimum_separation:
+            return 0
+
+        # entering minimum separation and leaving twice of it after the separation was breached
+        coast_time : float = self.find_sphere_crossing_time(relative_position, relative_speed, minimum_separation)
+        if minimal_relative_distance < minimum_separation:
+            coast_time = min(coast_time, self.find_sphere_crossing_time(relative_position, relative_speed, minimum_separation * 2))
+        for aircraft, fcc in zip(vehicles, fccs):
+            # ground
+            coast_time = min(coast_time, self.find_ground_time(aircraft))
+            # arrival radius and lookahead turn towards the next destination
+            if fcc.destination is not None:
+                coast_time = min(coast_time, self.find_sphere_crossing_time(
+                    aircraft.position - fcc.destination,
+                    aircraft.speed,
+                    aircraft.size * 5 + aircraft.absolute_speed))
+
+        # keep one configured step margin before the event
+        cycles : int = int(min(coast_time * 1000.0 / time_step, cycles_limit + 1)) - 1
+        while cycles > 0:
+            if all(self.is_coasting(aircraft, fcc, 0.0) and self.is_coasting(aircraft, fcc, cycles * time_step) for aircraft, fcc in zip(vehicles, fccs)):
+                return cycles
+            cycles //= 2
+        return 0
+
+    def coast(self, time_step : float, cycles : int) -> None:
+        """Advances straight flying aircrafts by cycles of time step at once"""
+        self.count_cycles()
+        elapsed_time : float = time_step * cycles
+        self.__simulated_time += elapsed_time
+        self.__guidance_time += elapsed_time
+        for aircraft in self.aircraft_vehicles:
+            aircraft.roll(-aircraft.roll_angle * self.find_lag_factor(elapsed_time, aircraft.roll_dynamic_delay))
+            aircraft.move(
+                aircraft.speed.x() * elapsed_time / 1000.0,
+                aircraft.speed.y() * elapsed_time / 1000.0,
+                aircraft.speed.z() * elapsed_time / 1000.0)
+            aircraft.distance_covered = aircraft.absolute_speed * elapsed_time / 1000.0
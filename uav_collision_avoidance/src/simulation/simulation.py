@@ -14,21 +14,32 @@ from typing import List, Tuple
 from numpy import random, ndarray
 from matplotlib.ticker import MaxNLocator
 from math import dist, sin, cos, radians, sqrt
+from time import perf_counter
 
 from PySide6.QtCore import QThread, QTime
-from PySide6.QtGui import QCloseEvent, QVector3D
+from PySide6.QtGui import QCloseEvent
 from PySide6.QtWidgets import QMainWindow
 
 from ..aircraft.aircraft import Aircraft
 from ..aircraft.aircraft_fcc import AircraftFCC
+from ..aircraft.aircraft_fleet import AircraftFleet
+from ..engine.engine_physics import EnginePhysics
+from ..engine.engine_adsb import EngineADSB
+from ..engine.engine_headless import EngineHeadless
 from ..simulation.simulation_settings import SimulationSettings
 from ..simulation.simulation_physics import SimulationPhysics
+from ..simulation.simulation_fleet_physics import SimulationFleetPhysics
+from ..simulation.simulation_batch import SimulationBatch
+from ..simulation.simulation_trajectory_predictor import SimulationTrajectoryPredictor
 from ..simulation.simulation_state import SimulationState
 from ..simulation.simulation_render import SimulationRender
 from ..simulation.simulation_widget import SimulationWidget
 from ..simulation.simulation_adsb import SimulationADSB
 from ..simulation.simulation_fps import SimulationFPS
 from ..simulation.simulation_data import SimulationData
+from ..simulation.simulation_vector import Vector3D
+from ..simulation.simulation_spatial_hash import SimulationSpatialHash
+from ..simulation.simulation_sweep_and_prune import SimulationSweepAndPrune
 
 class Simulation(QMainWindow):
     """Main simulation App"""
@@ -49,8 +60,9 @@ class Simulation(QMainWindow):
         self.__imported_from_data : bool = False
         self.__simulation_data : SimulationData | None = None
 
-        self.__simulation_physics : SimulationPhysics | None = None
-        self.__simulation_adsb : SimulationADSB | None = None
+        self.__simulation_physics : EnginePhysics | None = None
+        self.__simulation_adsb : EngineADSB | None = None
+        self.__headless_engine : EngineHeadless | None = None
         self.__simulation_fps : SimulationFPS | None = None
         self.__simulation_widget : SimulationWidget | None = None
         self.__simulation_render : SimulationRender | None = None
@@ -132,25 +144,35 @@ class Simulation(QMainWindow):
         self.__simulation_data = data
 
     @property
-    def simulation_physics(self) -> SimulationPhysics:
-        """Returns simulation physics"""
+    def simulation_physics(self) -> EnginePhysics:
+        """Returns simulation physics, a thread in realtime simulation"""
         return self.__simulation_physics
     
     @simulation_physics.setter
-    def simulation_physics(self, physics : SimulationPhysics) -> None:
+    def simulation_physics(self, physics : EnginePhysics) -> None:
         """Sets simulation physics"""
         self.__simulation_physics = physics
 
     @property
-    def simulation_adsb(self) -> SimulationADSB:
-        """Returns simulation adsb"""
+    def simulation_adsb(self) -> EngineADSB:
+        """Returns simulation adsb, a thread in realtime simulation"""
         return self.__simulation_adsb
     
     @simulation_adsb.setter
-    def simulation_adsb(self, adsb : SimulationADSB) -> None:
+    def simulation_adsb(self, adsb : EngineADSB) -> None:
         """Sets simulation adsb"""
         self.__simulation_adsb = adsb
 
+    @property
+    def headless_engine(self) -> EngineHeadless | None:
+        """Returns headless engine reused by consecutive headless runs"""
+        return self.__headless_engine
+
+    @headless_engine.setter
+    def headless_engine(self, engine : EngineHeadless | None) -> None:
+        """Sets headless engine"""
+        self.__headless_engine = engine
+
     @property
     def simulation_fps(self) -> SimulationFPS:
         """Returns simulation fps"""
@@ -214,8 +236,9 @@ class Simulation(QMainWindow):
         self.simulation_render.start(priority = QThread.Priority.NormalPriority)
         self.simulation_widget.stop_signal.connect(self.stop)
     
-    def run_headless(self, avoid_collisions : bool = False, aircrafts : List[Aircraft] | None = None, test_index : int | None = None, aircraft_angle : float | None = None) -> SimulationData:
-        """Executes simulation without GUI"""
+    def run_headless(self, avoid_collisions : bool = False, aircrafts : List[Aircraft] | None = None, test_index : int | None = None, aircraft_angle : float | None = None, adaptive_time_step : bool = False, coast_fast_forward : bool = False, turn_prediction : bool = False) -> SimulationData:
+        """Executes simulation without GUI, adaptive time step lengthens physics cycles while aircrafts are far from conflict, coast fast forward jumps over straight flight up to the next event,
+        turn prediction skips evade maneuvers in conflicts which aircrafts keeping their turns resolve"""
         logging.info("Starting headless simulation")
         if aircrafts is not None:
             self.setup_aircrafts(aircrafts)
@@ -223,48 +246,23 @@ class Simulation(QMainWindow):
             self.setup_debug_aircrafts()
         else:
             assert len(self.aircrafts) > 0
-        simulation_data : SimulationData = SimulationData()
-        simulation_data.aircraft_angle = aircraft_angle
-        simulation_data.aircraft_1_initial_position = copy(self.aircrafts[0].initial_position)
-        simulation_data.aircraft_2_initial_position = copy(self.aircrafts[1].initial_position)
-        simulation_data.aircraft_1_initial_speed = copy(self.aircrafts[0].initial_speed)
-        simulation_data.aircraft_2_initial_speed = copy(self.aircrafts[1].initial_speed)
-        simulation_data.aircraft_1_initial_target = copy(self.aircrafts[0].initial_target)
-        simulation_data.aircraft_2_initial_target = copy(self.aircrafts[1].initial_target)
-        simulation_data.aircraft_1_initial_roll_angle = copy(self.aircrafts[0].initial_roll_angle)
-        simulation_data.aircraft_2_initial_roll_angle = copy(self.aircrafts[1].initial_roll_angle)
-        simulation_data.collision = False
-
-        self.state = SimulationState(SimulationSettings(), is_realtime = False, avoid_collisions = avoid_collisions)
-        self.simulation_physics = SimulationPhysics(self, self.aircrafts, self.state)
-        self.simulation_adsb = SimulationADSB(self, self.aircrafts, self.state)
-        self.simulation_adsb.is_silent = True
-        self.simulation_adsb.reset_destinations()
-        time_step : int = int(self.state.simulation_threshold)
-        adsb_step : int = int(self.state.adsb_threshold)
-        partial_time_counter : int = adsb_step
-        for time in range(0, int(self.simulation_time / self.state.simulation_threshold), time_step):
-            self.simulation_physics.cycle(time_step)
-            if partial_time_counter >= adsb_step:
-                self.simulation_adsb.cycle()
-                partial_time_counter = 0
-            partial_time_counter += time_step
-            if self.simulation_adsb.relative_distance > self.state.minimum_separation * 2 and self.simulation_adsb.minimal_relative_distance < self.state.minimum_separation:
-                logging.info("Headless simulation stopping due to aircrafts too far apart")
-                break
-            if not self.aircrafts[0].fcc.destination and not self.aircrafts[1].fcc.destination:
-                logging.info("Headless simulation stopping due to no other destinations set")
-                break
-            if self.state.collision:
-                logging.info("Headless simulation stopping due to collision detected")
-                simulation_data.collision = True
-                break
-        simulation_data.minimal_relative_distance = copy(self.simulation_adsb.minimal_relative_distance)
-        simulation_data.aircraft_1_final_position = copy(self.aircrafts[0].vehicle.position)
-        simulation_data.aircraft_2_final_position = copy(self.aircrafts[1].vehicle.position)
-        simulation_data.aircraft_1_final_speed = copy(self.aircrafts[0].vehicle.speed)
-        simulation_data.aircraft_2_final_speed = copy(self.aircrafts[1].vehicle.speed)
-        simulation_data.miss_distance_at_closest_approach = copy(self.simulation_adsb.miss_distance_at_closest_approach)
+        if self.headless_engine is None or len(self.headless_engine.aircrafts) != len(self.aircrafts):
+            self.headless_engine = EngineHeadless(
+                self.aircrafts,
+                SimulationState(SimulationSettings(), is_realtime = False, avoid_collisions = avoid_collisions),
+                self.simulation_time)
+        else:
+            self.headless_engine.reseed(self.aircrafts, avoid_collisions = avoid_collisions)
+        engine : EngineHeadless = self.headless_engine
+        engine.adsb.trajectory_predictor = SimulationTrajectoryPredictor(len(engine.aircrafts)) if turn_prediction else None
+        self.setup_aircrafts(engine.aircrafts)
+        self.state = engine.simulation_state
+        self.simulation_physics = engine.physics
+        self.simulation_adsb = engine.adsb
+        simulation_data : SimulationData = engine.run(
+            aircraft_angle = aircraft_angle,
+            adaptive_time_step = adaptive_time_step,
+            coast_fast_forward = coast_fast_forward)
         if self.imported_from_data:
             self.check_simulation_data_correctness()
         if test_index is not None:
@@ -274,7 +272,7 @@ class Simulation(QMainWindow):
         self.stop()
         return simulation_data
     
-    def generate_test_aircrafts(self) -> List[Tuple[List[Aircraft], float]]:
+    def generate_test_aircrafts(self, test_cases_count : int = 400) -> List[Tuple[List[Aircraft], float]]:
         """Generates test cases consisting of
         list of lists of aircrafts and angle between them"""
         logging.info("Generating test cases")
@@ -288,7 +286,6 @@ class Simulation(QMainWindow):
         test_minimal_course_difference : float = 0.5
         test_maximal_course_difference : float = 179.5
         test_minimal_trigonometric_value : float = 0.0001
-        test_cases_count : int = 400
         test_cases : List[float] = random.uniform(test_minimal_course_difference, test_maximal_course_difference, test_cases_count).tolist()
         test_cases.sort(reverse = False)
         logging.info("Randomly generated angles: %s", test_cases)
@@ -327,15 +324,15 @@ class Simulation(QMainWindow):
                 logging.error("Invalid angle value: %f", angle)
                 continue
 
-            aircraft_1_position : QVector3D = QVector3D(
+            aircraft_1_position : Vector3D = Vector3D(
                 0,
                 -distance_to_collision,
                 aircraft_init_height)
-            aircraft_1_target : QVector3D = QVector3D(
+            aircraft_1_target : Vector3D = Vector3D(
                 0,
                 100 * distance_to_collision,
                 aircraft_target_height)
-            aircraft_1_speed : QVector3D = QVector3D(
+            aircraft_1_speed : Vector3D = Vector3D(
                 0,
                 aircraft_absolute_speed,
                 0)
@@ -344,22 +341,22 @@ class Simulation(QMainWindow):
             # rotate angle to get circle equation
             sin_value = sin(radians(90 - angle))
             cos_value = cos(radians(90 - angle))
-            aircraft_2_position : QVector3D = QVector3D(
+            aircraft_2_position : Vector3D = Vector3D(
                 distance_to_collision * cos_value,
                 -distance_to_collision * sin_value,
                 aircraft_1_position.z())
-            aircraft_2_target : QVector3D = QVector3D(
+            aircraft_2_target : Vector3D = Vector3D(
                 100 * -distance_to_collision * cos_value,
                 100 * distance_to_collision * sin_value,
                 aircraft_1_target.z())
-            aircraft_2_speed : QVector3D = QVector3D(
+            aircraft_2_speed : Vector3D = Vector3D(
                 -aircraft_absolute_speed * cos_value,
                 aircraft_absolute_speed * sin_value,
                 aircraft_1_speed.z())
 
             assert abs(aircraft_2_speed.length() - aircraft_absolute_speed) < 0.1
 
-            calculated_relative_distance_projected : float = dist(aircraft_1_position.toTuple(), aircraft_2_position.toTuple())
+            calculated_relative_distance_projected : float = aircraft_1_position.distanceToPoint(aircraft_2_position)
             calculated_relative_distance : float = aircraft_1_position.distanceToPoint(aircraft_2_position)
             logging.info("Relative distance between aircrafts: %fm (3D %fm) with angle: %f", calculated_relative_distance_projected, calculated_relative_distance, angle)
             assert abs(aircraft_1_position.distanceToPoint(aircraft_2_position) - test_start_aircrafts_relative_distance) < test_start_aircrafts_relative_distance / 2 # for 10 km, actual 15 km is accepted
@@ -388,15 +385,15 @@ class Simulation(QMainWindow):
                 list_of_aircrafts : List[Aircraft] = []
                 aircraft : Aircraft = Aircraft( # detection test
                     aircraft_id = 0,
-                    position = QVector3D(-800, 4000, 1000),
-                    speed = QVector3D(60, -60, 0),
-                    initial_target = QVector3D(51_900, -50_000, 10000)) # 51.9 km, -50 km
+                    position = Vector3D(-800, 4000, 1000),
+                    speed = Vector3D(60, -60, 0),
+                    initial_target = Vector3D(51_900, -50_000, 10000)) # 51.9 km, -50 km
                 list_of_aircrafts.append(aircraft)
                 aircraft = Aircraft(
                     aircraft_id = 1,
-                    position = QVector3D(4000, 6000, 1000),
-                    speed = QVector3D(0, -85, 0),
-                    initial_target = QVector3D(900, -1_001_300, 1000)) # 0.9 km, -1001.3 km
+                    position = Vector3D(4000, 6000, 1000),
+                    speed = Vector3D(0, -85, 0),
+                    initial_target = Vector3D(900, -1_001_300, 1000)) # 0.9 km, -1001.3 km
                 list_of_aircrafts.append(aircraft)
                 list_of_lists.append(list_of_aircrafts, angle)
 
@@ -411,40 +408,40 @@ class Simulation(QMainWindow):
         aircrafts = [ # chase test
             Aircraft(
                 aircraft_id = 0,
-                position = QVector3D(0, -20_000, 1000),
-                speed = QVector3D(0, 100, 0),
-                initial_target = QVector3D(0, 2_000_000, 1000)),
+                position = Vector3D(0, -20_000, 1000),
+                speed = Vector3D(0, 100, 0),
+                initial_target = Vector3D(0, 2_000_000, 1000)),
             Aircraft(
                 aircraft_id = 1,
-                position = QVector3D(0, -10_000, 1000),
-                speed = QVector3D(0, 50, 0),
-                initial_target = QVector3D(0, 2_000_000, 1000))
+                position = Vector3D(0, -10_000, 1000),
+                speed = Vector3D(0, 50, 0),
+                initial_target = Vector3D(0, 2_000_000, 1000))
         ]
         list_of_lists.append([aircrafts, 0.0])
         aircrafts = [ # full angle collision, equal speeds
             Aircraft(
                 aircraft_id = 0,
-                position = QVector3D(0, -5000, 1000),
-                speed = QVector3D(0, 50, 0),
-                initial_target = QVector3D(0, 500_000, 1000)),
+                position = Vector3D(0, -5000, 1000),
+                speed = Vector3D(0, 50, 0),
+                initial_target = Vector3D(0, 500_000, 1000)),
             Aircraft(
                 aircraft_id = 1,
-                position = QVector3D(0, 5000, 1000),
-                speed = QVector3D(0, -50, 0),
-                initial_target = QVector3D(0, -500_000, 1000))
+                position = Vector3D(0, 5000, 1000),
+                speed = Vector3D(0, -50, 0),
+                initial_target = Vector3D(0, -500_000, 1000))
         ]
         list_of_lists.append([aircrafts, 180.0])
         aircrafts = [ # full angle collision
             Aircraft(
                 aircraft_id = 0,
-                position = QVector3D(0, -5000, 1000),
-                speed = QVector3D(0, 50, 0),
-                initial_target = QVector3D(0, 500_000, 1000)),
+                position = Vector3D(0, -5000, 1000),
+                speed = Vector3D(0, 50, 0),
+                initial_target = Vector3D(0, 500_000, 1000)),
             Aircraft(
                 aircraft_id = 1,
-                position = QVector3D(0, 10000, 1000),
-                speed = QVector3D(0, -100, 0),
-                initial_target = QVector3D(0, -500_000, 1000))
+                position = Vector3D(0, 10000, 1000),
+                speed = Vector3D(0, -100, 0),
+                initial_target = Vector3D(0, -500_000, 1000))
         ]
         list_of_lists.append([aircrafts, 180.0])
 
@@ -452,51 +449,131 @@ class Simulation(QMainWindow):
         aircrafts = [ # chase test
             Aircraft(
                 aircraft_id = 0,
-                position = QVector3D(0, -20_000, 1000),
-                speed = QVector3D(0, 100, 0),
-                initial_target = QVector3D(test_average_aircraft_size * 3, 2_000_000 + test_average_aircraft_size * 3, 1000)),
+                position = Vector3D(0, -20_000, 1000),
+                speed = Vector3D(0, 100, 0),
+                initial_target = Vector3D(test_average_aircraft_size * 3, 2_000_000 + test_average_aircraft_size * 3, 1000)),
             Aircraft(
                 aircraft_id = 1,
-                position = QVector3D(0, -10_000, 1000),
-                speed = QVector3D(0, 50, 0),
-                initial_target = QVector3D(-test_average_aircraft_size * 3, 2_000_000 - test_average_aircraft_size * 3, 1000))
+                position = Vector3D(0, -10_000, 1000),
+                speed = Vector3D(0, 50, 0),
+                initial_target = Vector3D(-test_average_aircraft_size * 3, 2_000_000 - test_average_aircraft_size * 3, 1000))
         ]
         list_of_lists.append([aircrafts, 0.001])
         aircrafts = [ # full angle collision, equal speeds
             Aircraft(
                 aircraft_id = 0,
-                position = QVector3D(0, -5000, 1000),
-                speed = QVector3D(0, 50, 0),
-                initial_target = QVector3D(test_average_aircraft_size * 3, 500_000 + test_average_aircraft_size * 3, 1000)),
+                position = Vector3D(0, -5000, 1000),
+                speed = Vector3D(0, 50, 0),
+                initial_target = Vector3D(test_average_aircraft_size * 3, 500_000 + test_average_aircraft_size * 3, 1000)),
             Aircraft(
                 aircraft_id = 1,
-                position = QVector3D(0, 5000, 1000),
-                speed = QVector3D(0, -50, 0),
-                initial_target = QVector3D(-test_average_aircraft_size * 3, -500_000 - test_average_aircraft_size * 3, 1000))
+                position = Vector3D(0, 5000, 1000),
+                speed = Vector3D(0, -50, 0),
+                initial_target = Vector3D(-test_average_aircraft_size * 3, -500_000 - test_average_aircraft_size * 3, 1000))
         ]
         list_of_lists.append([aircrafts, 180.001])
         aircrafts = [ # full angle collision
             Aircraft(
                 aircraft_id = 0,
-                position = QVector3D(0, -5000, 1000),
-                speed = QVector3D(0, 50, 0),
-                initial_target = QVector3D(test_average_aircraft_size * 3, 500_000 + test_average_aircraft_size * 3, 1000)),
+                position = Vector3D(0, -5000, 1000),
+                speed = Vector3D(0, 50, 0),
+                initial_target = Vector3D(test_average_aircraft_size * 3, 500_000 + test_average_aircraft_size * 3, 1000)),
             Aircraft(
                 aircraft_id = 1,
-                position = QVector3D(0, 10000, 1000),
-                speed = QVector3D(0, -100, 0),
-                initial_target = QVector3D(-test_average_aircraft_size * 3, -500_000 - test_average_aircraft_size * 3, 1000))
+                position = Vector3D(0, 10000, 1000),
+                speed = Vector3D(0, -100, 0),
+                initial_target = Vector3D(-test_average_aircraft_size * 3, -500_000 - test_average_aircraft_size * 3, 1000))
         ]
         list_of_lists.append([aircrafts, 180.001])
         return list_of_lists
+
+    def run_physics_parity(self, duration : int = 60_000, tolerance : float = 1.0, collision_cycles_tolerance : int = 3) -> List[float]:
+        """Compares vectorized fleet physics against per-object physics on consistent test cases,
+        returns maximal position deviation of each test case"""
+        logging.info("Running physics parity check")
+        deviations : List[float] = []
+        for i, (aircrafts, angle) in enumerate(self.generate_consistent_list_of_aircraft_lists()):
+            state : SimulationState = SimulationState(SimulationSettings(), is_realtime = False, avoid_collisions = False)
+            physics : EnginePhysics = EnginePhysics(aircrafts, state)
+            for aircraft in aircrafts:
+                aircraft.fcc.clear_destinations()
+                aircraft.fcc.load_initial_destination()
+            fleet : AircraftFleet = AircraftFleet.from_aircrafts(aircrafts)
+            fleet_physics : SimulationFleetPhysics = SimulationFleetPhysics(fleet, state.g_acceleration, terrain = state.terrain, wind = state.wind)
+            time_step : float = state.simulation_threshold
+            maximal_deviation : float = 0.0
+            collision_cycle : int | None = None
+            fleet_collision_cycle : int | None = None
+            for cycle in range(int(duration / time_step)):
+                # per-object physics moves aircrafts one by one, so collisions may be registered a few cycles apart
+                if collision_cycle is None:
+                    physics.cycle(time_step)
+                    if state.collision:
+                        collision_cycle = cycle
+                if fleet_collision_cycle is None and fleet_physics.cycle(time_step):
+                    fleet_collision_cycle = cycle
+                if collision_cycle is None and fleet_collision_cycle is None:
+                    for j, aircraft in enumerate(aircrafts):
+                        maximal_deviation = max(maximal_deviation, dist(aircraft.vehicle.position.toTuple(), fleet.position[j]))
+                elif collision_cycle is not None and fleet_collision_cycle is not None:
+                    break
+                elif cycle - (collision_cycle if collision_cycle is not None else fleet_collision_cycle) >= collision_cycles_tolerance:
+                    logging.warning("Physics parity test %d collision mismatch", i)
+                    maximal_deviation = float("inf")
+                    break
+            deviations.append(maximal_deviation)
+            if maximal_deviation > tolerance:
+                logging.warning("Physics parity test %d (angle %f) deviation %fm exceeds %fm tolerance", i, angle, maximal_deviation, tolerance)
+            else:
+                logging.info("Physics parity test %d (angle %f) deviation %fm", i, angle, maximal_deviation)
+            print(f"Physics parity test {i}: maximal deviation " + "{:.6f}".format(maximal_deviation) + "m")
+        return deviations
     
-    def run_tests(self, begin_with_default_set : bool = True, test_number : int = 20) -> None:
-        """Runs simulation tests"""
+    def run_broad_phase_benchmark(self, counts : Tuple[int, ...] = (10, 100, 1_000, 10_000, 100_000), lookahead : float = 0.0, all_pairs_limit : int = 10_000, steps : int = 5, seed : int = 0) -> List[Tuple[int, float, float]]:
+        """Benchmarks conflict checks of random airspaces of the same traffic density and growing aircrafts counts, broad-phase against testing all pairs up to their limit,
+        separation checks without lookahead use spatial hash, lookahead probes in seconds use sweep and prune, returns aircrafts counts with both mean check times in ms"""
+        logging.info("Running broad-phase scaling benchmark")
+        generator : random.Generator = random.default_rng(seed)
+        minimum_separation : float = SimulationState(SimulationSettings(), is_realtime = False).minimum_separation
+        results : List[Tuple[int, float, float]] = []
+        for count in counts:
+            side : float = sqrt(count) * minimum_separation * 3.0
+            position = generator.uniform((0.0, 0.0, 0.0), (side, side, 10_000.0), (count, 3))
+            speed = generator.uniform((-250.0, -250.0, 0.0), (250.0, 250.0, 0.0), (count, 3))
+            spatial_hash : SimulationSpatialHash = SimulationSpatialHash(minimum_separation)
+            sweep_and_prune : SimulationSweepAndPrune = SimulationSweepAndPrune(lookahead, minimum_separation)
+            broad_phase_time : float = 0.0
+            all_pairs_time : float = float("nan")
+            for _ in range(steps):
+                position += speed
+                start_timestamp : float = perf_counter()
+                if lookahead > 0.0:
+                    sweep_and_prune.update(position, speed)
+                    candidates = sweep_and_prune.find_pairs()
+                else:
+                    spatial_hash.update(position)
+                    candidates = spatial_hash.find_pairs()
+                first, _, _, _, _ = EngineADSB.find_conflict_pairs(position, speed, minimum_separation, lookahead = lookahead, candidates = candidates)
+                broad_phase_time += perf_counter() - start_timestamp
+                if count <= all_pairs_limit:
+                    start_timestamp = perf_counter()
+                    all_pairs_first, _, _, _, _ = EngineADSB.find_conflict_pairs(position, speed, minimum_separation, lookahead = lookahead)
+                    all_pairs_time = (0.0 if np.isnan(all_pairs_time) else all_pairs_time) + perf_counter() - start_timestamp
+                    assert len(all_pairs_first) == len(first)
+            results.append((count, broad_phase_time / steps * 1000.0, all_pairs_time / steps * 1000.0))
+            logging.info("Broad-phase benchmark of %d aircrafts: %d conflicts", count, len(first))
+            print(f"{count} aircrafts: broad-phase " + "{:.3f}".format(results[-1][1]) + "ms, all pairs " + "{:.3f}".format(results[-1][2]) + "ms")
+        return results
+
+    def run_tests(self, begin_with_default_set : bool = True, test_number : int = 20, batched : bool = False, adaptive_time_step : bool = False, coast_fast_forward : bool = False, adaptive_surveillance : bool = False, turn_prediction : bool = False, level_of_detail : bool = False) -> None:
+        """Runs simulation tests, batched tests advance all test cases together without exporting paths, adaptive surveillance batches them evaluating encounters at intervals set by their threat,
+        turn prediction skips evade maneuvers in conflicts which aircrafts keeping their turns resolve, level of detail batches them flying aircrafts far from their partners kinematically"""
+        batched |= adaptive_surveillance or level_of_detail
         SimulationSettings.set_simulation_frequency(10.0)
         if test_number < 3:
             logging.info("Changing simulation tests to 3 test cases due to too low test number")
             test_number = 3
-        elif test_number > 200:
+        elif test_number > 200 and not batched:
             logging.info("Changing simulation tests to 100 test cases due to too high test number")
             test_number = 100
         logging.info("Running simulation tests")
@@ -508,7 +585,7 @@ class Simulation(QMainWindow):
             if test_number - consistent_tests_count > 0:
                 test_number -= consistent_tests_count
             
-        list_of_lists = self.generate_test_aircrafts()
+        list_of_lists = self.generate_test_aircrafts(test_cases_count = max(400, test_number))
         lists_count : int = len(list_of_lists)
         print("Generated list of pairs: ", lists_count)
 
@@ -598,38 +675,69 @@ class Simulation(QMainWindow):
             "minimal_relative_distance_if_no_avoidance",
             "minimal_relative_distance_if_avoidance",
             "miss_distance_at_closest_approach_if_no_avoidance",
-            "miss_distance_at_closest_approach_if_avoidance"])
+            "miss_distance_at_closest_approach_if_avoidance",
+            "minimal_relative_distance_time_if_no_avoidance",
+            "minimal_relative_distance_time_if_avoidance"])
         file.close()
         file = open(f"data/simulation-{export_time}.csv", "a")
         writer = csv.writer(file)
+
+        batch_data_no_avoidance : List[SimulationData] | None = None
+        batch_data_avoidance : List[SimulationData] | None = None
+        if batched:
+            print("Running batched tests: ", test_number)
+            batch_data_no_avoidance = SimulationBatch(
+                list_of_lists,
+                SimulationState(SimulationSettings(), is_realtime = False, avoid_collisions = False),
+                self.simulation_time,
+                adaptive_surveillance = adaptive_surveillance,
+                turn_prediction = turn_prediction,
+                level_of_detail = level_of_detail).run()
+            batch_data_avoidance = SimulationBatch(
+                list_of_lists,
+                SimulationState(SimulationSettings(), is_realtime = False, avoid_collisions = True),
+                self.simulation_time,
+                adaptive_surveillance = adaptive_surveillance,
+                turn_prediction = turn_prediction,
+                level_of_detail = level_of_detail).run()
         
         for i in range(0, test_number, 1):
-            print("Test " + str(i) + " - no collision avoidance")
-            logging.info("Test %d - no collision avoidance", i)
             aircraft_tuple : List[List[Aircraft], float] = list_of_lists[i]
-            aircrafts : List[Aircraft] = copy(aircraft_tuple[0])
             angle : float = aircraft_tuple[1]
-            print("Current test pair aircrafts count: ", len(aircrafts))
-            simulation_data_no_avoidance : SimulationData = self.run_headless(
-                avoid_collisions = False,
-                aircrafts = aircrafts,
-                test_index = i,
-                aircraft_angle = angle)
+            if batched:
+                simulation_data_no_avoidance : SimulationData = batch_data_no_avoidance[i]
+                simulation_data_avoidance : SimulationData = batch_data_avoidance[i]
+            else:
+                print("Test " + str(i) + " - no collision avoidance")
+                logging.info("Test %d - no collision avoidance", i)
+                aircrafts : List[Aircraft] = copy(aircraft_tuple[0])
+                print("Current test pair aircrafts count: ", len(aircrafts))
+                simulation_data_no_avoidance : SimulationData = self.run_headless(
+                    avoid_collisions = False,
+                    aircrafts = aircrafts,
+                    test_index = i,
+                    aircraft_angle = angle,
+                    adaptive_time_step = adaptive_time_step,
+                    coast_fast_forward = coast_fast_forward,
+                    turn_prediction = turn_prediction)
+                self.state = None
+
+                print("Test " + str(i) + " - collision avoidance")
+                logging.info("Test %d - collision avoidance", i)
+                aircrafts = copy(aircraft_tuple[0])
+                simulation_data_avoidance : SimulationData = self.run_headless(
+                    avoid_collisions = True,
+                    aircrafts = aircrafts,
+                    test_index = i,
+                    aircraft_angle = angle,
+                    adaptive_time_step = adaptive_time_step,
+                    coast_fast_forward = coast_fast_forward,
+                    turn_prediction = turn_prediction)
+                self.state = None
             if not simulation_data_no_avoidance.collision:
                 logging.info("Test %d - no collision avoidance - no collision detected, marking ❌", i)
-            self.state = None
-
-            print("Test " + str(i) + " - collision avoidance")
-            logging.info("Test %d - collision avoidance", i)
-            aircrafts = copy(aircraft_tuple[0])
-            simulation_data_avoidance : SimulationData = self.run_headless(
-                avoid_collisions = True,
-                aircrafts = aircrafts,
-                test_index = i,
-                aircraft_angle = angle)
             if not simulation_data_avoidance.collision:
                 logging.info("Test %d - collision avoidance - no collision detected, success ✔️", i)
-            self.state = None
             
             assert simulation_data_no_avoidance.aircraft_1_initial_position.x() == simulation_data_avoidance.aircraft_1_initial_position.x()
             assert simulation_data_no_avoidance.aircraft_1_initial_position.y() == simulation_data_avoidance.aircraft_1_initial_position.y()
@@ -700,7 +808,9 @@ class Simulation(QMainWindow):
                 simulation_data_no_avoidance.minimal_relative_distance,
                 simulation_data_avoidance.minimal_relative_distance,
                 simulation_data_no_avoidance.miss_distance_at_closest_approach,
-                simulation_data_avoidance.miss_distance_at_closest_approach])
+                simulation_data_avoidance.miss_distance_at_closest_approach,
+                simulation_data_no_avoidance.minimal_relative_distance_time,
+                simulation_data_avoidance.minimal_relative_distance_time])
             file.close()
             file = open(f"data/simulation-{export_time}.csv", "a")
             writer = csv.writer(file)
@@ -764,37 +874,41 @@ class Simulation(QMainWindow):
             for i, row in enumerate(reader):
                 if i == test_id + 1:
                     simulation_data : SimulationData = SimulationData()
-                    assert len(row) == 50
+                    assert len(row) == 50 or len(row) == 52 # files written before minimal relative distance times lack the last two columns
                     assert row[0] == str(test_id)
                     simulation_data.aircraft_angle = float(row[1])
-                    simulation_data.aircraft_1_initial_position = QVector3D(float(row[2]), float(row[3]), float(row[4]))
-                    simulation_data.aircraft_2_initial_position = QVector3D(float(row[5]), float(row[6]), float(row[7]))
-                    simulation_data.aircraft_1_initial_speed = QVector3D(float(row[8]), float(row[9]), float(row[10]))
-                    simulation_data.aircraft_2_initial_speed = QVector3D(float(row[11]), float(row[12]), float(row[13]))
-                    simulation_data.aircraft_1_initial_target = QVector3D(float(row[14]), float(row[15]), float(row[16]))
-                    simulation_data.aircraft_2_initial_target = QVector3D(float(row[17]), float(row[18]), float(row[19]))
+                    simulation_data.aircraft_1_initial_position = Vector3D(float(row[2]), float(row[3]), float(row[4]))
+                    simulation_data.aircraft_2_initial_position = Vector3D(float(row[5]), float(row[6]), float(row[7]))
+                    simulation_data.aircraft_1_initial_speed = Vector3D(float(row[8]), float(row[9]), float(row[10]))
+                    simulation_data.aircraft_2_initial_speed = Vector3D(float(row[11]), float(row[12]), float(row[13]))
+                    simulation_data.aircraft_1_initial_target = Vector3D(float(row[14]), float(row[15]), float(row[16]))
+                    simulation_data.aircraft_2_initial_target = Vector3D(float(row[17]), float(row[18]), float(row[19]))
                     if not avoid_collisions:
-                        simulation_data.aircraft_1_final_position = QVector3D(float(row[20]), float(row[21]), float(row[22]))
-                        simulation_data.aircraft_2_final_position = QVector3D(float(row[23]), float(row[24]), float(row[25]))
-                        simulation_data.aircraft_1_final_speed = QVector3D(float(row[32]), float(row[33]), float(row[34]))
-                        simulation_data.aircraft_2_final_speed = QVector3D(float(row[35]), float(row[36]), float(row[37]))
+                        simulation_data.aircraft_1_final_position = Vector3D(float(row[20]), float(row[21]), float(row[22]))
+                        simulation_data.aircraft_2_final_position = Vector3D(float(row[23]), float(row[24]), float(row[25]))
+                        simulation_data.aircraft_1_final_speed = Vector3D(float(row[32]), float(row[33]), float(row[34]))
+                        simulation_data.aircraft_2_final_speed = Vector3D(float(row[35]), float(row[36]), float(row[37]))
                         simulation_data.collision = row[44] == "True"
                         simulation_data.minimal_relative_distance = float(row[46])
                         if str(row[48]) == "nan":
                             simulation_data.miss_distance_at_closest_approach = None
                         else:
                             simulation_data.miss_distance_at_closest_approach = float(row[48])
+                        if len(row) == 52:
+                            simulation_data.minimal_relative_distance_time = float(row[50])
                     else:
-                        simulation_data.aircraft_1_final_position = QVector3D(float(row[26]), float(row[27]), float(row[28]))
-                        simulation_data.aircraft_2_final_position = QVector3D(float(row[29]), float(row[30]), float(row[31]))
-                        simulation_data.aircraft_1_final_speed = QVector3D(float(row[38]), float(row[39]), float(row[40]))
-                        simulation_data.aircraft_2_final_speed = QVector3D(float(row[41]), float(row[42]), float(row[43]))
+                        simulation_data.aircraft_1_final_position = Vector3D(float(row[26]), float(row[27]), float(row[28]))
+                        simulation_data.aircraft_2_final_position = Vector3D(float(row[29]), float(row[30]), float(row[31]))
+                        simulation_data.aircraft_1_final_speed = Vector3D(float(row[38]), float(row[39]), float(row[40]))
+                        simulation_data.aircraft_2_final_speed = Vector3D(float(row[41]), float(row[42]), float(row[43]))
                         simulation_data.collision = row[45] == "True"
                         simulation_data.minimal_relative_distance = float(row[47])
                         if str(row[49]) == "nan":
                             simulation_data.miss_distance_at_closest_approach = None
                         else:
                             simulation_data.miss_distance_at_closest_approach = float(row[49])
+                        if len(row) == 52:
+                            simulation_data.minimal_relative_distance_time = float(row[51])
                     self.import_simulation_data(simulation_data)
                     return True
         except:
@@ -875,103 +989,103 @@ class Simulation(QMainWindow):
             aircrafts : List[Aircraft] = [
                 Aircraft( # detection test
                     aircraft_id = 0,
-                    position = QVector3D(-800, 4000, 1000),
-                    speed = QVector3D(60, -60, 0),
-                    initial_target = QVector3D(51_900, -50_000, 10000)),
+                    position = Vector3D(-800, 4000, 1000),
+                    speed = Vector3D(60, -60, 0),
+                    initial_target = Vector3D(51_900, -50_000, 10000)),
                 Aircraft(
                     aircraft_id = 1,
-                    position = QVector3D(4000, 6000, 1000),
-                    speed = QVector3D(0, -85, 0),
-                    initial_target = QVector3D(900, -1_001_300, 1000)),
+                    position = Vector3D(4000, 6000, 1000),
+                    speed = Vector3D(0, -85, 0),
+                    initial_target = Vector3D(900, -1_001_300, 1000)),
             ]
         elif test_case == 1:
             aircrafts : List[Aircraft] = [
                 Aircraft( # almost head on
                     aircraft_id = 0,
-                    position = QVector3D(-3000, 500, 1000),
-                    speed = QVector3D(70, 0.1, 0)),
+                    position = Vector3D(-3000, 500, 1000),
+                    speed = Vector3D(70, 0.1, 0)),
                 Aircraft(
                     aircraft_id = 1,
-                    position = QVector3D(5000, 500, 1000),
-                    speed = QVector3D(-50, 0, 0)),
+                    position = Vector3D(5000, 500, 1000),
+                    speed = Vector3D(-50, 0, 0)),
             ]
         elif test_case == 2:
             aircrafts : List[Aircraft] = [
                 Aircraft( # avoidance test slow
                     aircraft_id = 0,
-                    position = QVector3D(0, 0, 1000),
-                    speed = QVector3D(30, -30, 0),
-                    initial_target = QVector3D(75000, -75000, 1000)), # 75 km, -75 km
+                    position = Vector3D(0, 0, 1000),
+                    speed = Vector3D(30, -30, 0),
+                    initial_target = Vector3D(75000, -75000, 1000)), # 75 km, -75 km
                 Aircraft(
                     aircraft_id = 1,
-                    position = QVector3D(0, -100_000, 1000),
-                    speed = QVector3D(30, 29, 0),
-                    initial_target = QVector3D(75000, -27500, 1000)), # 75 km, -27.5 km
+                    position = Vector3D(0, -100_000, 1000),
+                    speed = Vector3D(30, 29, 0),
+                    initial_target = Vector3D(75000, -27500, 1000)), # 75 km, -27.5 km
             ]
         elif test_case == 3:
             aircrafts : List[Aircraft] = [
                 Aircraft( # avoidance test
                     aircraft_id = 0,
-                    position = QVector3D(0, 0, 1000),
-                    speed = QVector3D(150, -150, 0),
-                    initial_target = QVector3D(75000, -75000, 1000)), # 75 km, -75 km
+                    position = Vector3D(0, 0, 1000),
+                    speed = Vector3D(150, -150, 0),
+                    initial_target = Vector3D(75000, -75000, 1000)), # 75 km, -75 km
                 Aircraft(
                     aircraft_id = 1,
-                    position = QVector3D(0, -100_000, 1000),
-                    speed = QVector3D(150, 145, 0),
-                    initial_target = QVector3D(75000, -27500, 1000)), # 75 km, -27.5 km
+                    position = Vector3D(0, -100_000, 1000),
+                    speed = Vector3D(150, 145, 0),
+                    initial_target = Vector3D(75000, -27500, 1000)), # 75 km, -27.5 km
             ]
         elif test_case == 4:
             aircrafts : List[Aircraft] = [
                 Aircraft( # avoidance test fast
                     aircraft_id = 0,
-                    position = QVector3D(0, 0, 1000),
-                    speed = QVector3D(300, -300, 0),
-                    initial_target = QVector3D(75000, -75000, 1000)), # 75 km, -75 km
+                    position = Vector3D(0, 0, 1000),
+                    speed = Vector3D(300, -300, 0),
+                    initial_target = Vector3D(75000, -75000, 1000)), # 75 km, -75 km
                 Aircraft(
                     aircraft_id = 1,
-                    position = QVector3D(0, -100_000, 1000),
-                    speed = QVector3D(300, 290, 0),
-                    initial_target = QVector3D(75000, -27500, 1000)), # 75 km, -27.5 km
+                    position = Vector3D(0, -100_000, 1000),
+                    speed = Vector3D(300, 290, 0),
+                    initial_target = Vector3D(75000, -27500, 1000)), # 75 km, -27.5 km
             ]
         elif test_case == 5:
             aircrafts : List[Aircraft] = [
                 Aircraft( # chase test
                     aircraft_id = 0,
-                    position = QVector3D(0, -1000, 1000),
-                    speed = QVector3D(0, 50, 0),
-                    initial_target = QVector3D(0, 0, 1000)), # 0 km, 0 km
+                    position = Vector3D(0, -1000, 1000),
+                    speed = Vector3D(0, 50, 0),
+                    initial_target = Vector3D(0, 0, 1000)), # 0 km, 0 km
                 Aircraft(
                     aircraft_id = 1,
-                    position = QVector3D(0, -2000, 1000),
-                    speed = QVector3D(0, 100, 0),
-                    initial_target = QVector3D(0, 0, 1000)), # 0 km, 0 km
+                    position = Vector3D(0, -2000, 1000),
+                    speed = Vector3D(0, 100, 0),
+                    initial_target = Vector3D(0, 0, 1000)), # 0 km, 0 km
             ]
         elif test_case == 6:
             aircrafts : List[Aircraft] = [
                 Aircraft( # full angle collision
                     aircraft_id = 0,
-                    position = QVector3D(0, -1000, 1000),
-                    speed = QVector3D(0, 50, 0),
-                    initial_target = QVector3D(0, 0, 1000)), # 0 km, 0 km
+                    position = Vector3D(0, -1000, 1000),
+                    speed = Vector3D(0, 50, 0),
+                    initial_target = Vector3D(0, 0, 1000)), # 0 km, 0 km
                 Aircraft(
                     aircraft_id = 1,
-                    position = QVector3D(0, 1000, 1000),
-                    speed = QVector3D(0, -50, 0),
-                    initial_target = QVector3D(0, 0, 1000)), # 0 km, 0 km
+                    position = Vector3D(0, 1000, 1000),
+                    speed = Vector3D(0, -50, 0),
+                    initial_target = Vector3D(0, 0, 1000)), # 0 km, 0 km
             ]
         elif test_case == 7:
             aircrafts : List[Aircraft] = [
                 Aircraft(
                     aircraft_id = 0,
-                    position = QVector3D(0, -5000, 1000),
-                    speed = QVector3D(0, 50, 0),
-                    initial_target = QVector3D(0, 0, 1000)),
+                    position = Vector3D(0, -5000, 1000),
+                    speed = Vector3D(0, 50, 0),
+                    initial_target = Vector3D(0, 0, 1000)),
                 Aircraft(
                     aircraft_id = 1,
-                    position = QVector3D(0, 5000, 1000),
-                    speed = QVector3D(0, -50, 0),
-                    initial_target = QVector3D(0, 0, 1000))
+                    position = Vector3D(0, 5000, 1000),
+                    speed = Vector3D(0, -50, 0),
+                    initial_target = Vector3D(0, 0, 1000))
             ]
         else:
             aircrafts : List[Aircraft] = []
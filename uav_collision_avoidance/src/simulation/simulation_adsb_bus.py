@@ -0,0 +1,162 @@
+"""Simulation ADS-B broadcast bus module"""
+
+from typing import Tuple
+
+import numpy as np
+
+from .simulation_settings import SimulationSettings
+from .simulation_spatial_hash import SimulationSpatialHash
+
+class SimulationADSBBus:
+    """Broadcast bus of ADS-B state messages, every aircraft publishes its state at its own period and every receiver within radio range
+    gets the message after latency into its ring buffer unless the message is dropped, the oldest messages of a full ring buffer are overwritten"""
+
+    message_dtype : np.dtype = np.dtype([
+        ("sender", np.int32),
+        ("time", np.float64), # ms
+        ("position", np.float64, 3),
+        ("speed", np.float32, 3)])
+
+    def __init__(
+            self,
+            count : int,
+            broadcast_period : float | np.ndarray | None = None,
+            latency : float = 0.0,
+            drop_probability : float = 0.0,
+            radio_range : float | None = None,
+            buffer_size : int | None = None,
+            seed : int | None = None) -> None:
+        broadcast_period = SimulationSettings.adsb_threshold if broadcast_period is None else broadcast_period
+        radio_range = SimulationSettings.adsb_radio_range if radio_range is None else radio_range
+        buffer_size = SimulationSettings.adsb_buffer_size if buffer_size is None else buffer_size
+        assert latency >= 0.0 and 0.0 <= drop_probability < 1.0
+        assert radio_range > 0.0 and buffer_size > 0
+        self.__count : int = count
+        self.__broadcast_period : np.ndarray = np.broadcast_to(np.asarray(broadcast_period, dtype = np.float64), (count,)).copy()
+        assert (self.__broadcast_period > 0.0).all()
+        self.__latency : float = latency
+        self.__drop_probability : float = drop_probability
+        self.__radio_range : float = radio_range
+        self.__generator : np.random.Generator = np.random.default_rng(seed)
+        self.__spatial_hash : SimulationSpatialHash = SimulationSpatialHash(radio_range)
+        self.__next_broadcast : np.ndarray = np.zeros(count) # ms
+        self.__messages : np.ndarray = np.zeros((count, buffer_size), dtype = self.message_dtype)
+        self.__delivery_time : np.ndarray = np.zeros((count, buffer_size)) # ms
+        self.__pending : np.ndarray = np.zeros((count, buffer_size), dtype = bool)
+        self.__head : np.ndarray = np.zeros(count, dtype = np.int64)
+        self.__sent : int = 0
+        self.__delivered : int = 0
+        self.__dropped : int = 0
+        self.__overwritten : int = 0
+
+    @property
+    def count(self) -> int:
+        """Returns count of aircrafts on the bus"""
+        return self.__count
+
+    @property
+    def broadcast_period(self) -> np.ndarray:
+        """Returns aircrafts broadcast periods in ms"""
+        return self.__broadcast_period
+
+    @property
+    def latency(self) -> float:
+        """Returns message delivery latency in ms"""
+        return self.__latency
+
+    @property
+    def drop_probability(self) -> float:
+        """Returns probability of a message not reaching a receiver in range"""
+        return self.__drop_probability
+
+    @property
+    def radio_range(self) -> float:
+        """Returns radio range in meters"""
+        return self.__radio_range
+
+    @property
+    def buffer_size(self) -> int:
+        """Returns receivers ring buffers size in messages"""
+        return self.__messages.shape[1]
+
+    @property
+    def sent(self) -> int:
+        """Returns count of broadcast messages"""
+        return self.__sent
+
+    @property
+    def delivered(self) -> int:
+        """Returns count of messages put into receivers ring buffers"""
+        return self.__delivered
+
+    @property
+    def dropped(self) -> int:
+        """Returns count of messages lost on the way to receivers in range"""
+        return self.__dropped
+
+    @property
+    def overwritten(self) -> int:
+        """Returns count of messages overwritten in full ring buffers before being received"""
+        return self.__overwritten
+
+    def broadcast(self, time : float, position : np.ndarray, speed : np.ndarray, active : np.ndarray | None = None, group : np.ndarray | None = None) -> None:
+        """Publishes states of active aircrafts due to broadcast at simulated time in ms to receivers of the same group within radio range"""
+        due = self.__next_broadcast <= time
+        if active is not None:
+            due &= active
+        if not due.any():
+            return
+        self.__next_broadcast[due] = time + self.broadcast_period[due]
+        self.__sent += int(due.sum())
+
+        # receivers in range are found among spatial hash neighbours, both directions of a pair may carry a message
+        self.__spatial_hash.update(position, group)
+        first, second = self.__spatial_hash.find_pairs()
+        listening = np.ones(self.count, dtype = bool) if active is None else active
+        sender = np.concatenate((first[due[first] & listening[second]], second[due[second] & listening[first]]))
+        receiver = np.concatenate((second[due[first] & listening[second]], first[due[second] & listening[first]]))
+        relative_position = position[sender] - position[receiver]
+        in_range = np.einsum("ij,ij->i", relative_position, relative_position) <= self.radio_range ** 2
+        sender, receiver = sender[in_range], receiver[in_range]
+        if self.drop_probability > 0.0:
+            kept = self.__generator.random(len(sender)) >= self.drop_probability
+            self.__dropped += int(len(kept) - kept.sum())
+            sender, receiver = sender[kept], receiver[kept]
+        if len(sender) == 0:
+            return
+
+        # consecutive ring buffer slots of every receiver
+        order = np.argsort(receiver, kind = "stable")
+        sender, receiver = sender[order], receiver[order]
+        receiver_start = np.flatnonzero(np.concatenate(([True], receiver[1:] != receiver[:-1])))
+        receiver_count = np.diff(np.append(receiver_start, len(receiver)))
+        rank = np.arange(len(receiver)) - np.repeat(receiver_start, receiver_count)
+        slot = (self.__head[receiver] + rank) % self.buffer_size
+        self.__head[receiver[receiver_start]] += receiver_count
+        # receivers getting more messages at once than their ring buffers hold keep the last ones
+        kept = rank >= np.repeat(receiver_count, receiver_count) - self.buffer_size
+        self.__overwritten += int(len(kept) - kept.sum())
+        sender, receiver, slot = sender[kept], receiver[kept], slot[kept]
+        self.__overwritten += int(self.__pending[receiver, slot].sum())
+        messages = self.__messages
+        messages["sender"][receiver, slot] = sender
+        messages["time"][receiver, slot] = time
+        messages["position"][receiver, slot] = position[sender]
+        messages["speed"][receiver, slot] = speed[sender]
+        self.__delivery_time[receiver, slot] = time + self.latency
+        self.__pending[receiver, slot] = True
+        self.__delivered += len(sender)
+
+    def receive(self, time : float) -> Tuple[np.ndarray, np.ndarray]:
+        """Takes messages delivered until simulated time in ms out of ring buffers, returns their receivers and messages ordered by receivers and broadcast times"""
+        receiver, slot = np.nonzero(self.__pending & (self.__delivery_time <= time))
+        self.__pending[receiver, slot] = False
+        messages = self.__messages[receiver, slot]
+        order = np.lexsort((messages["time"], receiver))
+        return receiver[order], messages[order]
+
+    def reset(self) -> None:
+        """Drops all pending messages and restarts broadcasting"""
+        self.__next_broadcast[:] = 0.0
+        self.__pending[:] = False
+        self.__head[:] = 0
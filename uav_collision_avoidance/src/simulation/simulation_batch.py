@@ -0,0 +1,398 @@
+"""Simulation batched encounters module"""
+
+import random
+import logging
+from time import perf_counter
+from copy import copy
+from typing import List, Tuple
+
+import numpy as np
+
+from ..aircraft.aircraft import Aircraft
+from ..aircraft.aircraft_fleet import AircraftFleet
+from ..engine.engine_adsb import EngineADSB
+from .simulation_fleet_physics import SimulationFleetPhysics
+from .simulation_settings import SimulationSettings
+from .simulation_state import SimulationState
+from .simulation_data import SimulationData
+from .simulation_vector import Vector3D
+from .simulation_adsb_bus import SimulationADSBBus
+from .simulation_tracker import SimulationTracker
+from .simulation_trajectory_predictor import SimulationTrajectoryPredictor
+
+class SimulationBatch:
+    """Lockstep engine advancing many independent two-aircraft encounters, one encounter per row"""
+
+    def __init__(self, encounters : List[Tuple[List[Aircraft], float]], simulation_state : SimulationState, simulation_time : int = 1_209_600_000, workers : int = 1, adsb_bus : SimulationADSBBus | None = None, tracker : SimulationTracker | None = None, adaptive_surveillance : bool = False, turn_prediction : bool = False, level_of_detail : bool = False) -> None:
+        self.__encounters = encounters
+        self.__simulation_state = simulation_state
+        self.__simulation_time : int = simulation_time
+        self.__count : int = len(encounters)
+        aircrafts : List[Aircraft] = []
+        for encounter_aircrafts, _ in encounters:
+            assert len(encounter_aircrafts) == 2
+            for aircraft in encounter_aircrafts:
+                aircraft.fcc.clear_destinations()
+                aircraft.fcc.load_initial_destination()
+            aircrafts.extend(encounter_aircrafts)
+        self.__fleet : AircraftFleet = AircraftFleet.from_aircrafts(aircrafts)
+        self.__fleet.group[:] = np.repeat(np.arange(self.__count), 2)
+        # aircrafts far from their partners fly kinematically with level of detail
+        level_of_detail_distance : float | None = SimulationSettings.level_of_detail_separation_margin * simulation_state.minimum_separation if level_of_detail else None
+        self.__physics : SimulationFleetPhysics = SimulationFleetPhysics(self.__fleet, simulation_state.g_acceleration, level_of_detail_distance = level_of_detail_distance, terrain = simulation_state.terrain, wind = simulation_state.wind, workers = workers)
+        self.__running : np.ndarray = np.ones(self.__count, dtype = bool)
+        self.__collision : np.ndarray = np.zeros(self.__count, dtype = bool)
+        self.__avoid_collisions : np.ndarray = np.full(self.__count, simulation_state.avoid_collisions, dtype = bool)
+        self.__minimal_relative_distance : np.ndarray = np.full(self.__count, np.inf)
+        self.__minimal_relative_distance_time : np.ndarray = np.full(self.__count, np.nan) # ms
+        self.__previous_relative_position : np.ndarray = np.full((self.__count, 3), np.nan)
+        self.__previous_time : np.ndarray = np.full(self.__count, np.nan) # ms
+        self.__miss_distance_at_closest_approach : np.ndarray = np.full(self.__count, np.nan)
+        self.__adsb_cycles : int = 0
+        self.__adsb_evaluations : int = 0
+        self.__evade_maneuvers : int = 0
+        self.__adaptive_surveillance : bool = adaptive_surveillance
+        self.__next_evaluation : np.ndarray = np.zeros(self.__count) # ms
+        self.__adsb_bus : SimulationADSBBus | None = adsb_bus
+        self.__tracker : SimulationTracker | None = tracker
+        assert adsb_bus is None or adsb_bus.count == self.__fleet.count
+        assert tracker is None or (adsb_bus is not None and tracker.count == self.__fleet.count)
+        self.__partner_time : np.ndarray = np.full(self.__fleet.count, np.nan) # ms
+        self.__partner_position : np.ndarray = np.full((self.__fleet.count, 3), np.nan)
+        self.__partner_speed : np.ndarray = np.full((self.__fleet.count, 3), np.nan)
+        # own trajectories take the first fleet count of rows, partners trajectories known by every fleet row the second one
+        self.__trajectory_predictor : SimulationTrajectoryPredictor | None = SimulationTrajectoryPredictor(2 * self.__fleet.count) if turn_prediction else None
+
+    @property
+    def encounters(self) -> List[Tuple[List[Aircraft], float]]:
+        """Returns encounters list"""
+        return self.__encounters
+
+    @property
+    def simulation_state(self) -> SimulationState:
+        """Returns simulation state"""
+        return self.__simulation_state
+
+    @property
+    def count(self) -> int:
+        """Returns encounters count"""
+        return self.__count
+
+    @property
+    def fleet(self) -> AircraftFleet:
+        """Returns fleet of all encounters' aircrafts, encounter i owns rows 2i and 2i + 1"""
+        return self.__fleet
+
+    @property
+    def physics(self) -> SimulationFleetPhysics:
+        """Returns fleet physics"""
+        return self.__physics
+
+    @property
+    def running(self) -> np.ndarray:
+        """Returns flags of encounters still being simulated"""
+        return self.__running
+
+    @property
+    def collision(self) -> np.ndarray:
+        """Returns encounters collision flags"""
+        return self.__collision
+
+    @property
+    def minimal_relative_distance(self) -> np.ndarray:
+        """Returns encounters minimal relative distances"""
+        return self.__minimal_relative_distance
+
+    @property
+    def minimal_relative_distance_time(self) -> np.ndarray:
+        """Returns simulated times in ms of encounters minimal relative distances, of collisions for collided encounters"""
+        return self.__minimal_relative_distance_time
+
+    @property
+    def miss_distance_at_closest_approach(self) -> np.ndarray:
+        """Returns encounters miss distances at closest approach"""
+        return self.__miss_distance_at_closest_approach
+
+    @property
+    def adsb_cycles(self) -> int:
+        """Returns ADS-B cycles count"""
+        return self.__adsb_cycles
+
+    @property
+    def adsb_evaluations(self) -> int:
+        """Returns count of encounters evaluations by ADS-B cycles"""
+        return self.__adsb_evaluations
+
+    @property
+    def evade_maneuvers(self) -> int:
+        """Returns count of applied evade maneuvers"""
+        return self.__evade_maneuvers
+
+    @property
+    def adaptive_surveillance(self) -> bool:
+        """Returns flag of evaluating encounters at intervals set by their threat instead of every ADS-B period"""
+        return self.__adaptive_surveillance
+
+    @property
+    def next_evaluation(self) -> np.ndarray:
+        """Returns simulated times in ms of encounters next evaluations with adaptive surveillance"""
+        return self.__next_evaluation
+
+    @property
+    def adsb_bus(self) -> SimulationADSBBus | None:
+        """Returns ADS-B broadcast bus, none when aircrafts read each other's true state"""
+        return self.__adsb_bus
+
+    @property
+    def tracker(self) -> SimulationTracker | None:
+        """Returns tracker filtering received ADS-B messages, none when partners are dead reckoned from the latest messages"""
+        return self.__tracker
+
+    @property
+    def trajectory_predictor(self) -> SimulationTrajectoryPredictor | None:
+        """Returns trajectory predictor of turning aircrafts, none when conflicts are predicted along straight lines"""
+        return self.__trajectory_predictor
+
+    @property
+    def relative_position(self) -> np.ndarray:
+        """Returns relative positions of encounters' aircrafts"""
+        position = self.fleet.position.reshape(self.count, 2, 3)
+        return position[:, 0] - position[:, 1]
+
+    @property
+    def relative_distance(self) -> np.ndarray:
+        """Returns relative distances of encounters' aircrafts"""
+        return np.linalg.norm(self.relative_position, axis = 1)
+
+    def run(self) -> List[SimulationData]:
+        """Runs all encounters until each of them stops, returns their simulation data"""
+        logging.info("Starting batched simulation of %d encounters", self.count)
+        start_timestamp : float = perf_counter()
+        state = self.simulation_state
+        minimum_separation : float = state.minimum_separation
+        time_step : int = int(state.simulation_threshold)
+        adsb_step : int = int(state.adsb_threshold)
+        partial_time_counter : int = adsb_step
+        for _ in range(0, int(self.__simulation_time / state.simulation_threshold), time_step):
+            self.fleet.active[:] = np.repeat(self.running, 2)
+            if self.physics.cycle(time_step):
+                collided = self.running & ~self.__collision & self.fleet.collided.reshape(self.count, 2).any(axis = 1)
+                self.__minimal_relative_distance_time[collided] = np.nanmin(self.physics.collision_time.reshape(self.count, 2)[collided], axis = 1)
+                self.__collision |= collided
+            if self.adsb_bus is not None:
+                self.adsb_bus.broadcast(self.physics.simulated_time, self.fleet.position, self.fleet.ground_speed, self.fleet.active & ~self.fleet.collided, self.fleet.group)
+            if self.adaptive_surveillance:
+                due = self.running & (self.next_evaluation <= self.physics.simulated_time)
+                if due.any():
+                    self.adsb_cycle(due)
+            elif partial_time_counter >= adsb_step:
+                self.adsb_cycle()
+                partial_time_counter = 0
+            partial_time_counter += time_step
+            stopping = (self.relative_distance > minimum_separation * 2) & (self.minimal_relative_distance < minimum_separation)
+            stopping |= ~self.fleet.has_destination.reshape(self.count, 2).any(axis = 1)
+            stopping |= self.collision
+            self.running[:] &= ~stopping
+            if not self.running.any():
+                break
+        logging.info("Batched simulation finished after %d physics cycles in %ss", self.physics.cycles, "{:.2f}".format(perf_counter() - start_timestamp))
+        return self.export_simulation_data()
+
+    def find_partner_states(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns positions and speeds over the ground of encounter partners as known by every fleet row, true states without ADS-B bus,
+        otherwise predicted by partners tracks or dead reckoned from the latest received messages without tracker, unknown before the first message"""
+        fleet = self.fleet
+        partner = np.arange(fleet.count) ^ 1
+        if self.adsb_bus is None:
+            return fleet.position[partner], fleet.ground_speed[partner]
+        time : float = self.physics.simulated_time
+        receiver, messages = self.adsb_bus.receive(time)
+        if self.tracker is not None:
+            from_partner = messages["sender"] == partner[receiver]
+            self.tracker.update(receiver[from_partner], messages["sender"][from_partner], messages["time"][from_partner], messages["position"][from_partner], messages["speed"][from_partner])
+            track = self.tracker.find_tracks(np.arange(fleet.count), partner)
+            tracked = track >= 0
+            partner_position = np.full((fleet.count, 3), np.nan)
+            partner_speed = np.full((fleet.count, 3), np.nan)
+            partner_position[tracked], partner_speed[tracked] = self.tracker.predict(time, track[tracked])
+            return partner_position, partner_speed
+        latest = np.flatnonzero(np.append(receiver[1:] != receiver[:-1], True)) if len(receiver) > 0 else receiver
+        latest = latest[messages["sender"][latest] == partner[receiver[latest]]]
+        self.__partner_time[receiver[latest]] = messages["time"][latest]
+        self.__partner_position[receiver[latest]] = messages["position"][latest]
+        self.__partner_speed[receiver[latest]] = messages["speed"][latest]
+        return self.__partner_position + self.__partner_speed * ((time - self.__partner_time) / 1000.0)[:, np.newaxis], self.__partner_speed
+
+    @staticmethod
+    def find_surveillance_interval(
+            relative_position : np.ndarray,
+            speed_difference : np.ndarray,
+            closing_speed : np.ndarray,
+            minimum_separation : float,
+            time_step : float,
+            adsb_step : float,
+            max_interval : float = SimulationSettings.adsb_max_interval,
+            threat_margin : float = SimulationSettings.surveillance_threat_margin) -> np.ndarray:
+        """Finds intervals in ms until the next evaluations of relative positions and speeds of shape (n, 3), every time step for conflicts inside minimum separation,
+        otherwise the time the pair needs to reach threat margin of minimum separations at its highest closing speed, shortened to half of the time to a closest approach
+        inside minimum separation, never shorter than ADS-B step nor longer than max interval, pairs with unknown partners are evaluated every ADS-B step"""
+        distance = np.linalg.norm(relative_position, axis = 1)
+        interval = (distance - threat_margin * minimum_separation) / np.where(closing_speed > 0.0, closing_speed, np.nan) * 1000.0
+        interval = np.where(np.isnan(interval) & (closing_speed <= 0.0), max_interval, interval)
+        speed_difference_squared = np.einsum("ij,ij->i", speed_difference, speed_difference)
+        time_to_closest_approach = -np.einsum("ij,ij->i", relative_position, speed_difference) / np.where(speed_difference_squared > 0.0, speed_difference_squared, np.inf)
+        miss_distance = np.linalg.norm(relative_position + speed_difference * np.maximum(time_to_closest_approach, 0.0)[:, np.newaxis], axis = 1)
+        conflicting = (time_to_closest_approach > 0.0) & (miss_distance < minimum_separation)
+        interval = np.where(conflicting, np.fmin(interval, time_to_closest_approach * 500.0), interval)
+        interval = np.minimum(np.maximum(np.floor(interval / time_step) * time_step, adsb_step), max_interval)
+        interval = np.where(conflicting & (distance < minimum_separation), time_step, interval)
+        return np.where(np.isnan(distance), adsb_step, interval)
+
+    def adsb_cycle(self, encounters : np.ndarray | None = None) -> None:
+        """Executes ADS-B cycle for the given encounters which are running, all running by default, every aircraft judges the conflict from its own state and its partner's known state"""
+        self.__adsb_cycles += 1
+        fleet = self.fleet
+        running = self.running if encounters is None else self.running & encounters
+        self.__adsb_evaluations += int(running.sum())
+        minimum_separation : float = self.simulation_state.minimum_separation
+        self.update_minimal_relative_distance(running)
+
+        # relative states of the first aircraft to the second one as seen by both of them
+        own_position = fleet.position.reshape(self.count, 2, 3)
+        own_speed = fleet.ground_speed.reshape(self.count, 2, 3) # ADS-B broadcasts speeds over the ground
+        partner_position, partner_speed = (state.reshape(self.count, 2, 3) for state in self.find_partner_states())
+        relative_position = np.stack((own_position[:, 0] - partner_position[:, 0], partner_position[:, 1] - own_position[:, 1]), axis = 1)
+        speed_difference = np.stack((own_speed[:, 0] - partner_speed[:, 0], partner_speed[:, 1] - own_speed[:, 1]), axis = 1)
+        speed_difference_squared = np.einsum("ijk,ijk->ij", speed_difference, speed_difference)
+        time_to_closest_approach = -np.einsum("ijk,ijk->ij", relative_position, speed_difference) / np.where(speed_difference_squared > 0.0, speed_difference_squared, np.inf)
+        relative_distance = np.linalg.norm(relative_position, axis = 2)
+        if self.trajectory_predictor is not None:
+            predicted_time_to_closest_approach, predicted_miss_distance_vector = self.find_turning_closest_approaches(running, partner_position.reshape(-1, 3), partner_speed.reshape(-1, 3))
+        if self.adaptive_surveillance:
+            closing_speed = np.linalg.norm(own_speed, axis = 2) + np.linalg.norm(partner_speed, axis = 2)
+            interval = self.find_surveillance_interval(relative_position.reshape(-1, 3), speed_difference.reshape(-1, 3), closing_speed.ravel(), minimum_separation, self.simulation_state.simulation_threshold, self.simulation_state.adsb_threshold)
+            self.__next_evaluation[running] = self.physics.simulated_time + interval.reshape(self.count, 2).min(axis = 1)[running]
+
+        # safe zone occupancy check
+        safe_zone_occupied = fleet.safe_zone_occupied.reshape(self.count, 2)
+        inside = relative_distance < minimum_separation
+        if not self.simulation_state.override_avoid_collisions:
+            self.__avoid_collisions |= running & (inside & ~safe_zone_occupied).any(axis = 1)
+        self.__avoid_collisions &= ~(running & (~inside & safe_zone_occupied).any(axis = 1))
+        safe_zone_occupied[running] = inside[running]
+
+        closing = running[:, np.newaxis] & (time_to_closest_approach > 0.0)
+        evade_maneuver = fleet.evade_maneuver.reshape(self.count, 2)
+        resetting = ~closing & running[:, np.newaxis]
+        evade_maneuver[resetting] &= safe_zone_occupied[resetting]
+        if not closing.any():
+            return
+
+        # miss distance at closest approach
+        speed_difference_unit = speed_difference / np.sqrt(np.where(speed_difference_squared > 0.0, speed_difference_squared, 1.0))[..., np.newaxis]
+        miss_distance_vector = np.cross(speed_difference_unit, np.cross(relative_position, speed_difference_unit))
+        miss_distance = np.linalg.norm(miss_distance_vector, axis = 2)
+
+        # resolve conflict condition
+        unresolved_region = minimum_separation - miss_distance
+        conflict = closing & (unresolved_region > 0.0) & self.__avoid_collisions[:, np.newaxis] & inside
+        if self.trajectory_predictor is not None:
+            # conflicts which ongoing turns resolve are cleared, the rest is resolved the way straight flight has it
+            conflict &= (predicted_time_to_closest_approach > 0.0) & (np.linalg.norm(predicted_miss_distance_vector, axis = 2) < minimum_separation)
+        evading = conflict & ~evade_maneuver
+        if evading.any():
+            self.__miss_distance_at_closest_approach = np.where(evading.any(axis = 1), np.where(evading[:, 0], miss_distance[:, 0], miss_distance[:, 1]), self.__miss_distance_at_closest_approach)
+            opponent_speed = fleet.speed[np.arange(fleet.count) ^ 1] if self.adsb_bus is None else partner_speed.reshape(-1, 3)
+            self.apply_evade_maneuvers(np.flatnonzero(evading.ravel()), miss_distance_vector.reshape(-1, 3), unresolved_region.ravel(), time_to_closest_approach.ravel(), opponent_speed)
+
+    def find_turning_closest_approaches(self, encounters : np.ndarray, partner_position : np.ndarray, partner_speed : np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds times to closest approach and miss distance vectors of shapes (count, 2) and (count, 2, 3) of the given encounters as seen by both of their aircrafts,
+        predicting every aircraft's own turn and its partner's turn, true without ADS-B bus, tracked with tracker, otherwise straight flight"""
+        fleet = self.fleet
+        predictor = self.trajectory_predictor
+        rows = np.flatnonzero(np.repeat(encounters, 2))
+        partner = rows ^ 1
+        turn_rate = predictor.find_turn_rate(fleet.roll_angle, fleet.horizontal_speed, self.simulation_state.g_acceleration)
+        turn_duration = predictor.find_turn_duration(fleet.yaw_angle, fleet.target_yaw_angle, turn_rate)
+        # evasive turns are held straight, otherwise they would clear the conflicts they resolve before these are over
+        turn_duration[fleet.evade_maneuver] = 0.0
+        if self.adsb_bus is None:
+            partner_turn_rate, partner_turn_duration = turn_rate[partner], turn_duration[partner]
+        elif self.tracker is not None:
+            track = self.tracker.find_tracks(rows, partner)
+            partner_turn_rate = np.where(track >= 0, self.tracker.state[track, 6] if self.tracker.tracks > 0 else 0.0, 0.0)
+            partner_turn_duration = np.full(len(rows), np.inf)
+        else:
+            partner_turn_rate, partner_turn_duration = np.zeros(len(rows)), np.zeros(len(rows))
+        own_trajectory = predictor.predict(fleet.position[rows], fleet.ground_speed[rows], turn_rate[rows], turn_duration[rows], rows)
+        partner_trajectory = predictor.predict(partner_position[rows], partner_speed[rows], partner_turn_rate, partner_turn_duration, rows + fleet.count)
+        # relative trajectories of the first aircraft to the second one
+        relative_trajectory = (own_trajectory - partner_trajectory) * np.where(rows % 2 == 0, 1.0, -1.0)[:, np.newaxis, np.newaxis]
+        time_to_closest_approach = np.zeros(fleet.count)
+        miss_distance_vector = np.full((fleet.count, 3), np.nan)
+        time_to_closest_approach[rows], miss_distance_vector[rows] = predictor.find_closest_approach(relative_trajectory)
+        return time_to_closest_approach.reshape(self.count, 2), miss_distance_vector.reshape(self.count, 2, 3)
+
+    def update_minimal_relative_distance(self, encounters : np.ndarray) -> None:
+        """Updates minimal relative distances of the given encounters with the closest points of relative positions
+        linearly interpolated between their previous and current samples"""
+        time : float = self.physics.simulated_time
+        relative_position = self.relative_position
+        previous_relative_position = self.__previous_relative_position
+        fraction, closest_relative_position = EngineADSB.find_closest_approach(previous_relative_position, relative_position - previous_relative_position, 1.0)
+        sampled = ~np.isnan(self.__previous_time)
+        distance = np.where(sampled, np.linalg.norm(closest_relative_position, axis = 1), np.linalg.norm(relative_position, axis = 1))
+        distance_time = np.where(sampled, self.__previous_time + (time - self.__previous_time) * fraction, time)
+        improved = encounters & (distance < self.__minimal_relative_distance)
+        self.__minimal_relative_distance[improved] = distance[improved]
+        self.__minimal_relative_distance_time[improved & ~self.__collision] = distance_time[improved & ~self.__collision]
+        previous_relative_position[encounters] = relative_position[encounters]
+        self.__previous_time[encounters] = time
+
+    def apply_evade_maneuvers(self, indices : np.ndarray, miss_distance_vector : np.ndarray, unresolved_region : np.ndarray, time_to_closest_approach : np.ndarray, opponent_speed : np.ndarray) -> None:
+        """Applies evade maneuvers for the given fleet rows from conflicts as seen by every row the same way flight control computer does"""
+        fleet = self.fleet
+        self.__evade_maneuvers += len(indices)
+        for index in indices:
+            encounter : int = index // 2
+            logging.info("Encounter %d aircraft %s applying evade maneuver", encounter, fleet.aircraft_ids[index])
+            fleet.evade_maneuver[index] = True
+            own_speed = fleet.speed[index]
+            miss_vector = miss_distance_vector[index]
+            if not miss_vector.any():
+                miss_vector = np.array([
+                    random.choice([-1, 1]) * fleet.size[index] * 0.1,
+                    random.choice([-1, 1]) * fleet.size[index] * 0.1,
+                    0.0])
+            direction : float = -1.0 if fleet.aircraft_ids[index] == 0 else 1.0
+            opponent_absolute_speed = np.linalg.norm(opponent_speed[index])
+            vector_sharing_resolution = (opponent_absolute_speed * unresolved_region[index] * direction * miss_vector) / ((np.linalg.norm(own_speed) + opponent_absolute_speed) * np.linalg.norm(miss_vector))
+            target_avoiding = fleet.position[index] + own_speed * time_to_closest_approach[index] + vector_sharing_resolution
+            fleet.add_first_destination(index, target_avoiding)
+
+    def export_simulation_data(self) -> List[SimulationData]:
+        """Returns simulation data of every encounter"""
+        fleet = self.fleet
+        minimal_relative_distance = self.minimal_relative_distance
+        simulation_data_list : List[SimulationData] = []
+        for i, (aircrafts, angle) in enumerate(self.encounters):
+            simulation_data : SimulationData = SimulationData()
+            simulation_data.aircraft_angle = angle
+            simulation_data.aircraft_1_initial_position = copy(aircrafts[0].initial_position)
+            simulation_data.aircraft_2_initial_position = copy(aircrafts[1].initial_position)
+            simulation_data.aircraft_1_initial_speed = copy(aircrafts[0].initial_speed)
+            simulation_data.aircraft_2_initial_speed = copy(aircrafts[1].initial_speed)
+            simulation_data.aircraft_1_initial_target = copy(aircrafts[0].initial_target)
+            simulation_data.aircraft_2_initial_target = copy(aircrafts[1].initial_target)
+            simulation_data.aircraft_1_initial_roll_angle = copy(aircrafts[0].initial_roll_angle)
+            simulation_data.aircraft_2_initial_roll_angle = copy(aircrafts[1].initial_roll_angle)
+            simulation_data.aircraft_1_final_position = Vector3D(*fleet.position[2 * i])
+            simulation_data.aircraft_2_final_position = Vector3D(*fleet.position[2 * i + 1])
+            simulation_data.aircraft_1_final_speed = Vector3D(*fleet.speed[2 * i])
+            simulation_data.aircraft_2_final_speed = Vector3D(*fleet.speed[2 * i + 1])
+            simulation_data.collision = bool(self.collision[i])
+            simulation_data.minimal_relative_distance = float(minimal_relative_distance[i])
+            simulation_data.minimal_relative_distance_time = float(self.minimal_relative_distance_time[i])
+            simulation_data.miss_distance_at_closest_approach = float(self.miss_distance_at_closest_approach[i])
+            simulation_data_list.append(simulation_data)
+        return simulation_data_list
@@ -1,28 +1,27 @@
 """Simulation data module"""
 
-from PySide6.QtCore import QObject
-from PySide6.QtGui import QVector3D
+from .simulation_vector import Vector3D
 
-class SimulationData(QObject):
+class SimulationData:
     """Simulation data class"""
 
     def __init__(self) -> None:
-        super().__init__()
         self.__aircraft_angle : float = 0.0
-        self.__aircraft_1_initial_position : QVector3D = QVector3D(0, 0, 0)
-        self.__aircraft_2_initial_position : QVector3D = QVector3D(0, 0, 0)
-        self.__aircraft_1_final_position : QVector3D = QVector3D(0, 0, 0)
-        self.__aircraft_2_final_position : QVector3D = QVector3D(0, 0, 0)
-        self.__aircraft_1_initial_speed : QVector3D = QVector3D(0, 0, 0)
-        self.__aircraft_2_initial_speed : QVector3D = QVector3D(0, 0, 0)
-        self.__aircraft_1_final_speed : QVector3D = QVector3D(0, 0, 0)
-        self.__aircraft_2_final_speed : QVector3D = QVector3D(0, 0, 0)
-        self.__aircraft_1_initial_target : QVector3D = QVector3D(0, 0, 0)
-        self.__aircraft_2_initial_target : QVector3D = QVector3D(0, 0, 0)
+        self.__aircraft_1_initial_position : Vector3D = Vector3D(0, 0, 0)
+        self.__aircraft_2_initial_position : Vector3D = Vector3D(0, 0, 0)
+        self.__aircraft_1_final_position : Vector3D = Vector3D(0, 0, 0)
+        self.__aircraft_2_final_position : Vector3D = Vector3D(0, 0, 0)
+        self.__aircraft_1_initial_speed : Vector3D = Vector3D(0, 0, 0)
+        self.__aircraft_2_initial_speed : Vector3D = Vector3D(0, 0, 0)
+        self.__aircraft_1_final_speed : Vector3D = Vector3D(0, 0, 0)
+        self.__aircraft_2_final_speed : Vector3D = Vector3D(0, 0, 0)
+        self.__aircraft_1_initial_target : Vector3D = Vector3D(0, 0, 0)
+        self.__aircraft_2_initial_target : Vector3D = Vector3D(0, 0, 0)
         self.__aircraft_1_initial_roll_angle : float = 0.0
         self.__aircraft_2_initial_roll_angle : float = 0.0
         self.__collision : bool | None = None
         self.__minimal_relative_distance : float | None = None
+        self.__minimal_relative_distance_time : float | None = None
         self.__miss_distance_at_closest_approach : float | None = None
 
     @property
@@ -36,102 +35,102 @@ class SimulationData(QObject):
         self.__aircraft_angle = angle
 
     @property
-    def aircraft_1_initial_position(self) -> QVector3D:
+    def aircraft_1_initial_position(self) -> Vector3D:
         """Returns aircraft 1 initial position"""
         return self.__aircraft_1_initial_position
     
     @aircraft_1_initial_position.setter
-    def aircraft_1_initial_position(self, position : QVector3D) -> None:
+    def aircraft_1_initial_position(self, position : Vector3D) -> None:
         """Sets aircraft 1 initial position"""
         self.__aircraft_1_initial_position = position
 
     @property
-    def aircraft_2_initial_position(self) -> QVector3D:
+    def aircraft_2_initial_position(self) -> Vector3D:
         """Returns aircraft 2 initial position"""
         return self.__aircraft_2_initial_position
     
     @aircraft_2_initial_position.setter
-    def aircraft_2_initial_position(self, position : QVector3D) -> None:
+    def aircraft_2_initial_position(self, position : Vector3D) -> None:
         """Sets aircraft 2 initial position"""
         self.__aircraft_2_initial_position = position
 
     @property
-    def aircraft_1_final_position(self) -> QVector3D:
+    def aircraft_1_final_position(self) -> Vector3D:
         """Returns aircraft 1 final position"""
         return self.__aircraft_1_final_position
     
     @aircraft_1_final_position.setter
-    def aircraft_1_final_position(self, position : QVector3D) -> None:
+    def aircraft_1_final_position(self, position : Vector3D) -> None:
         """Sets aircraft 1 final position"""
         self.__aircraft_1_final_position = position
 
     @property
-    def aircraft_2_final_position(self) -> QVector3D:
+    def aircraft_2_final_position(self) -> Vector3D:
         """Returns aircraft 2 final position"""
         return self.__aircraft_2_final_position
     
     @aircraft_2_final_position.setter
-    def aircraft_2_final_position(self, position : QVector3D) -> None:
+    def aircraft_2_final_position(self, position : Vector3D) -> None:
         """Sets aircraft 2 final position"""
         self.__aircraft_2_final_position = position
 
     @property
-    def aircraft_1_initial_speed(self) -> QVector3D:
+    def aircraft_1_initial_speed(self) -> Vector3D:
         """Returns aircraft 1 initial speed"""
         return self.__aircraft_1_initial_speed
     
     @aircraft_1_initial_speed.setter
-    def aircraft_1_initial_speed(self, speed : QVector3D) -> None:
+    def aircraft_1_initial_speed(self, speed : Vector3D) -> None:
         """Sets aircraft 1 initial speed"""
         self.__aircraft_1_initial_speed = speed
 
     @property
-    def aircraft_2_initial_speed(self) -> QVector3D:
+    def aircraft_2_initial_speed(self) -> Vector3D:
         """Returns aircraft 2 initial speed"""
         return self.__aircraft_2_initial_speed
     
     @aircraft_2_initial_speed.setter
-    def aircraft_2_initial_speed(self, speed : QVector3D) -> None:
+    def aircraft_2_initial_speed(self, speed : Vector3D) -> None:
         """Sets aircraft 2 initial speed"""
         self.__aircraft_2_initial_speed = speed
 
     @property
-    def aircraft_1_final_speed(self) -> QVector3D:
+    def aircraft_1_final_speed(self) -> Vector3D:
         """Returns aircraft 1 final speed"""
         return self.__aircraft_1_final_speed
     
     @aircraft_1_final_speed.setter
-    def aircraft_1_final_speed(self, speed : QVector3D) -> None:
+    def aircraft_1_final_speed(self, speed : Vector3D) -> None:
         """Sets aircraft 1 final speed"""
         self.__aircraft_1_final_speed = speed
 
     @property
-    def aircraft_2_final_speed(self) -> QVector3D:
+    def aircraft_2_final_speed(self) -> Vector3D:
         """Returns aircraft 2 final speed"""
         return self.__aircraft_2_final_speed
     
     @aircraft_2_final_speed.setter
-    def aircraft_2_final_speed(self, speed : QVector3D) -> None:
+    def aircraft_2_final_speed(self, speed : Vector3D) -> None:
         """Sets aircraft 2 final speed"""
         self.__aircraft_2_final_speed = speed
 
     @property
-    def aircraft_1_initial_target(self) -> QVector3D:
+    def aircraft_1_initial_target(self) -> Vector3D:
         """Returns aircraft 1 initial target"""
         return self.__aircraft_1_initial_target
     
     @aircraft_1_initial_target.setter
-    def aircraft_1_initial_target(self, target : QVector3D) -> None:
+    def aircraft_1_initial_target(self, target : Vector3D) -> None:
         """Sets aircraft 1 initial target"""
         self.__aircraft_1_initial_target = target
 
     @property
-    def aircraft_2_initial_target(self) -> QVector3D:
+    def aircraft_2_initial_target(self) -> Vector3D:
         """Returns aircraft 2 initial target"""
         return self.__aircraft_2_initial_target
     
     @aircraft_2_initial_target.setter
-    def aircraft_2_initial_target(self, target : QVector3D) -> None:
+    def aircraft_2_initial_target(self, target : Vector3D) -> None:
         """Sets aircraft 2 initial target"""
         self.__aircraft_2_initial_target = target
 
@@ -175,6 +174,16 @@ class SimulationData(QObject):
         """Sets minimal miss distance"""
         self.__minimal_relative_distance = distance
         
+    @property
+    def minimal_relative_distance_time(self) -> float | None:
+        """Returns simulated time in ms of minimal miss distance"""
+        return self.__minimal_relative_distance_time
+    
+    @minimal_relative_distance_time.setter
+    def minimal_relative_distance_time(self, time : float) -> None:
+        """Sets simulated time in ms of minimal miss distance"""
+        self.__minimal_relative_distance_time = time
+        
     @property
     def miss_distance_at_closest_approach(self) -> float | None:
         """Returns miss distance at closest approach"""
@@ -187,11 +196,12 @@ class SimulationData(QObject):
 
     def reset(self) -> None:
         """Resets simulation data"""
-        self.__aircraft_1_initial_position = QVector3D(0, 0, 0)
-        self.__aircraft_2_initial_position = QVector3D(0, 0, 0)
-        self.__aircraft_1_final_position = QVector3D(0, 0, 0)
-        self.__aircraft_2_final_position = QVector3D(0, 0, 0)
+        self.__aircraft_1_initial_position = Vector3D(0, 0, 0)
+        self.__aircraft_2_initial_position = Vector3D(0, 0, 0)
+        self.__aircraft_1_final_position = Vector3D(0, 0, 0)
+        self.__aircraft_2_final_position = Vector3D(0, 0, 0)
         self.__aircraft_1_initial_roll_angle = 0.0
         self.__aircraft_2_initial_roll_angle = 0.0
         self.__collision = False
         self.__minimal_relative_distance = 0.0
+        self.__minimal_relative_distance_time = 0.0
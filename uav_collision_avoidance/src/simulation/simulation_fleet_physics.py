@@ -0,0 +1,461 @@
+"""Simulation vectorized fleet physics module"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Tuple
+
+import numpy as np
+
+from ..aircraft.aircraft_fleet import AircraftFleet
+from .simulation_settings import SimulationSettings
+from .simulation_terrain import SimulationTerrain
+from .simulation_wind import SimulationWind
+
+class SimulationFleetPhysics:
+    """Vectorized physics advancing every aircraft of the fleet in a single step"""
+
+    def __init__(self, fleet : AircraftFleet, g_acceleration : float = SimulationSettings.g_acceleration, level_of_detail_distance : float | None = None, terrain : SimulationTerrain | None = None, wind : SimulationWind | None = None, simulated_time : float = 0.0, workers : int = 1, chunk_size : int = SimulationSettings.fleet_chunk_size) -> None:
+        assert workers > 0 and chunk_size > 0
+        self.__fleet = fleet
+        self.__g_acceleration : float = g_acceleration
+        self.__level_of_detail_distance : float | None = level_of_detail_distance
+        self.__terrain : SimulationTerrain | None = terrain
+        self.__wind : SimulationWind | None = wind
+        self.__turn_angle : np.ndarray = np.zeros(fleet.count) # rad
+        self.__wake_time : np.ndarray = np.zeros(fleet.count) # ms
+        self.__simulated_time : float = simulated_time # ms
+        self.__collision_time : np.ndarray = np.full(fleet.count, np.nan) # ms
+        self.__next_active_set_update : float = simulated_time # ms
+        self.__next_guidance_update : float = simulated_time # ms
+        self.__cycles : int = 0
+        self.__workers : int = workers
+        self.__chunk_size : int = chunk_size
+        self.__executor : ThreadPoolExecutor | None = ThreadPoolExecutor(max_workers = workers, thread_name_prefix = "fleet-physics") if workers > 1 else None
+
+    @property
+    def fleet(self) -> AircraftFleet:
+        """Returns aircraft fleet"""
+        return self.__fleet
+
+    @property
+    def g_acceleration(self) -> float:
+        """Returns acceleration due to gravity"""
+        return self.__g_acceleration
+
+    @property
+    def level_of_detail_distance(self) -> float | None:
+        """Returns distance to the nearest aircraft below which aircrafts are always simulated in full detail, none when level of detail is disabled"""
+        return self.__level_of_detail_distance
+
+    @property
+    def terrain(self) -> SimulationTerrain | None:
+        """Returns terrain elevation model, none for flat ground at sea level"""
+        return self.__terrain
+
+    @property
+    def wind(self) -> SimulationWind | None:
+        """Returns wind field, none for still air"""
+        return self.__wind
+
+    @property
+    def workers(self) -> int:
+        """Returns count of threads stepping chunks of the fleet"""
+        return self.__workers
+
+    @property
+    def chunk_size(self) -> int:
+        """Returns the smallest count of aircrafts stepped by a single thread"""
+        return self.__chunk_size
+
+    @property
+    def turn_angle(self) -> np.ndarray:
+        """Returns aircrafts heading changes in radians during the last cycle"""
+        return self.__turn_angle
+
+    @property
+    def wake_time(self) -> np.ndarray:
+        """Returns simulated times in ms at which dormant aircrafts have to be simulated in full detail again"""
+        return self.__wake_time
+
+    @property
+    def simulated_time(self) -> float:
+        """Returns simulated time in ms"""
+        return self.__simulated_time
+
+    @property
+    def collision_time(self) -> np.ndarray:
+        """Returns simulated times in ms of aircrafts first contacts of their collisions, not a number without collision"""
+        return self.__collision_time
+
+    @property
+    def cycles(self) -> int:
+        """Returns physics cycles count"""
+        return self.__cycles
+
+    @property
+    def awake_rows(self) -> np.ndarray:
+        """Returns rows of aircrafts simulated in full detail"""
+        fleet = self.fleet
+        return np.flatnonzero(fleet.active & ~fleet.collided & ~fleet.dormant)
+
+    def cycle(self, elapsed_time : float) -> bool:
+        """Executes physics simulation cycle, returns true on any new collision"""
+        self.__cycles += 1
+        if self.level_of_detail_distance is not None:
+            self.update_active_set()
+        rows = self.awake_rows
+        guidance : bool = self.simulated_time >= self.__next_guidance_update
+        if guidance:
+            # flight control computers targets are held between guidance updates
+            self.__next_guidance_update = self.simulated_time + SimulationSettings.guidance_threshold
+        self.turn_angle[self.turn_angle != 0.0] = 0.0
+
+        def integrate(chunk : slice) -> None:
+            if guidance:
+                self.update_fccs(rows[chunk])
+            self.update_aircrafts_speed_angles(elapsed_time, rows[chunk])
+
+        self.map_chunks(integrate, len(rows))
+        self.update_aircrafts_wind()
+        collision : bool = self.update_aircrafts_position(elapsed_time, rows)
+        self.__simulated_time += elapsed_time
+        return collision
+
+    def map_chunks(self, function : Callable[[slice], None], count : int) -> None:
+        """Calls function with contiguous chunks of count rows on the thread pool and waits for all of them, or with all rows at once below two chunks"""
+        chunks : int = min(self.workers, count // self.chunk_size)
+        if self.__executor is None or chunks < 2:
+            function(slice(0, count))
+            return
+        bounds = np.linspace(0, count, chunks + 1).astype(np.int64)
+        for _ in self.__executor.map(function, [slice(bounds[i], bounds[i + 1]) for i in range(chunks)]):
+            pass
+
+    def shutdown(self) -> None:
+        """Stops threads stepping chunks of the fleet, the following cycles run on the calling thread"""
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    @staticmethod
+    def normalize_angle(angle : np.ndarray) -> np.ndarray:
+        """Normalizes -180-180 angles into 360 domain"""
+        return np.mod(angle, 360.0)
+
+    @staticmethod
+    def format_yaw_angle(angle : np.ndarray) -> np.ndarray:
+        """Formats angles into -180-180 domain"""
+        angle = np.mod(angle, 360.0)
+        return np.where(angle <= 180.0, angle, angle - 360.0)
+
+    @staticmethod
+    def find_yaw_angle(speed : np.ndarray) -> np.ndarray:
+        """Finds yaw (heading) angles of the given speeds"""
+        return np.degrees(np.arctan2(speed[:, 0], -speed[:, 1]))
+
+    @staticmethod
+    def find_pitch_angle(speed : np.ndarray) -> np.ndarray:
+        """Finds pitch angles of the given speeds"""
+        return np.degrees(np.arctan2(speed[:, 2], np.hypot(speed[:, 0], speed[:, 1])))
+
+    @staticmethod
+    def find_best_yaw_angle(position : np.ndarray, destination : np.ndarray) -> np.ndarray:
+        """Finds best yaw angles for the given destinations"""
+        return SimulationFleetPhysics.format_yaw_angle(np.degrees(np.arctan2(
+            destination[:, 1] - position[:, 1],
+            destination[:, 0] - position[:, 0])) + 90.0)
+
+    @staticmethod
+    def find_best_pitch_angle(position : np.ndarray, destination : np.ndarray) -> np.ndarray:
+        """Finds best pitch angles for the given destinations"""
+        return np.degrees(np.arctan2(
+            destination[:, 2] - position[:, 2],
+            np.linalg.norm(destination - position, axis = 1)))
+
+    @staticmethod
+    def find_best_roll_angle(current_yaw_angle : np.ndarray, target_yaw_angle : np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds best roll angles for the targeted yaw angles, returns them with yaw differences"""
+        difference = np.mod(target_yaw_angle - current_yaw_angle + 180.0, 360.0) - 180.0
+        magnitude = np.abs(difference)
+        roll_angle = np.select(
+            [magnitude < 0.001, magnitude > 90.0, magnitude > 45.0, magnitude > 20.0],
+            [0.0, 30.0, 20.0, 10.0],
+            5.0)
+        return np.copysign(roll_angle, difference), difference
+
+    def update_active_set(self) -> None:
+        """Demotes steady aircrafts far from the others to dormant kinematic flight and wakes them up when they may interact again"""
+        fleet = self.fleet
+        waking = fleet.dormant & (self.wake_time <= self.simulated_time)
+        if waking.any():
+            fleet.dormant[waking] = False
+        if self.simulated_time < self.__next_active_set_update:
+            return
+        self.__next_active_set_update = self.simulated_time + SimulationSettings.level_of_detail_period
+        rows = np.flatnonzero(fleet.active & ~fleet.collided)
+        fleet.dormant[:] = False
+        if len(rows) == 0:
+            return
+        position = fleet.position[rows]
+        speed = fleet.speed[rows]
+        absolute_speed = np.linalg.norm(speed, axis = 1)
+        yaw_angle = self.find_yaw_angle(speed)
+        pitch_angle = self.find_pitch_angle(speed)
+
+        # steady straight flight the full model would not change
+        steering = fleet.has_destination[rows] & fleet.autopilot[rows] & ~fleet.ignore_destinations[rows]
+        destination = fleet.destination[rows]
+        target_yaw_angle = np.where(steering, self.find_best_yaw_angle(position, destination), fleet.target_yaw_angle[rows])
+        target_pitch_angle = np.where(steering, self.find_best_pitch_angle(position, destination), fleet.target_pitch_angle[rows])
+        steady = (fleet.target_roll_angle[rows] == 0.0) & (np.abs(fleet.roll_angle[rows]) < 0.001)
+        steady &= np.abs(absolute_speed - fleet.target_speed[rows]) <= 0.001
+        steady &= np.abs(self.format_yaw_angle(yaw_angle - target_yaw_angle)) < 0.001
+        steady &= np.abs(pitch_angle - target_pitch_angle) < 0.001
+        steady &= ~fleet.evade_maneuver[rows] & ~fleet.safe_zone_occupied[rows]
+        if self.wind is not None:
+            # flight control computers keep correcting the wind drift off the destination course
+            steady &= ~steering
+        if not steady.any():
+            return
+
+        # time until reaching the destination sphere or the ground
+        steady_time = np.full(len(rows), np.inf)
+        moving = absolute_speed > 0.0
+        destination_distance = np.linalg.norm(destination - position, axis = 1) - fleet.size[rows] * 5 - absolute_speed
+        steady_time = np.where(steering & moving, destination_distance / np.where(moving, absolute_speed, 1.0), steady_time)
+        steady_time = np.minimum(steady_time, self.find_ground_time(position, speed))
+
+        # time until any other aircraft of the same group may come within level of detail distance, bounded by the gaps along x axis
+        group = fleet.group[rows]
+        order = np.lexsort((position[:, 0], group))
+        sorted_x = position[order, 0]
+        gap = np.where(group[order][1:] == group[order][:-1], np.diff(sorted_x), np.inf)
+        nearest_gap = np.empty(len(rows))
+        nearest_gap[order] = np.minimum(np.concatenate(([np.inf], gap)), np.concatenate((gap, [np.inf])))
+        # awake aircrafts may turn onto x axis during the dormant time, so gaps are closed at most at full speeds
+        top_speed = np.maximum(absolute_speed, fleet.target_speed[rows])
+        closing_speed = top_speed + top_speed.max() + (0.0 if self.wind is None else 2.0 * self.wind.max_speed)
+        separation_time = np.where(closing_speed > 0.0, (nearest_gap - self.level_of_detail_distance) / np.where(closing_speed > 0.0, closing_speed, 1.0), np.where(nearest_gap > self.level_of_detail_distance, np.inf, 0.0))
+        dormant_time = np.minimum(steady_time, separation_time) * 1000.0
+        dormant = steady & (dormant_time > 0.0)
+        fleet.dormant[rows[dormant]] = True
+        self.wake_time[rows[dormant]] = self.simulated_time + dormant_time[dormant]
+
+    def update_fccs(self, rows : np.ndarray | None = None) -> None:
+        """Updates targeted movement angles of flight control computers of the given rows, all active by default"""
+        fleet = self.fleet
+        if rows is None:
+            rows = np.flatnonzero(fleet.active & ~fleet.collided)
+        position = fleet.position[rows]
+        steering = fleet.has_destination[rows] & fleet.autopilot[rows] & ~fleet.ignore_destinations[rows]
+        if steering.any():
+            distance = np.linalg.norm(fleet.destination[rows] - position, axis = 1)
+            arrived = steering & (distance < fleet.size[rows] * 5)
+            if arrived.any():
+                fleet.pop_destinations(rows[arrived])
+                steering &= fleet.has_destination[rows]
+            destination = fleet.destination[rows]
+            fleet.target_yaw_angle[rows] = np.where(
+                steering,
+                self.find_best_yaw_angle(position, destination),
+                fleet.target_yaw_angle[rows])
+            fleet.target_pitch_angle[rows] = np.where(
+                steering,
+                self.find_best_pitch_angle(position, destination),
+                fleet.target_pitch_angle[rows])
+
+        speed = fleet.speed[rows]
+        current_yaw_angle = self.normalize_angle(self.find_yaw_angle(speed))
+        target_roll_angle, difference = self.find_best_roll_angle(
+            current_yaw_angle,
+            self.normalize_angle(fleet.target_yaw_angle[rows]))
+
+        # roll towards the next destination when the current one is about to be reached
+        lookahead = fleet.has_next_destination[rows] & (np.abs(difference) < 0.01)
+        if lookahead.any():
+            destination = fleet.destination[rows]
+            lookahead &= np.linalg.norm(destination - position, axis = 1) < np.linalg.norm(speed, axis = 1)
+            next_roll_angle, _ = self.find_best_roll_angle(
+                current_yaw_angle,
+                self.normalize_angle(self.find_best_yaw_angle(destination, fleet.next_destination[rows])))
+            target_roll_angle = np.where(lookahead, next_roll_angle, target_roll_angle)
+
+        fleet.target_roll_angle[rows] = target_roll_angle
+        fleet.is_turning_right[rows] = target_roll_angle > 0.0
+        fleet.is_turning_left[rows] = target_roll_angle < 0.0
+
+    @staticmethod
+    def find_lag_factor(elapsed_time : float, dynamic_delay : np.ndarray) -> np.ndarray:
+        """Finds parts of the differences to their targets closed by first-order lags of dynamic delays during elapsed time"""
+        return 1.0 - np.exp(-elapsed_time / dynamic_delay)
+
+    def update_aircrafts_speed_angles(self, elapsed_time : float, rows : np.ndarray | None = None) -> None:
+        """Updates movement speed and angles of aircrafts of the given rows, all active by default"""
+        assert elapsed_time > 0.0
+        fleet = self.fleet
+        if rows is None:
+            rows = np.flatnonzero(fleet.active & ~fleet.collided)
+        speed = fleet.speed[rows]
+
+        # speed
+        current_speed = np.linalg.norm(speed, axis = 1)
+        target_speed = fleet.target_speed[rows]
+        speed_difference = np.abs(current_speed - target_speed)
+        max_speed_delta = fleet.max_acceleration[rows] / elapsed_time
+        accelerating = (speed_difference > 0.001) & (current_speed - max_speed_delta > 20.0) & (current_speed + max_speed_delta < 340.0) # make drone subsonic
+        if accelerating.any():
+            new_speed = np.where(
+                speed_difference < max_speed_delta,
+                target_speed,
+                np.where(current_speed < target_speed, current_speed + max_speed_delta, current_speed - max_speed_delta))
+            speed *= np.where(accelerating, new_speed / np.where(accelerating, current_speed, 1.0), 1.0)[:, np.newaxis]
+
+        # roll angle
+        roll_angle = fleet.roll_angle[rows]
+        roll_angle += self.find_lag_factor(elapsed_time, fleet.roll_dynamic_delay[rows]) * (fleet.target_roll_angle[rows] - roll_angle)
+        fleet.roll_angle[rows] = roll_angle
+
+        # pitch angle
+        current_pitch_angle = self.find_pitch_angle(speed)
+        target_pitch_angle = fleet.target_pitch_angle[rows]
+        pitching = (np.abs(current_pitch_angle - target_pitch_angle) >= 0.001) & (np.abs(current_pitch_angle) < 90.0)
+        if pitching.any():
+            new_pitch_angle = current_pitch_angle + self.find_lag_factor(elapsed_time, fleet.pitch_dynamic_delay[rows]) * (target_pitch_angle - current_pitch_angle)
+            new_pitch_angle = np.where(np.abs(new_pitch_angle) > 45.0, current_pitch_angle, new_pitch_angle)
+            speed[:, 2] = np.where(pitching, np.linalg.norm(speed, axis = 1) * np.sin(np.radians(new_pitch_angle)), speed[:, 2])
+
+        # yaw angle
+        self.turn_angle[rows] = 0.0
+        current_yaw_angle = self.find_yaw_angle(speed)
+        horizontal_speed = np.hypot(speed[:, 0], speed[:, 1])
+        yawing = (roll_angle != 0.0) & (np.abs(current_yaw_angle - fleet.target_yaw_angle[rows]) >= 0.001) & (horizontal_speed > 0.0)
+        if yawing.any():
+            delta_yaw_angle = self.g_acceleration * np.tan(np.radians(roll_angle)) * elapsed_time / np.where(yawing, horizontal_speed, 1.0)
+            new_yaw_angle = np.radians(current_yaw_angle + delta_yaw_angle)
+            self.turn_angle[rows] = np.where(yawing, np.radians(delta_yaw_angle), 0.0)
+            speed[:, 0] = np.where(yawing, np.sin(new_yaw_angle) * horizontal_speed, speed[:, 0])
+            speed[:, 1] = np.where(yawing, -np.cos(new_yaw_angle) * horizontal_speed, speed[:, 1])
+        fleet.speed[rows] = speed
+
+    def update_aircrafts_wind(self) -> None:
+        """Samples wind field at positions of all flying aircrafts, dormant ones included, which drift with it until the next cycle"""
+        if self.wind is None:
+            return
+        fleet = self.fleet
+        rows = np.flatnonzero(fleet.active & ~fleet.collided)
+        fleet.wind[rows] = self.wind.find_winds(fleet.position[rows], self.simulated_time)
+
+    def detect_collision_pairs(self, elapsed_time : float = 0.0, rows : np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns index pairs of aircrafts of the given rows, all active by default, of the same group whose swept segments come within their collision distance during elapsed time, with first contact times"""
+        fleet = self.fleet
+        indices = np.flatnonzero(fleet.active & ~fleet.collided) if rows is None else rows
+        if len(indices) < 2:
+            return np.empty(0, dtype = np.int64), np.empty(0, dtype = np.int64), np.empty(0)
+        position = fleet.position[indices]
+        speed = self.find_displacement(elapsed_time, indices) / elapsed_time if elapsed_time > 0.0 else fleet.speed[indices] / 1000.0
+        group = fleet.group[indices]
+        order = np.lexsort((position[:, 0], group))
+        sorted_x = position[order, 0]
+        sorted_group = group[order]
+        reach = fleet.size[indices].max() + 2.0 * np.abs(speed[:, 0]).max() * elapsed_time
+        first_list, second_list, time_list = [], [], []
+        for offset in range(1, len(indices)):
+            candidates = np.flatnonzero((sorted_x[offset:] - sorted_x[:-offset] <= reach) & (sorted_group[offset:] == sorted_group[:-offset]))
+            if len(candidates) == 0:
+                break
+            first = order[candidates]
+            second = order[candidates + offset]
+            collision_distance = np.maximum(fleet.size[indices[first]], fleet.size[indices[second]])
+            contact_time = self.find_contact_time(position[first] - position[second], speed[first] - speed[second], collision_distance, elapsed_time)
+            colliding = contact_time <= elapsed_time
+            first_list.append(indices[first[colliding]])
+            second_list.append(indices[second[colliding]])
+            time_list.append(contact_time[colliding])
+        if not first_list:
+            return np.empty(0, dtype = np.int64), np.empty(0, dtype = np.int64), np.empty(0)
+        return np.concatenate(first_list), np.concatenate(second_list), np.concatenate(time_list)
+
+    def find_displacement(self, elapsed_time : float, rows : np.ndarray, moving_time : np.ndarray | float | None = None) -> np.ndarray:
+        """Finds displacements of aircrafts of the given rows along coordinated turn arcs ending at their current headings drifted by wind after the moving time parts of cycle lasting elapsed time"""
+        fleet = self.fleet
+        if moving_time is None:
+            moving_time = elapsed_time
+        moving_time = np.broadcast_to(moving_time, (len(rows),))
+        speed = fleet.speed[rows]
+        displacement = speed * (moving_time / 1000.0)[:, np.newaxis]
+        turn_angle = self.turn_angle[rows]
+        turning = turn_angle != 0.0
+        if turning.any():
+            turn_angle = turn_angle[turning]
+            yaw_angle = np.radians(self.find_yaw_angle(speed[turning]))
+            previous_yaw_angle = yaw_angle - turn_angle
+            yaw_angle = previous_yaw_angle + turn_angle * moving_time[turning] / elapsed_time
+            turn_radius = np.hypot(speed[turning, 0], speed[turning, 1]) * elapsed_time / 1000.0 / turn_angle
+            displacement[turning, 0] = turn_radius * (np.cos(previous_yaw_angle) - np.cos(yaw_angle))
+            displacement[turning, 1] = turn_radius * (np.sin(previous_yaw_angle) - np.sin(yaw_angle))
+        if self.wind is not None:
+            displacement += fleet.wind[rows] * (moving_time / 1000.0)[:, np.newaxis]
+        return displacement
+
+    def find_ground_heights(self, position : np.ndarray) -> np.ndarray:
+        """Finds terrain heights below the given positions, sea level without terrain model"""
+        if self.terrain is None:
+            return np.zeros(len(position))
+        return self.terrain.find_heights(position[:, 0], position[:, 1])
+
+    def find_ground_time(self, position : np.ndarray, speed : np.ndarray) -> np.ndarray:
+        """Finds times in seconds after which aircrafts may reach the ground, zero while below the highest terrain"""
+        ground_clearance = position[:, 2] - (0.0 if self.terrain is None else self.terrain.max_height)
+        sink_speed = -speed[:, 2] + (0.0 if self.wind is None else self.wind.max_speed)
+        descending = sink_speed > 0.0
+        ground_time = np.where(descending, ground_clearance / np.where(descending, sink_speed, 1.0), np.inf)
+        if self.terrain is not None:
+            ground_time[ground_clearance <= 0.0] = 0.0
+        return ground_time
+
+    @staticmethod
+    def find_contact_time(relative_position : np.ndarray, relative_speed : np.ndarray, collision_distance : np.ndarray, elapsed_time : float) -> np.ndarray:
+        """Finds first times within elapsed time at which relative positions come within collision distance, infinity when they do not"""
+        a = np.einsum("ij,ij->i", relative_speed, relative_speed)
+        b = np.einsum("ij,ij->i", relative_position, relative_speed)
+        c = np.einsum("ij,ij->i", relative_position, relative_position) - collision_distance ** 2
+        discriminant = b ** 2 - a * c
+        approaching = (a > 0.0) & (b < 0.0) & (discriminant >= 0.0)
+        entry_time = np.where(approaching, (-b - np.sqrt(np.where(approaching, discriminant, 0.0))) / np.where(approaching, a, 1.0), np.inf)
+        contact_time = np.where(c <= 0.0, 0.0, np.where(entry_time <= elapsed_time, entry_time, np.inf))
+        return contact_time
+
+    def update_aircrafts_position(self, elapsed_time : float, rows : np.ndarray | None = None) -> bool:
+        """Updates aircrafts position, the given rows, all active by default, in full detail and dormant ones kinematically, returns true on any new collision"""
+        fleet = self.fleet
+        if rows is None:
+            rows = np.flatnonzero(fleet.active & ~fleet.collided)
+        colliding = fleet.position[rows, 2] <= self.find_ground_heights(fleet.position[rows])
+        for aircraft_id in fleet.aircraft_ids[rows[colliding]]:
+            logging.warning("Aircraft's %s collision with the ground", aircraft_id)
+        first, second, contact_time = self.detect_collision_pairs(elapsed_time, rows)
+        moving_time = np.full(fleet.count, np.inf)
+        moving_time[rows[colliding]] = 0.0
+        np.minimum.at(moving_time, first, contact_time)
+        np.minimum.at(moving_time, second, contact_time)
+        moving_time = np.minimum(moving_time[rows], elapsed_time)
+        colliding[np.isin(rows, first)] = True
+        colliding[np.isin(rows, second)] = True
+        fleet.collided[rows[colliding]] = True
+        self.collision_time[rows[colliding]] = self.simulated_time + moving_time[colliding]
+
+        def move(chunk : slice) -> None:
+            delta = self.find_displacement(elapsed_time, rows[chunk], moving_time[chunk])
+            fleet.position[rows[chunk]] += delta
+            fleet.distance_covered[rows[chunk]] += np.linalg.norm(delta, axis = 1)
+
+        # aircrafts move only after collisions of all of them are detected
+        self.map_chunks(move, len(rows))
+        dormant = np.flatnonzero(fleet.dormant & fleet.active & ~fleet.collided)
+        if len(dormant) > 0:
+            delta = (fleet.speed[dormant] + fleet.wind[dormant]) * (elapsed_time / 1000.0)
+            fleet.position[dormant] += delta
+            fleet.distance_covered[dormant] += np.linalg.norm(delta, axis = 1)
+        for i, j in zip(first, second):
+            logging.warning("Aircrafts' %s and %s collision. Coordinates: %s and %s", fleet.aircraft_ids[i], fleet.aircraft_ids[j], fleet.position[i], fleet.position[j])
+        return bool(colliding.any())
@@ -0,0 +1,122 @@
+"""Simulation invariant monitor module"""
+
+import logging
+from math import sqrt
+from typing import List, Tuple
+
+from ..aircraft.aircraft_vehicle import AircraftVehicle
+from .simulation_settings import SimulationSettings
+
+class SimulationInvariants:
+    """Invariant monitor checking aircrafts state never, every n-th physics cycle or every cycle, collecting violations into a report"""
+
+    modes : Tuple[str, str, str] = ("off", "sampled", "full")
+    max_violations : int = 1000
+
+    def __init__(self, mode : str | None = None, period : int | None = None) -> None:
+        mode = SimulationSettings.invariant_check_mode if mode is None else mode
+        period = SimulationSettings.invariant_check_period if period is None else period
+        assert mode in self.modes
+        assert period > 0
+        self.__mode : str = mode
+        self.__period : int = period
+        self.__checks : int = 0
+        self.__violations_count : int = 0
+        self.__violations : List[Tuple[int, int, str]] = []
+
+    @property
+    def mode(self) -> str:
+        """Returns checking mode"""
+        return self.__mode
+
+    @mode.setter
+    def mode(self, mode : str) -> None:
+        """Sets checking mode"""
+        assert mode in self.modes
+        self.__mode = mode
+
+    @property
+    def period(self) -> int:
+        """Returns sampling period in physics cycles"""
+        return self.__period
+
+    @property
+    def checks(self) -> int:
+        """Returns count of performed checks"""
+        return self.__checks
+
+    @property
+    def violations_count(self) -> int:
+        """Returns count of all violations found"""
+        return self.__violations_count
+
+    @property
+    def violations(self) -> List[Tuple[int, int, str]]:
+        """Returns first violations found as physics cycle, aircraft id and description"""
+        return self.__violations
+
+    def reset(self) -> None:
+        """Clears checks count and violations"""
+        self.__checks = 0
+        self.__violations_count = 0
+        self.__violations.clear()
+
+    def is_due(self, cycle : int) -> bool:
+        """Returns true when the given physics cycle has to be checked"""
+        if self.mode == "off":
+            return False
+        return self.mode == "full" or cycle % self.period == 0
+
+    def check(self, cycle : int, aircraft_vehicles : List[AircraftVehicle]) -> None:
+        """Checks aircrafts invariants when the given physics cycle is due"""
+        if not self.is_due(cycle):
+            return
+        self.__checks += 1
+        for aircraft in aircraft_vehicles:
+            self.check_speed(cycle, aircraft)
+
+    def check_speed(self, cycle : int, aircraft : AircraftVehicle) -> None:
+        """Checks consistency of aircraft speed components"""
+        speed : float = aircraft.absolute_speed
+        absolute_speed : float = sqrt(aircraft.speed.x() ** 2 + aircraft.speed.y() ** 2 + aircraft.speed.z() ** 2)
+        horizontal_speed : float = sqrt(aircraft.speed.x() ** 2 + aircraft.speed.y() ** 2)
+        vertical_speed : float = abs(aircraft.speed.z())
+        geometrical_speed : float = sqrt(horizontal_speed ** 2 + vertical_speed ** 2)
+        if not abs(speed - absolute_speed) < 0.0001:
+            self.record(cycle, aircraft.aircraft_id, f"absolute speed {speed} differs from speed vector length {absolute_speed}")
+        if not abs(horizontal_speed - aircraft.horizontal_speed) < 0.0001:
+            self.record(cycle, aircraft.aircraft_id, f"horizontal speed {aircraft.horizontal_speed} differs from {horizontal_speed}")
+        if not abs(vertical_speed - aircraft.vertical_speed) < 0.0001:
+            self.record(cycle, aircraft.aircraft_id, f"vertical speed {aircraft.vertical_speed} differs from {vertical_speed}")
+        if not abs(geometrical_speed - speed) < 0.0001:
+            self.record(cycle, aircraft.aircraft_id, f"geometrical speed {geometrical_speed} differs from absolute speed {speed}")
+        if not speed > 0.0:
+            self.record(cycle, aircraft.aircraft_id, f"absolute speed {speed} is not positive")
+        if not horizontal_speed > 0.0:
+            self.record(cycle, aircraft.aircraft_id, f"horizontal speed {horizontal_speed} is not positive")
+        if not geometrical_speed > 0.0:
+            self.record(cycle, aircraft.aircraft_id, f"geometrical speed {geometrical_speed} is not positive")
+        if not geometrical_speed >= horizontal_speed:
+            self.record(cycle, aircraft.aircraft_id, f"geometrical speed {geometrical_speed} is lower than horizontal speed {horizontal_speed}")
+        if not geometrical_speed >= vertical_speed:
+            self.record(cycle, aircraft.aircraft_id, f"geometrical speed {geometrical_speed} is lower than vertical speed {vertical_speed}")
+
+    def record(self, cycle : int, aircraft_id : int, description : str) -> None:
+        """Records invariant violation, keeps only the first ones"""
+        self.__violations_count += 1
+        if len(self.__violations) < self.max_violations:
+            self.__violations.append((cycle, aircraft_id, description))
+
+    def report(self) -> str:
+        """Returns violations report"""
+        lines : List[str] = [f"Invariant monitor ({self.mode}): {self.violations_count} violations in {self.checks} checks"]
+        for cycle, aircraft_id, description in self.violations:
+            lines.append(f"cycle {cycle}, aircraft {aircraft_id}: {description}")
+        if self.violations_count > len(self.violations):
+            lines.append(f"{self.violations_count - len(self.violations)} more violations omitted")
+        return "\n".join(lines)
+
+    def log_report(self) -> None:
+        """Logs violations report when any violation was found"""
+        if self.violations_count > 0:
+            logging.warning(self.report())
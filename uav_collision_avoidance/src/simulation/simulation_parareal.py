@@ -0,0 +1,185 @@
+"""Simulation parallel-in-time fleet physics module"""
+
+import logging
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from copy import deepcopy
+from math import ceil
+from typing import List, Tuple
+
+import numpy as np
+
+from ..aircraft.aircraft_fleet import AircraftFleet
+from .simulation_settings import SimulationSettings
+from .simulation_fleet_physics import SimulationFleetPhysics
+from .simulation_terrain import SimulationTerrain
+from .simulation_wind import SimulationWind
+
+class SimulationParareal:
+    """Standalone parareal solver of fleet physics without ADS-B and collision avoidance, splitting simulated time into segments,
+    a coarse propagator stepping once per guidance update sweeps the segments serially, the fine propagator of the configured step
+    corrects all of them in parallel processes, iterating until the positions at the segments boundaries converge"""
+
+    continuous_states : Tuple[str, ...] = ("position", "distance_covered")
+    flight_control_states : Tuple[str, ...] = ("speed", "roll_angle", "target_yaw_angle", "target_pitch_angle", "target_roll_angle", "target_speed", "is_turning_right", "is_turning_left")
+
+    def __init__(
+            self,
+            fleet : AircraftFleet,
+            duration : float,
+            segments : int,
+            time_step : float | None = None,
+            coarse_time_step : float | None = None,
+            tolerance : float = 10.0,
+            max_iterations : int | None = None,
+            workers : int | None = None,
+            g_acceleration : float = SimulationSettings.g_acceleration,
+            terrain : SimulationTerrain | None = None,
+            wind : SimulationWind | None = None) -> None:
+        time_step = SimulationSettings.simulation_threshold if time_step is None else time_step
+        coarse_time_step = max(SimulationSettings.guidance_threshold, time_step) if coarse_time_step is None else coarse_time_step
+        assert duration > 0.0 and segments > 0
+        assert coarse_time_step >= time_step > 0.0
+        self.__fleet = fleet
+        self.__time_step : float = time_step
+        self.__coarse_time_step : float = coarse_time_step
+        self.__tolerance : float = tolerance
+        self.__max_iterations : int = segments if max_iterations is None else min(max_iterations, segments)
+        self.__workers : int | None = workers
+        self.__g_acceleration : float = g_acceleration
+        self.__terrain : SimulationTerrain | None = terrain
+        self.__wind : SimulationWind | None = wind
+        self.__iterations : int = 0
+        self.__corrections : List[float] = []
+
+        # segments start at multiples of the coarse step, so fresh propagators update guidance where the serial run does
+        alignment : float = max(coarse_time_step, SimulationSettings.guidance_threshold)
+        segment_duration : float = ceil(duration / segments / alignment) * alignment
+        self.__boundaries : List[float] = [min(i * segment_duration, duration) for i in range(segments + 1)]
+        self.__boundaries = [boundary for i, boundary in enumerate(self.__boundaries) if i == 0 or boundary > self.__boundaries[i - 1]]
+
+    @property
+    def fleet(self) -> AircraftFleet:
+        """Returns initial fleet state"""
+        return self.__fleet
+
+    @property
+    def boundaries(self) -> List[float]:
+        """Returns simulated times in ms of the segments boundaries"""
+        return self.__boundaries
+
+    @property
+    def segments(self) -> int:
+        """Returns segments count"""
+        return len(self.__boundaries) - 1
+
+    @property
+    def time_step(self) -> float:
+        """Returns fine propagator time step in ms"""
+        return self.__time_step
+
+    @property
+    def coarse_time_step(self) -> float:
+        """Returns coarse propagator time step in ms"""
+        return self.__coarse_time_step
+
+    @property
+    def tolerance(self) -> float:
+        """Returns largest position correction in meters at which iterations stop"""
+        return self.__tolerance
+
+    @property
+    def iterations(self) -> int:
+        """Returns count of performed parareal iterations"""
+        return self.__iterations
+
+    @property
+    def corrections(self) -> List[float]:
+        """Returns largest position corrections in meters of every iteration"""
+        return self.__corrections
+
+    @staticmethod
+    def propagate(
+            fleet : AircraftFleet,
+            start_time : float,
+            end_time : float,
+            time_step : float,
+            g_acceleration : float,
+            terrain : SimulationTerrain | None,
+            wind : SimulationWind | None) -> AircraftFleet:
+        """Steps fleet physics from start time to end time in ms, the last step shortened to land on the end time"""
+        physics : SimulationFleetPhysics = SimulationFleetPhysics(fleet, g_acceleration, terrain = terrain, wind = wind, simulated_time = start_time)
+        while physics.simulated_time < end_time:
+            physics.cycle(min(time_step, end_time - physics.simulated_time))
+        return fleet
+
+    def propagate_coarse(self, fleet : AircraftFleet, segment : int) -> AircraftFleet:
+        """Propagates copy of fleet through the segment with coarse steps"""
+        return self.propagate(deepcopy(fleet), self.boundaries[segment], self.boundaries[segment + 1], self.coarse_time_step, self.__g_acceleration, self.__terrain, self.__wind)
+
+    def propagate_fine(self, executor : Executor | None, states : List[AircraftFleet], first_segment : int) -> List[AircraftFleet]:
+        """Propagates states of segments from the first one on with the fine step, in parallel when executor is given"""
+        segments = range(first_segment, self.segments)
+        arguments = (
+            [states[segment] for segment in segments],
+            [self.boundaries[segment] for segment in segments],
+            [self.boundaries[segment + 1] for segment in segments],
+            [self.time_step] * len(segments),
+            [self.__g_acceleration] * len(segments),
+            [self.__terrain] * len(segments),
+            [self.__wind] * len(segments))
+        if executor is None:
+            return list(map(self.propagate, *(deepcopy(argument) if i == 0 else argument for i, argument in enumerate(arguments))))
+        return list(executor.map(self.propagate, *arguments))
+
+    def correct(self, coarse : AircraftFleet, fine : AircraftFleet, previous_coarse : AircraftFleet) -> AircraftFleet:
+        """Corrects positions of the new coarse state with the difference between fine and previous coarse states,
+        flight control states are taken whole from the fine one, or from the new coarse one for aircrafts whose coarse destinations changed"""
+        corrected : AircraftFleet = deepcopy(fine)
+        for name in self.continuous_states:
+            getattr(corrected, name)[:] = getattr(coarse, name) + getattr(fine, name) - getattr(previous_coarse, name)
+        rerouted = np.array([i for i in range(coarse.count) if coarse.destinations[i] != previous_coarse.destinations[i]], dtype = np.int64)
+        if len(rerouted) > 0:
+            for name in self.flight_control_states:
+                getattr(corrected, name)[rerouted] = getattr(coarse, name)[rerouted]
+            for i in rerouted:
+                corrected.destinations[i] = deque(coarse.destinations[i])
+                corrected.destinations_history[i] = list(coarse.destinations_history[i])
+            corrected.refresh_destinations(rerouted)
+        return corrected
+
+    def run(self) -> AircraftFleet:
+        """Runs parareal iterations until boundary states converge or every segment is exact, returns the fleet state at the end"""
+        logging.info("Running parareal over %d segments of %d aircrafts", self.segments, self.fleet.count)
+        states : List[AircraftFleet] = [deepcopy(self.fleet)]
+        coarse : List[AircraftFleet] = []
+        for segment in range(self.segments):
+            coarse.append(self.propagate_coarse(states[segment], segment))
+            states.append(deepcopy(coarse[segment]))
+        self.__iterations = 0
+        self.__corrections = []
+        executor : Executor | None = ProcessPoolExecutor(max_workers = self.__workers) if self.__workers != 1 and self.segments > 1 else None
+        try:
+            while self.iterations < self.__max_iterations:
+                # states up to the iteration count are exact, so are fine propagations starting from them
+                first_segment : int = self.iterations
+                fine : List[AircraftFleet] = self.propagate_fine(executor, states, first_segment)
+                self.__iterations += 1
+                correction : float = 0.0
+                for segment in range(first_segment, self.segments):
+                    if segment == first_segment:
+                        new_state : AircraftFleet = fine[0]
+                    else:
+                        new_coarse : AircraftFleet = self.propagate_coarse(states[segment], segment)
+                        new_state = self.correct(new_coarse, fine[segment - first_segment], coarse[segment])
+                        coarse[segment] = new_coarse
+                    correction = max(correction, float(np.max(np.linalg.norm(new_state.position - states[segment + 1].position, axis = 1), initial = 0.0)))
+                    states[segment + 1] = new_state
+                self.__corrections.append(correction)
+                logging.info("Parareal iteration %d largest correction %fm", self.iterations, correction)
+                if correction <= self.tolerance:
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return states[-1]
@@ -1,18 +1,46 @@
 """Simulation settings"""
 
-from PySide6.QtCore import QSize
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PySide6.QtCore import QSize
 
 class SimulationSettings:
     """Settings for the simulation"""
 
-    screen_resolution : QSize | None = None
+    screen_resolution : "QSize | None" = None
     resolution : tuple
     g_acceleration : float = 9.81
-    simulation_frequency : float = 100.0 # Hz
+    simulation_frequency : float = 100.0 # Hz, dynamics
     simulation_threshold : float = 1000.0 / simulation_frequency
+    guidance_frequency : float = 10.0 # Hz, flight control computers
+    guidance_threshold : float = 1000.0 / guidance_frequency
     gui_render_frequency : float = 100.0 # Hz, fps
     gui_render_threshold : float =  1000.0 / gui_render_frequency
-    adsb_threshold : float = 1000.0
+    adsb_frequency : float = 1.0 # Hz, surveillance
+    adsb_threshold : float = 1000.0 / adsb_frequency
+    adaptive_time_step_limit : float = 1000.0 # ms
+    adaptive_separation_margin : float = 2.5 # minimum separations
+    level_of_detail_separation_margin : float = 2.0 # minimum separations
+    level_of_detail_period : float = 1000.0 # ms
+    invariant_check_mode : str = "sampled" # off, sampled or full
+    invariant_check_period : int = 100 # physics cycles
+    terrain_tile_size : int = 256 # cells
+    terrain_cache_size : int = 64 # tiles
+    wind_cache_size : int = 4 # time slices
+    fleet_chunk_size : int = 16_384 # aircrafts
+    adsb_lookahead : float = 300.0 # s
+    adsb_block_size : int = 256 # aircrafts
+    adsb_radio_range : float = 150_000.0 # m
+    adsb_buffer_size : int = 16 # messages
+    tracker_position_noise : float = 10.0 # m
+    tracker_speed_noise : float = 1.0 # m/s
+    tracker_acceleration_noise : float = 1.0 # m^2/s^3
+    tracker_turn_rate_noise : float = 1e-4 # rad^2/s^3
+    adsb_max_interval : float = 5000.0 # ms
+    surveillance_threat_margin : float = 2.0 # minimum separations
+    prediction_horizon : float = 120.0 # s
+    prediction_time_step : float = 2.0 # s
 
     @classmethod
     def __init__(cls) -> None:
@@ -25,3 +53,22 @@ class SimulationSettings:
         """Sets the simulation frequency"""
         cls.simulation_frequency = frequency
         cls.simulation_threshold = 1000.0 / frequency
+
+    @classmethod
+    def set_guidance_frequency(cls, frequency : float) -> None:
+        """Sets the flight control computers guidance frequency"""
+        cls.guidance_frequency = frequency
+        cls.guidance_threshold = 1000.0 / frequency
+
+    @classmethod
+    def set_adsb_frequency(cls, frequency : float) -> None:
+        """Sets the ADS-B surveillance frequency"""
+        cls.adsb_frequency = frequency
+        cls.adsb_threshold = 1000.0 / frequency
+
+    @classmethod
+    def set_invariant_check_mode(cls, mode : str, period : int | None = None) -> None:
+        """Sets the invariant check mode of physics engines created afterwards, off, sampled or full, with its sampling period in physics cycles"""
+        cls.invariant_check_mode = mode
+        if period is not None:
+            cls.invariant_check_period = period
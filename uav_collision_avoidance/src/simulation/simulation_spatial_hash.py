@@ -0,0 +1,105 @@
+"""Simulation spatial hash broad-phase module"""
+
+from typing import Tuple
+
+import numpy as np
+
+class SimulationSpatialHash:
+    """Broad-phase of pairwise checks hashing positions into uniform cubic cells, every pair of the same group closer than cell size
+    lies in the same or neighbouring cells and is returned as a candidate for exact distance and closest approach tests"""
+
+    # neighbouring cells following each cell in the key order, every pair of neighbouring cells is visited once
+    neighbour_offsets : np.ndarray = np.array([
+        (dx, dy, dz)
+        for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+        if (dx, dy, dz) > (0, 0, 0)])
+
+    def __init__(self, cell_size : float) -> None:
+        assert cell_size > 0.0
+        self.__cell_size : float = cell_size
+        self.__order : np.ndarray = np.empty(0, dtype = np.int64)
+        self.__keys : np.ndarray = np.empty(0, dtype = np.int64)
+        self.__cell_keys : np.ndarray = np.empty(0, dtype = np.int64)
+        self.__cell_coordinates : np.ndarray = np.empty((0, 4), dtype = np.int64)
+        self.__cell_start : np.ndarray = np.empty(0, dtype = np.int64)
+        self.__cell_count : np.ndarray = np.empty(0, dtype = np.int64)
+        self.__group : np.ndarray = np.empty(0, dtype = np.int64)
+        self.__wrapped_groups : bool = False
+
+    @property
+    def cell_size(self) -> float:
+        """Returns cell edge length in meters"""
+        return self.__cell_size
+
+    @property
+    def order(self) -> np.ndarray:
+        """Returns indices of hashed positions sorted by their cell keys"""
+        return self.__order
+
+    @property
+    def cells(self) -> int:
+        """Returns count of occupied cells"""
+        return len(self.__cell_keys)
+
+    @staticmethod
+    def find_keys(coordinates : np.ndarray) -> np.ndarray:
+        """Packs cell x, y and z coordinates and groups of shape (count, 4) into keys, wrapping them, so distant cells may share keys"""
+        coordinates = coordinates & np.array((0xFFFF, 0xFFFF, 0xFFFF, 0x7FFF))
+        return (coordinates[:, 3] << 48) | (coordinates[:, 0] << 32) | (coordinates[:, 1] << 16) | coordinates[:, 2]
+
+    def update(self, position : np.ndarray, group : np.ndarray | None = None) -> None:
+        """Hashes positions of shape (count, 3), sorting them starting from the previous order, which is nearly sorted for the next step"""
+        count : int = len(position)
+        coordinates = np.empty((count, 4), dtype = np.int64)
+        coordinates[:, :3] = np.floor(position / self.cell_size)
+        coordinates[:, 3] = 0 if group is None else group
+        keys = self.find_keys(coordinates)
+        order = self.__order if len(self.__order) == count else np.arange(count)
+        order = order[np.argsort(keys[order], kind = "stable")]
+        keys = keys[order]
+        self.__order = order
+        self.__keys = keys
+        self.__group = coordinates[:, 3]
+        self.__wrapped_groups = count > 0 and (self.__group.min() < 0 or self.__group.max() > 0x7FFF)
+        cell_start = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1]))) if count > 0 else np.empty(0, dtype = np.int64)
+        self.__cell_keys = keys[cell_start]
+        self.__cell_coordinates = coordinates[order[cell_start]]
+        self.__cell_start = cell_start
+        self.__cell_count = np.diff(np.append(cell_start, count))
+
+    def find_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns candidate index pairs of hashed positions of the same group in the same or neighbouring cells, each pair once"""
+        order = self.__order
+        keys = self.__keys
+        first_list, second_list = [order[:0]], [order[:0]]
+
+        # pairs within the same cell
+        for offset in range(1, int(self.__cell_count.max(initial = 0))):
+            same = np.flatnonzero(keys[offset:] == keys[:-offset])
+            first_list.append(order[same])
+            second_list.append(order[same + offset])
+
+        # pairs of all members of neighbouring cells
+        for neighbour_offset in self.neighbour_offsets:
+            neighbour_coordinates = self.__cell_coordinates.copy()
+            neighbour_coordinates[:, :3] += neighbour_offset
+            neighbour_keys = self.find_keys(neighbour_coordinates)
+            neighbour = np.minimum(np.searchsorted(self.__cell_keys, neighbour_keys), self.cells - 1)
+            cell = np.flatnonzero(self.__cell_keys[neighbour] == neighbour_keys)
+            if len(cell) == 0:
+                continue
+            neighbour = neighbour[cell]
+            first_count = self.__cell_count[cell]
+            second_count = self.__cell_count[neighbour]
+            pairs_count = first_count * second_count
+            pair_cell = np.repeat(np.arange(len(cell)), pairs_count)
+            local = np.arange(pairs_count.sum()) - np.repeat(np.cumsum(pairs_count) - pairs_count, pairs_count)
+            first_list.append(order[self.__cell_start[cell][pair_cell] + local // second_count[pair_cell]])
+            second_list.append(order[self.__cell_start[neighbour][pair_cell] + local % second_count[pair_cell]])
+        first = np.concatenate(first_list)
+        second = np.concatenate(second_list)
+        if self.__wrapped_groups:
+            # groups sharing keys share cells too
+            kept = self.__group[first] == self.__group[second]
+            first, second = first[kept], second[kept]
+        return first, second
@@ -0,0 +1,88 @@
+"""Simulation sweep and prune conflict probe module"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+from .simulation_settings import SimulationSettings
+
+class SimulationSweepAndPrune:
+    """Broad-phase of lookahead conflict probes bounding straight flight of each aircraft over lookahead time with a box grown by half of the margin,
+    boxes are kept sorted by their lower bounds along every axis and pairs of the same group whose boxes overlap on all axes are returned as candidates,
+    every pair which may come within the margin during lookahead is among them"""
+
+    def __init__(self, lookahead : float, margin : float, block_size : int = SimulationSettings.adsb_block_size) -> None:
+        assert lookahead >= 0.0 and margin >= 0.0 and block_size > 0
+        self.__lookahead : float = lookahead
+        self.__margin : float = margin
+        self.__block_size : int = block_size
+        self.__lower : np.ndarray = np.empty((0, 3))
+        self.__upper : np.ndarray = np.empty((0, 3))
+        self.__group : np.ndarray | None = None
+        self.__orders : List[np.ndarray] = [np.empty(0, dtype = np.int64) for _ in range(3)]
+
+    @property
+    def lookahead(self) -> float:
+        """Returns time in seconds swept by the boxes"""
+        return self.__lookahead
+
+    @property
+    def margin(self) -> float:
+        """Returns distance in meters below which pairs are candidates"""
+        return self.__margin
+
+    @property
+    def lower(self) -> np.ndarray:
+        """Returns lower corners of the boxes"""
+        return self.__lower
+
+    @property
+    def upper(self) -> np.ndarray:
+        """Returns upper corners of the boxes"""
+        return self.__upper
+
+    @property
+    def orders(self) -> List[np.ndarray]:
+        """Returns indices of the boxes sorted by their lower bounds along x, y and z axes"""
+        return self.__orders
+
+    def update(self, position : np.ndarray, speed : np.ndarray, group : np.ndarray | None = None) -> None:
+        """Bounds flight from positions with speeds in m/s of shape (count, 3), sorting every axis starting from its previous order, which is nearly sorted for the next cycle"""
+        count : int = len(position)
+        predicted_position = position + speed * self.lookahead
+        self.__lower = np.minimum(position, predicted_position) - self.margin / 2.0
+        self.__upper = np.maximum(position, predicted_position) + self.margin / 2.0
+        self.__group = group
+        for axis in range(3):
+            order = self.__orders[axis] if len(self.__orders[axis]) == count else np.arange(count)
+            self.__orders[axis] = order[np.argsort(self.__lower[order, axis], kind = "stable")]
+
+    def find_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns candidate index pairs of boxes of the same group overlapping on all axes, each pair once"""
+        lower = self.__lower
+        upper = self.__upper
+        count : int = len(lower)
+
+        # sweep along the axis where boxes overlap the least
+        sweeps = []
+        for axis in range(3):
+            order = self.__orders[axis]
+            end = np.searchsorted(lower[order, axis], upper[order, axis], side = "right")
+            sweeps.append((int(np.maximum(end - np.arange(1, count + 1), 0).sum()), axis, order, end))
+        _, axis, order, end = min(sweeps, key = lambda sweep : sweep[0])
+        other_axes = [other_axis for other_axis in range(3) if other_axis != axis]
+
+        first_list, second_list = [order[:0]], [order[:0]]
+        for start in range(0, count, self.__block_size):
+            stop : int = min(start + self.__block_size, count)
+            pairs_count = np.maximum(end[start:stop] - np.arange(start + 1, stop + 1), 0)
+            sorted_first = np.repeat(np.arange(start, stop), pairs_count)
+            sorted_second = sorted_first + 1 + np.arange(pairs_count.sum()) - np.repeat(np.cumsum(pairs_count) - pairs_count, pairs_count)
+            first = order[sorted_first]
+            second = order[sorted_second]
+            overlapping = np.all((lower[first][:, other_axes] <= upper[second][:, other_axes]) & (lower[second][:, other_axes] <= upper[first][:, other_axes]), axis = 1)
+            if self.__group is not None:
+                overlapping &= self.__group[first] == self.__group[second]
+            first_list.append(first[overlapping])
+            second_list.append(second[overlapping])
+        return np.concatenate(first_list), np.concatenate(second_list)
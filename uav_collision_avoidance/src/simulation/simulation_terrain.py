@@ -0,0 +1,159 @@
+"""Simulation terrain elevation module"""
+
+import logging
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy as np
+
+from .simulation_settings import SimulationSettings
+
+class SimulationTerrain:
+    """Terrain elevation grid memory-mapped from a raw raster file, read in square tiles kept in a least recently used cache,
+    row r and column c of the grid hold elevation in meters at y = origin y + r * cell size and x = origin x + c * cell size,
+    elevation outside of the grid is sea level"""
+
+    def __init__(
+            self,
+            file_path : str,
+            shape : Tuple[int, int],
+            cell_size : float,
+            origin : Tuple[float, float] = (0.0, 0.0),
+            dtype : str = "float32",
+            offset : int = 0,
+            tile_size : int = SimulationSettings.terrain_tile_size,
+            cache_size : int = SimulationSettings.terrain_cache_size) -> None:
+        assert shape[0] >= 2 and shape[1] >= 2
+        assert cell_size > 0.0
+        assert tile_size > 0 and cache_size > 0
+        self.__file_path : str = file_path
+        self.__dtype : str = dtype
+        self.__offset : int = offset
+        self.__elevation : np.memmap = np.memmap(file_path, dtype = dtype, mode = "r", offset = offset, shape = shape)
+        self.__cell_size : float = cell_size
+        self.__origin : Tuple[float, float] = origin
+        self.__tile_size : int = tile_size
+        self.__cache_size : int = cache_size
+        self.__tiles : OrderedDict[Tuple[int, int], np.ndarray] = OrderedDict()
+        self.__tile_loads : int = 0
+        self.__max_height : float | None = None
+
+    def __reduce__(self) -> tuple:
+        """Pickles terrain as its raster file parameters, so other processes map the file instead of copying the grid"""
+        return (SimulationTerrain, (self.file_path, self.shape, self.cell_size, self.origin, self.__dtype, self.__offset, self.tile_size, self.cache_size))
+
+    @property
+    def file_path(self) -> str:
+        """Returns raster file path"""
+        return self.__file_path
+
+    @property
+    def elevation(self) -> np.memmap:
+        """Returns memory-mapped elevation grid"""
+        return self.__elevation
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Returns elevation grid rows and columns count"""
+        return self.__elevation.shape
+
+    @property
+    def cell_size(self) -> float:
+        """Returns grid cell size in meters"""
+        return self.__cell_size
+
+    @property
+    def origin(self) -> Tuple[float, float]:
+        """Returns x and y coordinates of the first grid cell"""
+        return self.__origin
+
+    @property
+    def tile_size(self) -> int:
+        """Returns tile size in cells"""
+        return self.__tile_size
+
+    @property
+    def cache_size(self) -> int:
+        """Returns maximal count of cached tiles"""
+        return self.__cache_size
+
+    @property
+    def cached_tiles(self) -> int:
+        """Returns count of currently cached tiles"""
+        return len(self.__tiles)
+
+    @property
+    def tile_loads(self) -> int:
+        """Returns count of tiles read from the raster file"""
+        return self.__tile_loads
+
+    @property
+    def max_height(self) -> float:
+        """Returns the highest elevation of the grid, found streaming the raster once"""
+        if self.__max_height is None:
+            max_height : float = 0.0 # sea level around the grid
+            for row in range(0, self.shape[0], self.tile_size):
+                max_height = max(max_height, float(np.nanmax(self.__elevation[row:row + self.tile_size])))
+            self.__max_height = max_height
+            logging.info("Terrain %s maximal height %fm", self.file_path, max_height)
+        return self.__max_height
+
+    def find_tile(self, tile_row : int, tile_column : int) -> np.ndarray:
+        """Finds tile in the cache or reads it from the raster file, tiles overlap by one cell for interpolation"""
+        key : Tuple[int, int] = (tile_row, tile_column)
+        tile : np.ndarray | None = self.__tiles.get(key)
+        if tile is not None:
+            self.__tiles.move_to_end(key)
+            return tile
+        row : int = tile_row * self.tile_size
+        column : int = tile_column * self.tile_size
+        tile = np.array(self.__elevation[row:row + self.tile_size + 1, column:column + self.tile_size + 1], dtype = np.float64)
+        self.__tile_loads += 1
+        self.__tiles[key] = tile
+        if len(self.__tiles) > self.cache_size:
+            self.__tiles.popitem(last = False)
+        return tile
+
+    def find_heights(self, x : np.ndarray, y : np.ndarray) -> np.ndarray:
+        """Finds bilinearly interpolated terrain heights at the given coordinates"""
+        rows, columns = self.shape
+        row = (np.asarray(y, dtype = np.float64) - self.origin[1]) / self.cell_size
+        column = (np.asarray(x, dtype = np.float64) - self.origin[0]) / self.cell_size
+        heights = np.zeros(row.shape)
+        inside = np.flatnonzero((row >= 0.0) & (row <= rows - 1) & (column >= 0.0) & (column <= columns - 1))
+        if len(inside) == 0:
+            return heights
+        row = row[inside]
+        column = column[inside]
+        first_row = np.minimum(np.floor(row).astype(np.int64), rows - 2)
+        first_column = np.minimum(np.floor(column).astype(np.int64), columns - 2)
+        row_fraction = row - first_row
+        column_fraction = column - first_column
+
+        # points are interpolated tile by tile, so each tile is looked up once per call
+        tile_rows = first_row // self.tile_size
+        tile_columns = first_column // self.tile_size
+        keys, tile_index = np.unique(tile_rows * ((columns - 1) // self.tile_size + 1) + tile_columns, return_inverse = True)
+        for i in range(len(keys)):
+            points = np.flatnonzero(tile_index == i)
+            tile_row = int(tile_rows[points[0]])
+            tile_column = int(tile_columns[points[0]])
+            tile = self.find_tile(tile_row, tile_column)
+            r = first_row[points] - tile_row * self.tile_size
+            c = first_column[points] - tile_column * self.tile_size
+            u = row_fraction[points]
+            v = column_fraction[points]
+            heights[inside[points]] = (
+                tile[r, c] * (1.0 - u) * (1.0 - v)
+                + tile[r, c + 1] * (1.0 - u) * v
+                + tile[r + 1, c] * u * (1.0 - v)
+                + tile[r + 1, c + 1] * u * v)
+        return heights
+
+    def find_height(self, x : float, y : float) -> float:
+        """Finds bilinearly interpolated terrain height at the given coordinates"""
+        return float(self.find_heights(np.array([x]), np.array([y]))[0])
+
+    def clear_cache(self) -> None:
+        """Drops all cached tiles"""
+        self.__tiles.clear()
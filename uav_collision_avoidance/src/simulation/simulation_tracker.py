@@ -0,0 +1,176 @@
+"""Simulation surveillance tracker module"""
+
+from typing import Tuple
+
+import numpy as np
+
+from .simulation_settings import SimulationSettings
+
+class SimulationTracker:
+    """Bank of coordinated turn extended Kalman filters tracking targets heard by receivers, all tracks stacked in arrays and updated at once,
+    track state holds position in meters, velocity in m/s and horizontal turn rate in rad/s counterclockwise, zero turn rate noise makes it constant velocity"""
+
+    state_size : int = 7
+
+    def __init__(
+            self,
+            count : int,
+            position_noise : float = SimulationSettings.tracker_position_noise,
+            speed_noise : float = SimulationSettings.tracker_speed_noise,
+            acceleration_noise : float = SimulationSettings.tracker_acceleration_noise,
+            turn_rate_noise : float = SimulationSettings.tracker_turn_rate_noise) -> None:
+        assert count > 0 and position_noise > 0.0 and speed_noise > 0.0
+        assert acceleration_noise >= 0.0 and turn_rate_noise >= 0.0
+        self.__count : int = count
+        self.__acceleration_noise : float = acceleration_noise
+        self.__turn_rate_noise : float = turn_rate_noise
+        self.__measurement_noise : np.ndarray = np.diag([position_noise ** 2] * 3 + [speed_noise ** 2] * 3)
+        self.__initial_covariance : np.ndarray = np.diag([position_noise ** 2] * 3 + [speed_noise ** 2] * 3 + [0.1 ** 2])
+        self.__keys : np.ndarray = np.empty(0, dtype = np.int64)
+        self.__state : np.ndarray = np.empty((0, self.state_size))
+        self.__covariance : np.ndarray = np.empty((0, self.state_size, self.state_size))
+        self.__time : np.ndarray = np.empty(0) # ms
+        self.__updates : int = 0
+
+    @property
+    def count(self) -> int:
+        """Returns count of aircrafts which may be receivers or targets"""
+        return self.__count
+
+    @property
+    def tracks(self) -> int:
+        """Returns count of tracks"""
+        return len(self.__keys)
+
+    @property
+    def receiver(self) -> np.ndarray:
+        """Returns receivers of tracks"""
+        return self.__keys // self.count
+
+    @property
+    def target(self) -> np.ndarray:
+        """Returns targets of tracks"""
+        return self.__keys % self.count
+
+    @property
+    def state(self) -> np.ndarray:
+        """Returns tracks states of shape (tracks, 7)"""
+        return self.__state
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """Returns tracks state covariances of shape (tracks, 7, 7)"""
+        return self.__covariance
+
+    @property
+    def time(self) -> np.ndarray:
+        """Returns simulated times in ms of tracks last updates"""
+        return self.__time
+
+    @property
+    def updates(self) -> int:
+        """Returns count of filtered measurements"""
+        return self.__updates
+
+    def find_tracks(self, receiver : np.ndarray, target : np.ndarray) -> np.ndarray:
+        """Returns tracks of receivers and targets pairs, -1 for pairs without tracks"""
+        keys = np.asarray(receiver, dtype = np.int64) * self.count + np.asarray(target, dtype = np.int64)
+        if self.tracks == 0:
+            return np.full(len(keys), -1)
+        track = np.minimum(np.searchsorted(self.__keys, keys), self.tracks - 1)
+        return np.where(self.__keys[track] == keys, track, -1)
+
+    def propagate(self, state : np.ndarray, time_step : np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Propagates states of shape (n, 7) along coordinated turns over time steps in seconds, returns them with transition Jacobians of shape (n, 7, 7)"""
+        t = time_step
+        omega = state[:, 6]
+        angle = omega * t
+        sine, cosine = np.sin(angle), np.cos(angle)
+        turning = np.abs(angle) > 1e-6
+        safe_omega = np.where(turning, omega, 1.0)
+        # a = sin(wt) / w, b = (1 - cos(wt)) / w and their derivatives along turn rate, with limits of straight flight
+        a = np.where(turning, sine / safe_omega, t)
+        b = np.where(turning, (1.0 - cosine) / safe_omega, omega * t ** 2 / 2.0)
+        da = np.where(turning, (t * cosine * safe_omega - sine) / safe_omega ** 2, -omega * t ** 3 / 3.0)
+        db = np.where(turning, (t * sine * safe_omega - (1.0 - cosine)) / safe_omega ** 2, t ** 2 / 2.0)
+        vx, vy = state[:, 3], state[:, 4]
+        propagated = state.copy()
+        propagated[:, 0] += a * vx - b * vy
+        propagated[:, 1] += b * vx + a * vy
+        propagated[:, 2] += state[:, 5] * t
+        propagated[:, 3] = cosine * vx - sine * vy
+        propagated[:, 4] = sine * vx + cosine * vy
+        jacobian = np.broadcast_to(np.eye(self.state_size), (len(state), self.state_size, self.state_size)).copy()
+        jacobian[:, 0, 3], jacobian[:, 0, 4], jacobian[:, 0, 6] = a, -b, da * vx - db * vy
+        jacobian[:, 1, 3], jacobian[:, 1, 4], jacobian[:, 1, 6] = b, a, db * vx + da * vy
+        jacobian[:, 2, 5] = t
+        jacobian[:, 3, 3], jacobian[:, 3, 4], jacobian[:, 3, 6] = cosine, -sine, -t * (sine * vx + cosine * vy)
+        jacobian[:, 4, 3], jacobian[:, 4, 4], jacobian[:, 4, 6] = sine, cosine, t * (cosine * vx - sine * vy)
+        return propagated, jacobian
+
+    def find_process_noise(self, time_step : np.ndarray) -> np.ndarray:
+        """Finds process noise covariances of shape (n, 7, 7) of white acceleration and turn rate noises over time steps in seconds"""
+        t = time_step
+        noise = np.zeros((len(t), self.state_size, self.state_size))
+        for axis in range(3):
+            noise[:, axis, axis] = self.__acceleration_noise * t ** 3 / 3.0
+            noise[:, axis, axis + 3] = noise[:, axis + 3, axis] = self.__acceleration_noise * t ** 2 / 2.0
+            noise[:, axis + 3, axis + 3] = self.__acceleration_noise * t
+        noise[:, 6, 6] = self.__turn_rate_noise * t
+        return noise
+
+    def update(self, receiver : np.ndarray, target : np.ndarray, time : np.ndarray, position : np.ndarray, speed : np.ndarray) -> None:
+        """Filters measured positions and speeds of targets taken at simulated times in ms into tracks of their receivers, starting new tracks for new pairs,
+        measurements of the same track are filtered in time order"""
+        keys = np.asarray(receiver, dtype = np.int64) * self.count + np.asarray(target, dtype = np.int64)
+        if len(keys) == 0:
+            return
+        measurement = np.concatenate((position, speed), axis = 1).astype(np.float64)
+        order = np.lexsort((time, keys))
+        keys, time, measurement = keys[order], np.asarray(time, dtype = np.float64)[order], measurement[order]
+
+        # new tracks start at their first measurement
+        first = np.concatenate(([True], keys[1:] != keys[:-1]))
+        new = first & (self.find_tracks(keys // self.count, keys % self.count) < 0)
+        if new.any():
+            state = np.concatenate((measurement[new], np.zeros((int(new.sum()), 1))), axis = 1)
+            all_keys = np.concatenate((self.__keys, keys[new]))
+            track_order = np.argsort(all_keys, kind = "stable")
+            self.__keys = all_keys[track_order]
+            self.__state = np.concatenate((self.__state, state))[track_order]
+            self.__covariance = np.concatenate((self.__covariance, np.broadcast_to(self.__initial_covariance, (len(state), self.state_size, self.state_size))))[track_order]
+            self.__time = np.concatenate((self.__time, time[new]))[track_order]
+            keys, time, measurement, first = keys[~new], time[~new], measurement[~new], first[~new]
+            first = np.concatenate(([True], keys[1:] != keys[:-1])) if len(keys) > 0 else first
+        track = np.searchsorted(self.__keys, keys)
+
+        # every round filters at most one measurement of each track
+        rank = np.arange(len(keys)) - np.maximum.accumulate(np.where(first, np.arange(len(keys)), 0))
+        for round_rank in range(int(rank.max(initial = -1)) + 1):
+            selected = rank == round_rank
+            self.filter(track[selected], time[selected], measurement[selected])
+
+    def filter(self, track : np.ndarray, time : np.ndarray, measurement : np.ndarray) -> None:
+        """Predicts distinct tracks to measurement times in ms and corrects them with measurements of shape (n, 6)"""
+        time_step = np.maximum(time - self.__time[track], 0.0) / 1000.0
+        state, jacobian = self.propagate(self.__state[track], time_step)
+        covariance = jacobian @ self.__covariance[track] @ jacobian.transpose(0, 2, 1) + self.find_process_noise(time_step)
+        innovation = measurement - state[:, :6]
+        innovation_covariance = covariance[:, :6, :6] + self.__measurement_noise
+        gain = np.linalg.solve(innovation_covariance, covariance[:, :6, :]).transpose(0, 2, 1)
+        self.__state[track] = state + np.einsum("nij,nj->ni", gain, innovation)
+        self.__covariance[track] = covariance - gain @ covariance[:, :6, :]
+        self.__time[track] = time
+        self.__updates += len(track)
+
+    def predict(self, time : float, track : np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns filtered positions and velocities of tracks, all by default, predicted to simulated time in ms without changing them"""
+        if track is None:
+            track = np.arange(self.tracks)
+        state, _ = self.propagate(self.__state[track], np.maximum(time - self.__time[track], 0.0) / 1000.0)
+        return state[:, :3], state[:, 3:6]
+
+    def prune(self, time : float, max_age : float) -> None:
+        """Drops tracks not updated for longer than max age in ms"""
+        kept = self.__time >= time - max_age
+        self.__keys, self.__state, self.__covariance, self.__time = self.__keys[kept], self.__state[kept], self.__covariance[kept], self.__time[kept]
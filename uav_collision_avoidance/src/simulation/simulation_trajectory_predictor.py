@@ -0,0 +1,139 @@
+"""Simulation trajectory predictor module"""
+
+from typing import Tuple
+
+import numpy as np
+
+from .simulation_settings import SimulationSettings
+
+class SimulationTrajectoryPredictor:
+    """Constant turn rate predictor of aircrafts trajectories sampled over a horizon, every row turns its horizontal speed counterclockwise
+    at its turn rate for its turn duration and flies straight afterwards, closest approaches of pairs are searched over the samples and refined
+    between the neighbouring ones, offsets of rows whose speeds and turns have not changed since their previous prediction are reused"""
+
+    def __init__(
+            self,
+            count : int,
+            horizon : float = SimulationSettings.prediction_horizon,
+            time_step : float = SimulationSettings.prediction_time_step) -> None:
+        assert count > 0 and 0.0 < time_step <= horizon
+        self.__sample_time : np.ndarray = np.arange(0.0, horizon + time_step / 2.0, time_step) # s
+        self.__speed : np.ndarray = np.full((count, 3), np.nan)
+        self.__turn_rate : np.ndarray = np.full(count, np.nan) # rad/s
+        self.__turn_duration : np.ndarray = np.full(count, np.nan) # s
+        self.__offset : np.ndarray = np.zeros((count, len(self.__sample_time), 3))
+        self.__propagations : int = 0
+        self.__reuses : int = 0
+
+    @property
+    def count(self) -> int:
+        """Returns count of predicted rows"""
+        return len(self.__offset)
+
+    @property
+    def sample_time(self) -> np.ndarray:
+        """Returns times in seconds of the samples"""
+        return self.__sample_time
+
+    @property
+    def propagations(self) -> int:
+        """Returns count of propagated rows"""
+        return self.__propagations
+
+    @property
+    def reuses(self) -> int:
+        """Returns count of predicted rows reusing their previous offsets"""
+        return self.__reuses
+
+    @staticmethod
+    def find_turn_rate(roll_angle : np.ndarray, horizontal_speed : np.ndarray, g_acceleration : float) -> np.ndarray:
+        """Finds counterclockwise turn rates in rad/s from roll angles and horizontal speeds the way physics turns aircrafts,
+        which yaw by g tan(roll) / horizontal speed degrees per millisecond"""
+        return np.radians(1000.0 * g_acceleration * np.tan(np.radians(roll_angle)) / np.where(horizontal_speed > 0.0, horizontal_speed, np.inf))
+
+    @staticmethod
+    def find_turn_duration(yaw_angle : np.ndarray, target_yaw_angle : np.ndarray, turn_rate : np.ndarray) -> np.ndarray:
+        """Finds times in seconds left until turns in the direction of their turn rates reach target yaw angles, none for yaw angles physics considers reached
+        and for turns away from the target yaw angles which flight control computers reverse by rolling towards the shorter side"""
+        remaining_angle = np.radians(np.where(turn_rate >= 0.0, target_yaw_angle - yaw_angle, yaw_angle - target_yaw_angle) % 360.0)
+        turning = (turn_rate != 0.0) & (np.abs(target_yaw_angle - yaw_angle) >= 0.001) & (remaining_angle <= np.pi)
+        return np.where(turning, remaining_angle / np.where(turning, np.abs(turn_rate), 1.0), 0.0)
+
+    @staticmethod
+    def propagate(speed : np.ndarray, turn_rate : np.ndarray, turn_duration : np.ndarray, sample_time : np.ndarray) -> np.ndarray:
+        """Returns offsets of shape (n, samples, 3) from the initial positions of speeds of shape (n, 3) turning for turn durations at sample times in seconds"""
+        t = sample_time[np.newaxis, :]
+        turn_time = np.minimum(t, turn_duration[:, np.newaxis])
+        omega = turn_rate[:, np.newaxis]
+        angle = omega * turn_time
+        sine, cosine = np.sin(angle), np.cos(angle)
+        turning = np.abs(angle) > 1e-9
+        safe_omega = np.where(turning, omega, 1.0)
+        # a = sin(wt) / w and b = (1 - cos(wt)) / w with limits of straight flight
+        a = np.where(turning, sine / safe_omega, turn_time)
+        b = np.where(turning, (1.0 - cosine) / safe_omega, 0.0)
+        vx, vy = speed[:, 0:1], speed[:, 1:2]
+        straight_time = t - turn_time
+        offset = np.empty((len(speed), len(sample_time), 3))
+        offset[..., 0] = a * vx - b * vy + (cosine * vx - sine * vy) * straight_time
+        offset[..., 1] = b * vx + a * vy + (sine * vx + cosine * vy) * straight_time
+        offset[..., 2] = speed[:, 2:3] * t
+        return offset
+
+    def predict(self, position : np.ndarray, speed : np.ndarray, turn_rate : np.ndarray, turn_duration : np.ndarray, rows : np.ndarray | None = None) -> np.ndarray:
+        """Returns trajectories of shape (n, samples, 3) of the given rows, all by default, from positions and speeds of shape (n, 3) with their turns,
+        rows with the same speeds and turns as at their previous prediction reuse their offsets"""
+        if rows is None:
+            rows = np.arange(self.count)
+        changed = ~((self.__speed[rows] == speed).all(axis = 1) & (self.__turn_rate[rows] == turn_rate) & (self.__turn_duration[rows] == turn_duration))
+        changed_rows = rows[changed]
+        if len(changed_rows) > 0:
+            self.__offset[changed_rows] = self.propagate(speed[changed], turn_rate[changed], turn_duration[changed], self.sample_time)
+            self.__speed[changed_rows] = speed[changed]
+            self.__turn_rate[changed_rows] = turn_rate[changed]
+            self.__turn_duration[changed_rows] = turn_duration[changed]
+        self.__propagations += len(changed_rows)
+        self.__reuses += len(rows) - len(changed_rows)
+        return position[:, np.newaxis, :] + self.__offset[rows]
+
+    def find_closest_approach(self, relative_trajectory : np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds times to closest approach in seconds and miss distance vectors of relative trajectories of shape (n, samples, 3),
+        the closest sample is refined by the closest points of the segments to its neighbouring samples,
+        trajectories still closing at the horizon are extended beyond it along their last segments,
+        miss distance vectors of closest approaches ahead are kept perpendicular to the relative speeds there the way straight flight has them"""
+        count : int = len(relative_trajectory)
+        rows = np.arange(count)
+        closest = np.argmin(np.einsum("nsi,nsi->ns", relative_trajectory, relative_trajectory), axis = 1)
+        time_to_closest_approach = self.sample_time[closest]
+        miss_distance_vector = relative_trajectory[rows, closest]
+        segment_start = np.minimum(closest, len(self.sample_time) - 2)
+        segment_chord = relative_trajectory[rows, segment_start + 1] - relative_trajectory[rows, segment_start]
+        for start in (np.maximum(closest - 1, 0), np.minimum(closest, len(self.sample_time) - 2)):
+            first = relative_trajectory[rows, start]
+            chord = relative_trajectory[rows, start + 1] - first
+            chord_squared = np.einsum("ni,ni->n", chord, chord)
+            fraction = np.clip(-np.einsum("ni,ni->n", first, chord) / np.where(chord_squared > 0.0, chord_squared, np.inf), 0.0, 1.0)
+            segment_vector = first + chord * fraction[:, np.newaxis]
+            closer = np.einsum("ni,ni->n", segment_vector, segment_vector) < np.einsum("ni,ni->n", miss_distance_vector, miss_distance_vector)
+            time_to_closest_approach = np.where(closer, self.sample_time[start] + (self.sample_time[start + 1] - self.sample_time[start]) * fraction, time_to_closest_approach)
+            miss_distance_vector = np.where(closer[:, np.newaxis], segment_vector, miss_distance_vector)
+            segment_chord = np.where(closer[:, np.newaxis], chord, segment_chord)
+
+        # straight flight beyond the horizon
+        last : int = len(self.sample_time) - 1
+        closing = np.flatnonzero(closest == last)
+        if len(closing) > 0:
+            last_vector = relative_trajectory[closing, last]
+            speed_difference = (last_vector - relative_trajectory[closing, last - 1]) / (self.sample_time[last] - self.sample_time[last - 1])
+            speed_difference_squared = np.einsum("ni,ni->n", speed_difference, speed_difference)
+            extra_time = -np.einsum("ni,ni->n", last_vector, speed_difference) / np.where(speed_difference_squared > 0.0, speed_difference_squared, np.inf)
+            beyond = extra_time > 0.0
+            closing, last_vector, speed_difference, extra_time = closing[beyond], last_vector[beyond], speed_difference[beyond], extra_time[beyond]
+            time_to_closest_approach[closing] = self.sample_time[last] + extra_time
+            miss_distance_vector[closing] = last_vector + speed_difference * extra_time[:, np.newaxis]
+            segment_chord[closing] = speed_difference
+
+        # rounding leaves the minimum slightly off along the relative speed
+        chord_squared = np.einsum("ni,ni->n", segment_chord, segment_chord)
+        along = np.where((time_to_closest_approach > 0.0) & (chord_squared > 0.0), np.einsum("ni,ni->n", miss_distance_vector, segment_chord) / np.where(chord_squared > 0.0, chord_squared, 1.0), 0.0)
+        return time_to_closest_approach, miss_distance_vector - segment_chord * along[:, np.newaxis]
@@ -0,0 +1,175 @@
+"""Simulation float64 vector module"""
+
+from math import sqrt
+from typing import Tuple
+
+class Vector3D:
+    """Double precision 3D vector mirroring QVector3D interface, updated in place by the simulation hot paths"""
+
+    __slots__ = ("__x", "__y", "__z")
+
+    def __init__(self, x : float = 0.0, y : float = 0.0, z : float = 0.0) -> None:
+        self.__x : float = float(x)
+        self.__y : float = float(y)
+        self.__z : float = float(z)
+
+    @classmethod
+    def from_vector(cls, vector) -> "Vector3D":
+        """Creates vector from any vector exposing x, y and z getters, e.g. QVector3D"""
+        return cls(vector.x(), vector.y(), vector.z())
+
+    def x(self) -> float:
+        """Returns x coordinate"""
+        return self.__x
+
+    def y(self) -> float:
+        """Returns y coordinate"""
+        return self.__y
+
+    def z(self) -> float:
+        """Returns z coordinate"""
+        return self.__z
+
+    def setX(self, x : float) -> None:
+        """Sets x coordinate"""
+        self.__x = x
+
+    def setY(self, y : float) -> None:
+        """Sets y coordinate"""
+        self.__y = y
+
+    def setZ(self, z : float) -> None:
+        """Sets z coordinate"""
+        self.__z = z
+
+    def set(self, x : float, y : float, z : float) -> None:
+        """Sets all coordinates"""
+        self.__x = x
+        self.__y = y
+        self.__z = z
+
+    def assign(self, other : "Vector3D") -> None:
+        """Copies coordinates of other vector"""
+        self.__x = other.__x
+        self.__y = other.__y
+        self.__z = other.__z
+
+    def add_scaled(self, other : "Vector3D", scale : float) -> None:
+        """Adds other vector multiplied by scale"""
+        self.__x += other.__x * scale
+        self.__y += other.__y * scale
+        self.__z += other.__z * scale
+
+    def length(self) -> float:
+        """Returns length"""
+        return sqrt(self.__x * self.__x + self.__y * self.__y + self.__z * self.__z)
+
+    def lengthSquared(self) -> float:
+        """Returns squared length"""
+        return self.__x * self.__x + self.__y * self.__y + self.__z * self.__z
+
+    def normalized(self) -> "Vector3D":
+        """Returns unit vector of the same direction, null vector when null"""
+        length : float = self.length()
+        if length == 0.0:
+            return Vector3D()
+        return Vector3D(self.__x / length, self.__y / length, self.__z / length)
+
+    def distanceToPoint(self, point : "Vector3D") -> float:
+        """Returns distance to point"""
+        dx : float = self.__x - point.__x
+        dy : float = self.__y - point.__y
+        dz : float = self.__z - point.__z
+        return sqrt(dx * dx + dy * dy + dz * dz)
+
+    def isNull(self) -> bool:
+        """Returns true for null vector"""
+        return self.__x == 0.0 and self.__y == 0.0 and self.__z == 0.0
+
+    def toTuple(self) -> Tuple[float, float, float]:
+        """Returns coordinates tuple"""
+        return (self.__x, self.__y, self.__z)
+
+    @staticmethod
+    def dotProduct(first : "Vector3D", second : "Vector3D") -> float:
+        """Returns dot product of vectors"""
+        return first.__x * second.__x + first.__y * second.__y + first.__z * second.__z
+
+    @staticmethod
+    def crossProduct(first : "Vector3D", second : "Vector3D") -> "Vector3D":
+        """Returns cross product of vectors"""
+        return Vector3D(
+            first.__y * second.__z - first.__z * second.__y,
+            first.__z * second.__x - first.__x * second.__z,
+            first.__x * second.__y - first.__y * second.__x)
+
+    def __add__(self, other : "Vector3D") -> "Vector3D":
+        return Vector3D(self.__x + other.__x, self.__y + other.__y, self.__z + other.__z)
+
+    def __sub__(self, other : "Vector3D") -> "Vector3D":
+        return Vector3D(self.__x - other.__x, self.__y - other.__y, self.__z - other.__z)
+
+    def __mul__(self, scale : float) -> "Vector3D":
+        return Vector3D(self.__x * scale, self.__y * scale, self.__z * scale)
+
+    def __rmul__(self, scale : float) -> "Vector3D":
+        return Vector3D(self.__x * scale, self.__y * scale, self.__z * scale)
+
+    def __truediv__(self, divisor : float) -> "Vector3D":
+        return Vector3D(self.__x / divisor, self.__y / divisor, self.__z / divisor)
+
+    def __neg__(self) -> "Vector3D":
+        return Vector3D(-self.__x, -self.__y, -self.__z)
+
+    def __iadd__(self, other : "Vector3D") -> "Vector3D":
+        self.__x += other.__x
+        self.__y += other.__y
+        self.__z += other.__z
+        return self
+
+    def __isub__(self, other : "Vector3D") -> "Vector3D":
+        self.__x -= other.__x
+        self.__y -= other.__y
+        self.__z -= other.__z
+        return self
+
+    def __imul__(self, scale : float) -> "Vector3D":
+        self.__x *= scale
+        self.__y *= scale
+        self.__z *= scale
+        return self
+
+    def __itruediv__(self, divisor : float) -> "Vector3D":
+        self.__x /= divisor
+        self.__y /= divisor
+        self.__z /= divisor
+        return self
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Vector3D):
+            return NotImplemented
+        return self.__x == other.__x and self.__y == other.__y and self.__z == other.__z
+
+    def __ne__(self, other) -> bool:
+        if not isinstance(other, Vector3D):
+            return NotImplemented
+        return not self == other
+
+    __hash__ = None
+
+    def __copy__(self) -> "Vector3D":
+        return Vector3D(self.__x, self.__y, self.__z)
+
+    def __deepcopy__(self, memo) -> "Vector3D":
+        return Vector3D(self.__x, self.__y, self.__z)
+
+    def __iter__(self):
+        yield self.__x
+        yield self.__y
+        yield self.__z
+
+    def __str__(self) -> str:
+        return f"Vector3D({self.__x:.6f}, {self.__y:.6f}, {self.__z:.6f})"
+
+    def __repr__(self) -> str:
+        return f"Vector3D({self.__x!r}, {self.__y!r}, {self.__z!r})"
@@ -14,6 +14,7 @@ from ..aircraft.aircraft_fcc import AircraftFCC
 from ..aircraft.aircraft_vehicle import AircraftVehicle
 from .simulation_fps import SimulationFPS
 from .simulation_settings import SimulationSettings
+from .simulation_vector import Vector3D
 
 class SimulationWidget(QWidget):
     """Main widget representing the simulation"""
@@ -318,6 +319,11 @@ class SimulationWidget(QWidget):
         painter.drawPolygon(polygon)
         painter.end()
     
+    @staticmethod
+    def to_qvector(vector : Vector3D) -> QVector3D:
+        """Converts simulation vector into Qt vector for drawing"""
+        return QVector3D(vector.x(), vector.y(), vector.z())
+
     def draw_collision_detection(self, scale : float) -> None:
         """Draws collision detection elements for the aircrafts"""
         detected_conflict : bool = False
@@ -327,8 +333,8 @@ class SimulationWidget(QWidget):
             self.draw_text(QVector3D(self.__window_width - 70, 10, 0), 0, "COLLISION", QColor(255, 0, 0))
             return
         for aircraft in self.__aircraft_vehicles:
-            relative_position = aircraft.position - self.__aircraft_vehicles[1 - aircraft.aircraft_id].position
-            speed_difference : QVector3D = aircraft.speed - self.__aircraft_vehicles[1 - aircraft.aircraft_id].speed
+            relative_position = self.to_qvector(aircraft.position) - self.to_qvector(self.__aircraft_vehicles[1 - aircraft.aircraft_id].position)
+            speed_difference : QVector3D = self.to_qvector(aircraft.speed) - self.to_qvector(self.__aircraft_vehicles[1 - aircraft.aircraft_id].speed)
             time_to_closest_approach = -(QVector3D.dotProduct(relative_position, speed_difference) / QVector3D.dotProduct(speed_difference, speed_difference))
             if time_to_closest_approach > 0:
                 speed_difference_unit = speed_difference.normalized()
@@ -478,7 +484,7 @@ class SimulationWidget(QWidget):
 
         if self.__simulation_state.optimize_drawing:
             anything_to_draw : bool = False
-            geometric_center : QVector3D = self.__aircraft_vehicles[0].position + self.__aircraft_vehicles[1].position / 2
+            geometric_center : Vector3D = self.__aircraft_vehicles[0].position + self.__aircraft_vehicles[1].position / 2
             if (geometric_center.x() * scale + 300) + self.__screen_offset_x * scale >= 0 and \
                 (geometric_center.y() * scale + 200) + self.__screen_offset_y * scale >= 0 and \
                 (geometric_center.x() * scale - 300) + self.__screen_offset_x * scale <= self.__window_width and \
@@ -528,17 +534,17 @@ class SimulationWidget(QWidget):
             "; y: " + "{:.2f}".format(click_y))
         focused_aircraft_id = self.simulation_state.focused_aircraft_id
         if event.button() == Qt.MouseButton.LeftButton:
-            self.__aircraft_fccs[focused_aircraft_id].add_first_destination(QVector3D(
+            self.__aircraft_fccs[focused_aircraft_id].add_first_destination(Vector3D(
                 real_x,
                 real_y,
                 1000.0))
         elif event.button() == Qt.MouseButton.RightButton:
-            self.__aircraft_fccs[focused_aircraft_id].add_last_destination(QVector3D(
+            self.__aircraft_fccs[focused_aircraft_id].add_last_destination(Vector3D(
                 real_x,
                 real_y,
                 1000.0))
         elif event.button() == Qt.MouseButton.MiddleButton:
-            self.__aircraft_vehicles[focused_aircraft_id].position = QVector3D(
+            self.__aircraft_vehicles[focused_aircraft_id].position = Vector3D(
                 real_x,
                 real_y,
                 1000.0)
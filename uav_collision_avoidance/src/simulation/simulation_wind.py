@@ -0,0 +1,148 @@
+"""Simulation wind field module"""
+
+import logging
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy as np
+
+from .simulation_settings import SimulationSettings
+
+class SimulationWind:
+    """Time-varying wind field of speed vectors in m/s on a regular grid of shape (time slices, z, y, x, 3),
+    node (t, k, j, i) holds wind at time t * time step and at origin + (i, j, k) * cell size,
+    sampled with trilinear interpolation in space and linear interpolation in time, clamped to the grid bounds"""
+
+    def __init__(
+            self,
+            field : np.ndarray,
+            cell_size : Tuple[float, float, float] = (1.0, 1.0, 1.0),
+            origin : Tuple[float, float, float] = (0.0, 0.0, 0.0),
+            time_step : float = 60_000.0,
+            cache_size : int = SimulationSettings.wind_cache_size) -> None:
+        assert field.ndim == 5 and field.shape[4] == 3
+        assert min(cell_size) > 0.0 and time_step > 0.0
+        assert cache_size > 0
+        self.__field : np.ndarray = field
+        self.__cell_size : Tuple[float, float, float] = cell_size
+        self.__origin : Tuple[float, float, float] = origin
+        self.__time_step : float = time_step
+        self.__cache_size : int = cache_size
+        self.__slices : OrderedDict[int, np.ndarray] = OrderedDict()
+        self.__slice_loads : int = 0
+        self.__max_speed : float | None = None
+
+        # grid lookup constants, singleton axes have their upper cell corners at the same node
+        _, nodes_z, nodes_y, nodes_x, _ = field.shape
+        self.__origin_array : np.ndarray = np.array(origin, dtype = np.float64)
+        self.__cell_size_array : np.ndarray = np.array(cell_size, dtype = np.float64)
+        self.__last_node : np.ndarray = np.array((nodes_x - 1, nodes_y - 1, nodes_z - 1))
+        self.__last_lower_node : np.ndarray = np.maximum(self.__last_node - 1, 0)
+        self.__node_stride : np.ndarray = np.array((1, nodes_x, nodes_x * nodes_y))
+        corner = np.array([(c & 1, (c >> 1) & 1, (c >> 2) & 1) for c in range(8)])
+        self.__corner_offset : np.ndarray = (corner * np.where(self.__last_node > 0, self.__node_stride, 0)).sum(axis = 1)[:, np.newaxis]
+
+    @classmethod
+    def load(cls, file_path : str, cell_size : Tuple[float, float, float], origin : Tuple[float, float, float] = (0.0, 0.0, 0.0), time_step : float = 60_000.0) -> "SimulationWind":
+        """Loads wind field memory-mapped from a .npy file"""
+        logging.info("Loading wind field from %s", file_path)
+        return cls(np.load(file_path, mmap_mode = "r"), cell_size, origin, time_step)
+
+    @classmethod
+    def uniform(cls, wind : Tuple[float, float, float]) -> "SimulationWind":
+        """Creates constant wind field"""
+        return cls(np.array(wind, dtype = np.float64).reshape(1, 1, 1, 1, 3))
+
+    @classmethod
+    def generate(
+            cls,
+            shape : Tuple[int, int, int, int],
+            cell_size : Tuple[float, float, float],
+            origin : Tuple[float, float, float] = (0.0, 0.0, 0.0),
+            time_step : float = 60_000.0,
+            mean_wind : Tuple[float, float, float] = (10.0, 0.0, 0.0),
+            gust_speed : float = 2.0,
+            seed : int | None = None) -> "SimulationWind":
+        """Generates wind field of time slices, z, y and x nodes count shape, mean wind at 1000m growing with altitude by the one-seventh power law and random gusts"""
+        generator : np.random.Generator = np.random.default_rng(seed)
+        altitude = np.maximum(origin[2] + np.arange(shape[1]) * cell_size[2], 1.0)
+        shear = (altitude / 1000.0) ** (1.0 / 7.0)
+        field = np.array(mean_wind, dtype = np.float64) * shear[np.newaxis, :, np.newaxis, np.newaxis, np.newaxis]
+        field = field + generator.normal(0.0, gust_speed, (*shape, 3))
+        field[..., 2] = generator.normal(0.0, gust_speed * 0.1, shape)
+        return cls(field, cell_size, origin, time_step)
+
+    @property
+    def field(self) -> np.ndarray:
+        """Returns wind field grid"""
+        return self.__field
+
+    @property
+    def cell_size(self) -> Tuple[float, float, float]:
+        """Returns grid cell size along x, y and z axes in meters"""
+        return self.__cell_size
+
+    @property
+    def origin(self) -> Tuple[float, float, float]:
+        """Returns coordinates of the first grid node"""
+        return self.__origin
+
+    @property
+    def time_step(self) -> float:
+        """Returns time between time slices in ms"""
+        return self.__time_step
+
+    @property
+    def cache_size(self) -> int:
+        """Returns maximal count of cached time slices"""
+        return self.__cache_size
+
+    @property
+    def slice_loads(self) -> int:
+        """Returns count of time slices read from the field"""
+        return self.__slice_loads
+
+    @property
+    def max_speed(self) -> float:
+        """Returns the highest wind speed of the field, found streaming it once"""
+        if self.__max_speed is None:
+            self.__max_speed = max(float(np.sqrt(np.einsum("...i,...i->...", time_slice, time_slice).max())) for time_slice in self.__field)
+        return self.__max_speed
+
+    def find_slices(self, index : int) -> np.ndarray:
+        """Finds time slices pair starting at index in the cache or reads it from the field, as winds of both slices of shape (nodes, 6)"""
+        time_slices : np.ndarray | None = self.__slices.get(index)
+        if time_slices is not None:
+            self.__slices.move_to_end(index)
+            return time_slices
+        last : int = min(index + 1, self.__field.shape[0] - 1)
+        time_slices = np.concatenate((
+            np.asarray(self.__field[index], dtype = np.float64).reshape(-1, 3),
+            np.asarray(self.__field[last], dtype = np.float64).reshape(-1, 3)), axis = 1)
+        self.__slice_loads += 1
+        self.__slices[index] = time_slices
+        if len(self.__slices) > self.cache_size:
+            self.__slices.popitem(last = False)
+        return time_slices
+
+    def find_winds(self, position : np.ndarray, time : float) -> np.ndarray:
+        """Finds wind speed vectors at positions of shape (count, 3) at simulated time in ms"""
+        grid = np.minimum(np.maximum((position - self.__origin_array) / self.__cell_size_array, 0.0), self.__last_node)
+        lower = np.minimum(grid.astype(np.int64), self.__last_lower_node)
+        fraction = np.empty((2, len(grid), 3))
+        fraction[1] = grid - lower
+        fraction[0] = 1.0 - fraction[1]
+        slices : int = self.__field.shape[0]
+        time = min(max(time / self.time_step, 0.0), slices - 1)
+        index : int = min(int(time), max(slices - 2, 0))
+        time_fraction : float = time - index
+
+        # 8 cell corners are gathered at once with winds of both time slices
+        node = lower @ self.__node_stride + self.__corner_offset
+        weight = (fraction[:, np.newaxis, np.newaxis, :, 2] * fraction[np.newaxis, :, np.newaxis, :, 1] * fraction[np.newaxis, np.newaxis, :, :, 0]).reshape(8, -1)
+        wind = np.einsum("cn,cni->ni", weight, self.find_slices(index).take(node, axis = 0))
+        return wind[:, :3] * (1.0 - time_fraction) + wind[:, 3:] * time_fraction
+
+    def find_wind(self, x : float, y : float, z : float, time : float) -> Tuple[float, float, float]:
+        """Finds wind speed vector at the given coordinates at simulated time in ms"""
+        return tuple(self.find_winds(np.array([[x, y, z]]), time)[0].tolist())